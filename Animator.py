@@ -0,0 +1,122 @@
+class Clip:
+    """
+    This class is one animation playing on a sprite, it works out which
+    frame to show from how long it's been playing
+    """
+
+    def __init__(self, sprite, frames, frame_duration, on_done=None):
+        """
+        This is the class setup
+
+        Args:
+            sprite: The sprite whose texture is changed
+
+            frames: The textures to show in order
+
+            frame_duration: Seconds each frame stays up
+
+            on_done: Called once the last frame has been up for its time
+        """
+
+        self.sprite = sprite
+        self.frames = frames
+        self.frame_duration = frame_duration
+        self.on_done = on_done
+
+        self.elapsed = 0.0
+        self.index = 0
+
+    @property
+    def duration(self):
+        """Seconds the whole clip takes"""
+        return len(self.frames) * self.frame_duration
+
+
+class Animator:
+    """
+    This class runs the sprite animations, like the enemies getting
+    hurt, attacking, dying or using a special
+
+    Frames are picked by how much time has passed, so a slow frame
+    skips ahead instead of making the animation fall behind
+    Only clips that are playing are kept, so updating costs nothing
+    when nothing is animating
+    """
+
+    def __init__(self):
+        """This is the class setup"""
+
+        # Clips that are playing, by name
+        self.clips = {}
+
+    def play(self, name, sprite, frames, frame_duration, on_done=None):
+        """
+        Starts a clip from its first frame, replacing any clip
+        playing under the same name
+
+        Args:
+            name: What the clip is called, like "hurt"
+
+            sprite: The sprite whose texture is changed
+
+            frames: The textures to show in order
+
+            frame_duration: Seconds each frame stays up
+
+            on_done: Called once the clip has finished
+        """
+
+        clip = Clip(sprite, frames, frame_duration, on_done)
+        self.clips[name] = clip
+        if sprite is not None and frames:
+            sprite.texture = frames[0]
+        return clip
+
+    def stop(self, name):
+        """
+        Stops a clip without calling its on_done
+
+        Args:
+            name: What the clip is called
+        """
+
+        self.clips.pop(name, None)
+
+    def is_playing(self, name):
+        """
+        Returns whether a clip is playing
+
+        Args:
+            name: What the clip is called
+        """
+
+        return name in self.clips
+
+    def update(self, delta_time):
+        """
+        Moves every playing clip along, this should be called every frame
+
+        Args:
+            delta_time: Seconds since the last frame
+        """
+
+        if not self.clips:
+            return
+
+        for name, clip in list(self.clips.items()):
+            clip.elapsed += delta_time
+
+            # Finished clips are dropped before on_done runs,
+            # so on_done can start another clip under the same name
+            if clip.elapsed >= clip.duration:
+                if self.clips.get(name) is clip:
+                    del self.clips[name]
+                if clip.on_done is not None:
+                    clip.on_done()
+                continue
+
+            index = int(clip.elapsed / clip.frame_duration)
+            if index != clip.index:
+                clip.index = index
+                if clip.sprite is not None:
+                    clip.sprite.texture = clip.frames[index]
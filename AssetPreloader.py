@@ -0,0 +1,202 @@
+import importlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import arcade
+from TextureCache import TEXTURE_CACHE
+
+# Modules the intro doesn't need, imported in the background
+# MainScreen brings in the battle system, the enemies and PIL with it
+MODULES = ["Character", "MainScreen"]
+
+# Sounds MainScreen loads when it's built
+SOUNDS = [
+    "Simple_RPG/SFX/Footsteps.wav",
+    "Simple_RPG/SFX/Loot.wav",
+    "Simple_RPG/SFX/Button.wav",
+    "Simple_RPG/SFX/Hit.wav",
+    "Simple_RPG/SFX/necromancer_attack.wav",
+]
+
+# Textures BattleScreen loads when it's built
+TEXTURES = [
+    "Simple_RPG/Art/Attack/Pie.png",
+    "Simple_RPG/Art/Attack/Pointer.png",
+    "Simple_RPG/Art/Dodge/Bar.png",
+    "Simple_RPG/Art/Dodge/Down.png",
+    "Simple_RPG/Art/Dodge/Right.png",
+    "Simple_RPG/Art/Dodge/Up.png",
+    "Simple_RPG/Art/Dodge/Left.png",
+]
+
+# Enemies whose animations get sliced ahead of time
+# Each is the name of a module and the class inside it
+ENEMIES = ["Necromancer", "NightBorne"]
+
+class AssetPreloader:
+    """
+    This class loads the game's assets in the background while the
+    intro is playing so MainScreen can be built without freezing
+
+    Files are decoded on worker threads, then the textures are sent
+    to the GPU a few at a time on the main thread every frame
+    """
+
+    def __init__(self, workers=4, upload_budget=0.004, textures=TEXTURE_CACHE):
+        """
+        This is the class setup
+
+        Args:
+            workers: How many threads decode files at the same time
+
+            upload_budget: Seconds per frame that can be spent sending
+                           textures to the GPU
+
+            textures: The texture cache loaded textures are kept in
+        """
+
+        self.workers = workers
+        self.upload_budget = upload_budget
+
+        self.sounds = {}
+        self.textures = textures
+
+        # The worker threads, made the first time something is queued
+        self.pool = None
+        self.started = False
+
+        # Loads that haven't been collected yet
+        self.jobs = {}
+        # Textures waiting to be added to the texture atlas
+        self.uploads = deque()
+
+    def _pool(self):
+        """Returns the worker threads, starting them if needed"""
+
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preload")
+        return self.pool
+
+    def start(self):
+        """Hands every module and asset to the worker threads"""
+
+        self.started = True
+        for name in MODULES:
+            self.jobs[("module", name)] = self._pool().submit(importlib.import_module, name)
+        for path in SOUNDS:
+            self.jobs[("sound", path)] = self._pool().submit(arcade.load_sound, path)
+        # BattleScreen holds onto these for the whole game
+        self.textures.pin("battle", TEXTURES)
+        for path in TEXTURES:
+            self.prefetch_texture(path)
+        for name in ENEMIES:
+            self.jobs[("frames", name)] = self._pool().submit(_load_animations, name)
+
+    def prefetch_texture(self, path):
+        """
+        Starts loading a texture in the background unless
+        it's already loaded or on its way
+
+        Args:
+            path: Where the image file is stored
+        """
+
+        key = ("texture", path)
+        if path not in self.textures and key not in self.jobs:
+            self.jobs[key] = self._pool().submit(arcade.load_texture, path)
+
+    @property
+    def done(self):
+        """Whether every asset is loaded and on the GPU"""
+        return self.started and not self.busy
+
+    @property
+    def busy(self):
+        """Whether anything is still loading or waiting to go to the GPU"""
+        return bool(self.jobs or self.uploads)
+
+    def update(self):
+        """
+        Collects finished loads and uploads textures until this frame's
+        time budget runs out, this should be called every frame
+        """
+
+        start = time.perf_counter()
+
+        for key in [key for key, job in self.jobs.items() if job.done()]:
+            self._collect(key)
+
+        # Upload in small slices so the intro keeps animating
+        atlas = arcade.get_window().ctx.default_atlas
+        while self.uploads and time.perf_counter() - start < self.upload_budget:
+            atlas.add(self.uploads.popleft())
+
+    def _collect(self, key):
+        """
+        Stores the result of a finished load, waiting for it if needed
+
+        Args:
+            key: The (kind, name) pair the load was queued under
+        """
+
+        job = self.jobs.pop(key)
+
+        # A file that failed to load is left for the synchronous
+        # fallback so the error shows up where the asset is used
+        if job.exception() is not None:
+            return
+
+        # Imported modules are already waiting in sys.modules
+        kind, name = key
+        if kind == "sound":
+            self.sounds[name] = job.result()
+        elif kind == "texture":
+            self.textures.put(name, job.result())
+            self.uploads.append(job.result())
+        elif kind == "frames":
+            self.uploads.extend(job.result())
+
+    def sound(self, path):
+        """
+        Returns a loaded sound, loading it now if it wasn't preloaded
+
+        Args:
+            path: Where the sound file is stored
+        """
+
+        if ("sound", path) in self.jobs:
+            self._collect(("sound", path))
+        if path not in self.sounds:
+            self.sounds[path] = arcade.load_sound(path)
+        return self.sounds[path]
+
+    def texture(self, path):
+        """
+        Returns a loaded texture, loading it now if it wasn't preloaded
+
+        Args:
+            path: Where the image file is stored
+        """
+
+        if ("texture", path) in self.jobs:
+            self._collect(("texture", path))
+        return self.textures.get(path, lambda: arcade.load_texture(path))
+
+    def finish(self):
+        """Waits for every load that's still running"""
+
+        for key in list(self.jobs):
+            self._collect(key)
+
+
+def _load_animations(name):
+    """
+    Imports an enemy and makes its animation textures, this runs
+    on a worker thread
+
+    Args:
+        name: The enemy's module and class name, like "Necromancer"
+    """
+
+    enemy = getattr(importlib.import_module(name), name)
+    return enemy.load_animations()
@@ -0,0 +1,299 @@
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from CombatEngine import CombatEngine, Fighter, Skill, PLAYER, ENEMIES, SPECIALS
+from RandomStreams import RandomStreams
+
+# The settings a sweep can go over and where each one starts,
+# weapon and armor are what the shop upgrades add to ATK and DEF
+DEFAULTS = {
+    "player_hp": PLAYER["hp"],
+    "player_mp": PLAYER["mp"],
+    "player_atk": PLAYER["atk"],
+    "player_def": PLAYER["defense"],
+    "player_spd": PLAYER["spd"],
+    "weapon": 0,
+    "armor": 0,
+    "enemy_hp": None,
+    "enemy_atk": None,
+    "enemy_def": None,
+    "enemy_spd": None,
+    "hit_chance": 0.75,
+    "max_hits": 8,
+}
+
+# The results for each grid point, after the settings
+RESULTS = [
+    "battles", "win_rate",
+    "turns_mean", "turns_p10", "turns_p50", "turns_p90",
+    "hp_mean", "hp_p10", "hp_p50", "hp_p90",
+    "mp_mean", "mp_p10", "mp_p50", "mp_p90",
+]
+
+
+def keep_up(special, buff):
+    """
+    Returns a policy that uses a special whenever its buff has run out
+    and attacks the rest of the time
+
+    Args:
+        special: The special's name, like "Overclock"
+
+        buff: The engine buff it sets, like "overclock"
+    """
+
+    cost = SPECIALS[special][2]
+
+    def policy(engine):
+        if getattr(engine, buff) == 0 and engine.player.mp >= cost:
+            return special
+        return "Attack"
+    return policy
+
+
+# What the simulated player does on their turn
+POLICIES = {
+    "attack": None,
+    "overclock": keep_up("Overclock", "overclock"),
+    "guard": keep_up("Tight Guard", "guard"),
+    "repair": keep_up("Auto-Repairs", "repair"),
+}
+
+
+def percentile(values, fraction):
+    """
+    Returns the value a fraction of the way through sorted values,
+    or None if there aren't any
+
+    Args:
+        values: The values, sorted
+
+        fraction: How far through, like 0.5 for the median
+    """
+
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summary(values):
+    """
+    Returns the mean, 10th, 50th and 90th percentile of some values
+
+    Args:
+        values: The values, in any order
+    """
+
+    values = sorted(values)
+    mean = round(sum(values) / len(values), 3) if values else None
+    return [mean, percentile(values, 0.1), percentile(values, 0.5), percentile(values, 0.9)]
+
+
+def _run_point(index, point, enemy, battles, policy, dodge_chances, seed):
+    """
+    Plays every fight for one grid point and returns its results row,
+    this runs in a worker process
+
+    Args:
+        index: Which grid point this is, so its fights get their own seed
+
+        point: The settings for this grid point
+
+        enemy: The enemy's name in ENEMIES
+
+        battles: How many fights to play
+
+        policy: The policy's name in POLICIES
+
+        dodge_chances: The Skill's dodge chances
+
+        seed: The sweep's seed, or None for random fights
+    """
+
+    player = Fighter(
+        "PAWN",
+        point["player_hp"],
+        point["player_atk"] + point["weapon"],
+        point["player_def"] + point["armor"],
+        point["player_spd"],
+        point["player_mp"],
+    )
+    opponent = Fighter(enemy, point["enemy_hp"], point["enemy_atk"], point["enemy_def"], point["enemy_spd"])
+    skill = Skill(point["hit_chance"], dodge_chances, point["max_hits"])
+    # Every grid point gets its own stream, repeatable from the sweep's seed
+    engine = CombatEngine(player, RandomStreams(seed).spawn(index).ai)
+
+    wins = 0
+    turns = []
+    hp_left = []
+    mp_left = []
+    for _ in range(battles):
+        player.hp = player.max_hp
+        player.mp = player.max_mp
+        engine.end()
+        if engine.run(opponent, skill, POLICIES[policy]):
+            wins += 1
+            turns.append(engine.turns)
+        hp_left.append(player.hp)
+        mp_left.append(player.mp)
+
+    row = [point[name] for name in DEFAULTS]
+    row += [battles, round(wins / battles, 4)]
+    row += summary(turns) + summary(hp_left) + summary(mp_left)
+    return row
+
+
+class BalanceSweep:
+    """
+    This class plays lots of simulated fights for every combination of
+    player, enemy and skill settings in a grid, spread over worker
+    processes, and writes how each combination went to a CSV file
+
+    Rows are written as soon as each grid point finishes and only a few
+    points are handed out ahead, so a huge grid never has to fit in memory
+    Turns are only counted for won fights, HP and MP left for every fight
+    """
+
+    def __init__(self, enemy="Necromancer", battles=1000, policy="attack",
+                 dodge_chances=(0.25, 0.25, 0.25, 0.25), seed=None):
+        """
+        This is the class setup
+
+        Args:
+            enemy: The enemy's name in ENEMIES, its stats are the defaults
+
+            battles: How many fights are played for each grid point
+
+            policy: What the player does on their turn, a name in POLICIES
+
+            dodge_chances: The chances of a dodge taking 25%, 50%,
+                           75% and full damage
+
+            seed: Makes the sweep repeatable, if None it's random every time
+        """
+
+        if enemy not in ENEMIES:
+            raise ValueError(f"Unknown enemy {enemy}")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy}")
+
+        self.enemy = enemy
+        self.battles = battles
+        self.policy = policy
+        self.dodge_chances = tuple(dodge_chances)
+        self.seed = seed
+
+        self.defaults = dict(DEFAULTS)
+        for stat, value in ENEMIES[enemy].items():
+            self.defaults[f"enemy_{stat.replace('defense', 'def')}"] = value
+
+    @staticmethod
+    def parse_range(text, kind=int):
+        """
+        Returns the values a range on the command line stands for,
+        "10:14" is 10 to 14, "10:14:2" goes up in 2s and "0,2" is a list
+
+        Args:
+            text: The range as it was typed
+
+            kind: int or float
+        """
+
+        if ":" in text:
+            parts = [kind(part) for part in text.split(":")]
+            start, stop = parts[0], parts[1]
+            step = parts[2] if len(parts) > 2 else 1
+            if step <= 0:
+                raise ValueError(f"The step in {text} has to be above 0")
+            values = []
+            value = start
+            while value <= stop + 1e-9:
+                values.append(round(value, 6) if kind is float else value)
+                value += step
+            return values
+        return [kind(part) for part in text.split(",")]
+
+    def points(self, ranges):
+        """
+        Returns every grid point one at a time, settings
+        that aren't given a range keep their default
+
+        Args:
+            ranges: Setting name -> the values to sweep it over
+        """
+
+        names = list(self.defaults)
+        values = [ranges.get(name) or [self.defaults[name]] for name in names]
+        for combination in itertools.product(*values):
+            yield dict(zip(names, combination))
+
+    def run(self, ranges, path, workers=None, ahead=4):
+        """
+        Plays the sweep and writes a row for each grid point to a CSV file,
+        returns how many grid points were written
+
+        Args:
+            ranges: Setting name -> the values to sweep it over
+
+            path: The CSV file to write
+
+            workers: Number of worker processes, if None one per core
+
+            ahead: How many grid points each worker gets handed out ahead
+        """
+
+        workers = workers or os.cpu_count() or 1
+        limit = workers * ahead
+        points = enumerate(self.points(ranges))
+        written = 0
+        with open(path, "w", newline="") as file, ProcessPoolExecutor(max_workers=workers) as pool:
+            writer = csv.writer(file)
+            writer.writerow(list(self.defaults) + RESULTS)
+
+            pending = set()
+            while True:
+                # Keep a few points handed out, without making them all at once
+                for index, point in itertools.islice(points, limit - len(pending)):
+                    pending.add(pool.submit(
+                        _run_point, index, point, self.enemy, self.battles,
+                        self.policy, self.dodge_chances, self.seed
+                    ))
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for job in done:
+                    writer.writerow(job.result())
+                    written += 1
+                file.flush()
+        return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate fights over a grid of stats and write the results to a CSV file")
+    parser.add_argument("--enemy", default="Necromancer", choices=list(ENEMIES), help="enemy to fight")
+    parser.add_argument("--battles", type=int, default=1000, help="fights for each grid point")
+    parser.add_argument("--policy", default="attack", choices=list(POLICIES), help="special the player keeps up, or just attack")
+    parser.add_argument("--dodge", default="0.25,0.25,0.25,0.25", help="chances of a dodge taking 25%%,50%%,75%%,full damage")
+    parser.add_argument("--seed", type=int, help="seed for repeatable results")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--out", default="balance_sweep.csv", help="CSV file to write")
+    for name, default in DEFAULTS.items():
+        flag = "--" + name.replace("_", "-")
+        parser.add_argument(flag, help=f"range like 10:14, 10:14:2 or 0,2 (default {default if default is not None else 'the enemy'})")
+    args = parser.parse_args()
+
+    sweep = BalanceSweep(
+        args.enemy, args.battles, args.policy,
+        [float(chance) for chance in args.dodge.split(",")], args.seed
+    )
+    ranges = {}
+    for name in DEFAULTS:
+        text = getattr(args, name)
+        if text is not None:
+            ranges[name] = BalanceSweep.parse_range(text, float if name == "hit_chance" else int)
+
+    count = sweep.run(ranges, args.out, args.workers)
+    print(f"{count} grid points written to {args.out}")
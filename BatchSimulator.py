@@ -0,0 +1,197 @@
+from CombatEngine import (
+    Fighter, Skill, BOSSES, BOSS_HEAL,
+    DODGE_ROUNDS, REPAIR_HEAL, SPECIALS
+)
+
+# NumPy is only needed for batch simulations, not to play the game
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class BatchSimulator:
+    """
+    This class plays a huge number of fights at once with NumPy, every
+    fight's HP, MP and buffs are kept in arrays and each turn is worked
+    out for all of them together
+
+    It follows the same rules as CombatEngine.run, the boss's action
+    chances and the dodge zones become masks over the arrays, fights
+    are dropped from the arrays as soon as they're won or lost
+    """
+
+    def __init__(self, enemy="NightBorne", skill=None, player=None, special=None, seed=None):
+        """
+        This is the class setup
+
+        Args:
+            enemy: The enemy's name in ENEMIES, or a Fighter with its stats
+
+            skill: The Skill that rolls the QTE results, if None an average player
+
+            player: A Fighter with the player's stats, if None their starting stats
+
+            special: A special the player uses whenever its buff runs out,
+                     like "Overclock", if None the player always attacks
+
+            seed: Makes the results repeatable, if None they're random
+        """
+
+        if numpy is None:
+            raise ImportError("BatchSimulator needs NumPy, install it with pip install numpy")
+        if special is not None and special not in SPECIALS:
+            raise ValueError(f"Unknown special {special}")
+
+        self.enemy = Fighter.enemy(enemy) if isinstance(enemy, str) else enemy
+        self.skill = skill or Skill()
+        self.player = player or Fighter.player()
+        self.special = special
+        self.random = numpy.random.default_rng(seed)
+
+    def hits(self, count):
+        """
+        Returns how many presses land in each of a number of attacks,
+        each press lands with the skill's hit chance until one misses
+
+        Args:
+            count: How many attacks
+        """
+
+        chance = self.skill.hit_chance
+        if chance <= 0:
+            return numpy.zeros(count, dtype=numpy.int64)
+        if chance >= 1:
+            return numpy.full(count, self.skill.max_hits, dtype=numpy.int64)
+
+        # At least k presses land with chance**k, so this is one roll per attack
+        rolls = 1.0 - self.random.random(count)
+        hits = numpy.floor(numpy.log(rolls) / numpy.log(chance)).astype(numpy.int64)
+        return numpy.minimum(hits, self.skill.max_hits)
+
+    def run(self, battles, max_turns=1000):
+        """
+        Plays the fights and returns a dict of arrays, one entry per fight,
+        "won", "turns", "hp" and "mp" left, just like CombatEngine.run
+
+        Args:
+            battles: How many fights to play
+
+            max_turns: Turns before a fight counts as lost
+        """
+
+        player = self.player
+        enemy = self.enemy
+        boss = enemy.name in BOSSES
+
+        # Damage never changes during a fight, so it's worked out once
+        # with Python's rounding to match the engine exactly
+        hit_damage = max(0, player.atk - enemy.defense)
+        base_damage = max(0, enemy.atk - player.defense)
+        if boss:
+            multipliers = [multiplier for _, multiplier in self.skill.dodge_zones] + [1.00]
+            dodge_damage = numpy.array([round(base_damage * multiplier) for multiplier in multipliers])
+            guarded_damage = numpy.array([round(damage / 2) for damage in dodge_damage.tolist()])
+            dodge_edges = numpy.array([edge for edge, _ in self.skill.dodge_zones])
+        else:
+            guarded_damage = round(base_damage / 2)
+        if self.special is not None:
+            buff, buff_turns, cost = SPECIALS[self.special]
+
+        # Results for every fight, fights that run out of turns stay lost
+        won = numpy.zeros(battles, dtype=bool)
+        turns = numpy.full(battles, max_turns, dtype=numpy.int64)
+        hp_left = numpy.zeros(battles, dtype=numpy.int64)
+        mp_left = numpy.zeros(battles, dtype=numpy.int64)
+
+        # Fights still going, each array lines up with index
+        index = numpy.arange(battles)
+        hp = numpy.full(battles, player.max_hp, dtype=numpy.int64)
+        mp = numpy.full(battles, player.max_mp, dtype=numpy.int64)
+        enemy_hp = numpy.full(battles, enemy.max_hp, dtype=numpy.int64)
+        buffs = {
+            "overclock": numpy.zeros(battles, dtype=numpy.int64),
+            "guard": numpy.zeros(battles, dtype=numpy.int64),
+            "repair": numpy.zeros(battles, dtype=numpy.int64),
+        }
+
+        player_turn = player.spd > enemy.spd
+        for turn in range(1, max_turns + 1):
+            if index.size == 0:
+                break
+            count = index.size
+
+            if player_turn:
+                # Specials take the turn, everyone else attacks
+                attacking = numpy.ones(count, dtype=bool)
+                if self.special is not None:
+                    using = (buffs[buff] == 0) & (mp >= cost)
+                    mp[using] -= cost
+                    buffs[buff][using] = buff_turns
+                    attacking = ~using
+
+                damage = numpy.where(attacking, self.hits(count) * hit_damage, 0)
+                overclocked = attacking & (buffs["overclock"] > 0)
+                damage[overclocked] *= 2
+                buffs["overclock"][overclocked] -= 1
+                enemy_hp = numpy.maximum(enemy_hp - damage, 0)
+
+                finished = attacking & (enemy_hp <= 0)
+                won[index[finished]] = True
+
+            else:
+                buffed = (buffs["overclock"] > 0) | (buffs["guard"] > 0) | (buffs["repair"] > 0)
+                guarded = buffs["guard"] > 0
+
+                if not boss:
+                    attacked = numpy.ones(count, dtype=bool)
+                    hp -= numpy.where(guarded, guarded_damage, base_damage)
+                    buffs["guard"][guarded] -= 1
+                else:
+                    # The bands from CombatEngine.boss_action
+                    roll = (self.random.random(count) * 100).astype(numpy.int64) + 1
+                    low = enemy_hp <= 40
+                    heal = numpy.where(low, roll <= 40, (enemy_hp <= 75) & (roll <= 20))
+                    debuff = ~heal & buffed & numpy.where(low, roll <= 60, (roll > 20) & (roll <= 30))
+                    attacked = ~heal & ~debuff
+
+                    enemy_hp += numpy.where(heal, numpy.minimum(enemy.max_hp - enemy_hp, BOSS_HEAL), 0)
+                    for counter in buffs.values():
+                        counter[debuff] = 0
+
+                    for _ in range(DODGE_ROUNDS):
+                        zone = numpy.searchsorted(dodge_edges, self.random.random(count), side="right")
+                        hit = numpy.where(guarded, guarded_damage[zone], dodge_damage[zone])
+                        hp -= numpy.where(attacked, hit, 0)
+                    buffs["guard"][attacked & guarded] -= 1
+
+                hp = numpy.maximum(hp, 0)
+                finished = attacked & (hp <= 0)
+
+                # Auto-Repairs after an attack the player lived through
+                repairing = attacked & ~finished & (buffs["repair"] > 0)
+                hp[repairing] = numpy.minimum(hp[repairing] + REPAIR_HEAL, player.max_hp)
+                buffs["repair"][repairing] -= 1
+
+            # Finished fights are written out and dropped
+            if finished.any():
+                ended = index[finished]
+                turns[ended] = turn
+                hp_left[ended] = hp[finished]
+                mp_left[ended] = mp[finished]
+
+                going = ~finished
+                index = index[going]
+                hp = hp[going]
+                mp = mp[going]
+                enemy_hp = enemy_hp[going]
+                for name in buffs:
+                    buffs[name] = buffs[name][going]
+
+            player_turn = not player_turn
+
+        # Fights that ran out of turns
+        hp_left[index] = hp
+        mp_left[index] = mp
+
+        return {"won": won, "turns": turns, "hp": hp_left, "mp": mp_left}
@@ -1,6 +1,9 @@
-import random
 import arcade
 from ScreenChanger import ScreenChanger
+from TextCache import TEXT_CACHE
+from Animator import Animator
+from CombatEngine import CombatEngine, HEAL, DEBUFF, dodge_multiplier
+from RandomStreams import RNG
 
 class BattleScreen:
     """
@@ -36,7 +39,7 @@ class BattleScreen:
 
         # ATTACK QTE STATE
         self.attack_animation_sprite= None
-        self.pie_sprite = arcade.load_texture("Simple_RPG/Art/Attack/Pie.png")
+        self.pie_sprite = main.assets.texture("Simple_RPG/Art/Attack/Pie.png")
         self.pointer_sprite = None
         self.attack_animation_list = arcade.SpriteList()
         self.pointer_list = arcade.SpriteList()
@@ -52,17 +55,15 @@ class BattleScreen:
         self.enemy_display_hp = 0
         self.start_enemy_hp_animation = False
 
+        # Plays the enemy animations below, each one is only
+        # updated while it's running
+        self.animator = Animator()
+
         # ENEMY ATTACK ANIMATION
-        self.enemy_attack_frames = []
-        self.enemy_attack_frame_index = 0
-        self.enemy_attack_frame_timer = 0
         self.enemy_attack_frame_duration = 0.1
         self.enemy_sprite_attack_animation_active = False
         
         # NIGHTBORNE SPECIALS ANIMATION
-        self.special_anim_frames = []
-        self.special_anim_index = 0
-        self.special_anim_timer = 0
         self.special_anim_frame_duration = 0.12
         self.special_anim_active = False
         self.pending_special_popup = None
@@ -72,16 +73,10 @@ class BattleScreen:
         self.apply_enemy_damage_after_attack = False
 
         # ENEMY HURT ANIMATION
-        self.enemy_hurt_frames = []
-        self.enemy_hurt_frame_index = 0
-        self.enemy_hurt_frame_timer = 0
         self.enemy_hurt_frame_duration = 0.15
         self.enemy_hurt_animation_active = False
 
         # ENEMY DEATH ANIMATION
-        self.enemy_death_frames = []
-        self.enemy_death_index = 0
-        self.enemy_death_timer = 0
         self.enemy_death_frame_duration = 0.1
         self.enemy_death_animation_active = False
 
@@ -97,7 +92,7 @@ class BattleScreen:
         self.dodge_bar_y = 0
         self.dodge_bar_left = 0
         self.dodge_bar_right = 0
-        self.dodge_bar_texture = arcade.load_texture("Simple_RPG/Art/Dodge/Bar.png")
+        self.dodge_bar_texture = main.assets.texture("Simple_RPG/Art/Dodge/Bar.png")
         self.dodge_bar_width = self.dodge_bar_texture.width
         self.dodge_bar_height = self.dodge_bar_texture.height
 
@@ -107,7 +102,7 @@ class BattleScreen:
         self.pointer_moving = False
         self.dodge_delay_timer = 0
         self.dodge_start_delay = 0.5
-        self.dodge_pointer_texture = arcade.load_texture("Simple_RPG/Art/Attack/Pointer.png")
+        self.dodge_pointer_texture = main.assets.texture("Simple_RPG/Art/Attack/Pointer.png")
         self.dodge_pointer_width = self.dodge_pointer_texture.width
         self.dodge_pointer_height = self.dodge_pointer_texture.height
         self.dodge_pointer_scale = 0.5
@@ -118,16 +113,15 @@ class BattleScreen:
         self.dodge_direction = None
         self.boss_attack_animation_played = False
         
-        self.dodge_down = arcade.load_texture("Simple_RPG/Art/Dodge/Down.png")
-        self.dodge_right = arcade.load_texture("Simple_RPG/Art/Dodge/Right.png")
-        self.dodge_up = arcade.load_texture("Simple_RPG/Art/Dodge/Up.png")
-        self.dodge_left = arcade.load_texture("Simple_RPG/Art/Dodge/Left.png")
+        self.dodge_down = main.assets.texture("Simple_RPG/Art/Dodge/Down.png")
+        self.dodge_right = main.assets.texture("Simple_RPG/Art/Dodge/Right.png")
+        self.dodge_up = main.assets.texture("Simple_RPG/Art/Dodge/Up.png")
+        self.dodge_left = main.assets.texture("Simple_RPG/Art/Dodge/Left.png")
         self.dodge_list = (self.dodge_down, self.dodge_right, self.dodge_up, self.dodge_left)
 
         # PLAYER BUFFS
-        self.overclock = 0
-        self.guard = 0
-        self.repair = 0
+        # The rules and buffs live in the engine, this class animates the results
+        self.engine = CombatEngine(self.character)
         self.repair_pending = False
         self.repair_in_progress = False
         self.repair_delay = 1.5
@@ -135,12 +129,41 @@ class BattleScreen:
         self.special_menu_options = list(self.character.special.keys())
         self.special_menu_index = 0
 
+
+    # Buffs, kept by the engine
+    @property
+    def overclock(self):
+        """Attacks left that Overclock doubles"""
+        return self.engine.overclock
+
+    @overclock.setter
+    def overclock(self, value):
+        self.engine.overclock = value
+
+    @property
+    def guard(self):
+        """Enemy attacks left that Tight Guard halves"""
+        return self.engine.guard
+
+    @guard.setter
+    def guard(self, value):
+        self.engine.guard = value
+
+    @property
+    def repair(self):
+        """Enemy attacks left that Auto-Repairs heals after"""
+        return self.engine.repair
+
+    @repair.setter
+    def repair(self, value):
+        self.engine.repair = value
+
     
     def try_fight(self):
         """Try to trigger a fight based on RNG."""
         
         chance = 1.0
-        if random.random() < chance:
+        if RNG.encounters.random() < chance:
             if not self.main.battle_tutorial_seen:
                 self.main.popup_state = "battle_tutorial"
                 self.main.menu_index = 0
@@ -180,16 +203,19 @@ class BattleScreen:
 
         # Pick enemy
         if boss_fight:
-            main.current_enemy = random.choice(main.boss_list)
+            main.current_enemy = RNG.encounters.choice(main.boss_list)
         else:
-            main.current_enemy = random.choice(main.enemies)
+            main.current_enemy = RNG.encounters.choice(main.enemies)
+
+        # Keep this enemy's frames cached for the whole fight
+        main.assets.textures.pin("enemy", main.current_enemy.animation_keys())
 
         # Create sprite
         main.fight_enemy = main.current_enemy.idle_sprite()
-        main.fight_enemy.texture = main.current_enemy.frames[0]
+        main.fight_enemy.texture = main.current_enemy.animation("idle")[0]
 
-        # Reset HP
-        main.current_enemy.hp = main.current_enemy.max_hp
+        # Reset HP and find out who goes first
+        first_turn = self.engine.start(main.current_enemy)
         self.enemy_display_hp = main.current_enemy.hp
 
         # Position sprite
@@ -205,11 +231,8 @@ class BattleScreen:
         main.popup_state = None
         main.loot_popup_state = None
 
-        # Decide who acts first
-        if main.character.spd > main.current_enemy.spd:
-            self.turn = "player"
-        else:
-            self.turn = "enemy"
+        # Whoever is faster acts first
+        self.turn = first_turn
             
     
     def load_enemy_sprite(self, enemy):
@@ -268,7 +291,7 @@ class BattleScreen:
         text_width = len(hp_text) * 7
         text_x = left - text_width - 20
         text_y = cy - (bar_height / 2)
-        arcade.draw_text(hp_text, text_x, text_y, arcade.color.WHITE, 14, bold=True)
+        TEXT_CACHE.draw(hp_text, text_x, text_y, arcade.color.WHITE, 14, key="player_hp", bold=True)
             
     
     def draw_player_mp_bar(self):
@@ -308,7 +331,7 @@ class BattleScreen:
         text_width = len(mp_text) * 7
         text_x = left - text_width - 25
         text_y = cy - (bar_height / 2)
-        arcade.draw_text(mp_text, text_x, text_y, arcade.color.WHITE, 14, bold=True)
+        TEXT_CACHE.draw(mp_text, text_x, text_y, arcade.color.WHITE, 14, key="player_mp", bold=True)
 
 
     def draw_enemy_hp_bar(self):
@@ -420,63 +443,33 @@ class BattleScreen:
             self.start_enemy_hp_animation = False
     
     
-    def update_enemy_hurt_animation(self, delta_time):
-        """
-        Updates enemy hurt animation frames
-        
-        Args:
-            delta_time: Seconds since the last frame
-        """
+    def finish_enemy_hurt_animation(self):
+        """Returns the enemy to its idle texture once the hurt animation is done"""
         
-        if not self.enemy_hurt_animation_active:
-            return
-
-        self.enemy_hurt_frame_timer += delta_time
-
-        # Keeps track of how long every individual sprite should stay up
-        if self.enemy_hurt_frame_timer >= self.enemy_hurt_frame_duration:
-            self.enemy_hurt_frame_timer = 0.0
-            self.enemy_hurt_frame_index += 1
-
-            # Advances to the next sprite when appropriate
-            if self.enemy_hurt_frame_index < len(self.enemy_hurt_frames):
-                self.main.fight_enemy.texture = self.enemy_hurt_frames[self.enemy_hurt_frame_index]
-            else:
-                # Turn off aniamtion once completed and # Return to idle texture
-                self.enemy_hurt_animation_active = False
-                enemy = self.main.current_enemy
-                self.enemy_hurt_frame_index = 0
-                self.main.fight_enemy.texture = enemy.frames[0]
+        self.enemy_hurt_animation_active = False
+        self.main.fight_enemy.texture = self.main.current_enemy.animation("idle")[0]
 
 
-    def update_enemy_attack_animation(self, delta_time):
+    def play_enemy_attack_animation(self, enemy):
         """
-        Advance frames for enemy attack animation
+        Starts the enemy attack animation, damage waits until it's done
         
         Args:
-            delta_time: Seconds since the last frame
+            enemy: The current enemy
         """
         
-        # Ensures animation only runs when it's supposed to
-        if not self.enemy_sprite_attack_animation_active:
-            return
-
-        frames = self.enemy_attack_frames
-        self.enemy_attack_frame_timer += delta_time
+        self.enemy_sprite_attack_animation_active = True
+        self.animator.play(
+            "attack", self.main.fight_enemy, enemy.attack_animation(),
+            self.enemy_attack_frame_duration, self.finish_enemy_attack_animation
+        )
 
-        # Keeps track of how long every individual sprite should stay up
-        if self.enemy_attack_frame_timer >= self.enemy_attack_frame_duration:
-            self.enemy_attack_frame_timer = 0.0
-            self.enemy_attack_frame_index += 1
 
-            # Advances to the next sprite when appropriate
-            if self.enemy_attack_frame_index < len(frames):
-                self.main.fight_enemy.texture = frames[self.enemy_attack_frame_index]
-            else:
-                # Turn off aniamtion once completed and # Return to idle texture
-                self.enemy_sprite_attack_animation_active = False
-                self.enemy_attack_frame_index = 0
-                self.main.fight_enemy.texture = self.main.current_enemy.frames[0]  # idle
+    def finish_enemy_attack_animation(self):
+        """Returns the enemy to its idle texture once the attack animation is done"""
+        
+        self.enemy_sprite_attack_animation_active = False
+        self.main.fight_enemy.texture = self.main.current_enemy.animation("idle")[0]
                 
 
     def apply_pending_enemy_damage(self):
@@ -535,6 +528,7 @@ class BattleScreen:
 
         # shorthand
         main = self.main
+        self.engine.enemy = enemy
 
         # Boss attack
         from NightBorne import NightBorne
@@ -542,20 +536,19 @@ class BattleScreen:
         if isinstance(enemy, NightBorne):
 
             # Boss decides its action
-            decision, healed_amount = enemy.decide_action(self)
+            decision, healed_amount = self.engine.boss_turn()
             
             # Healing
-            if decision == 1:
+            if decision == HEAL:
+                self.start_enemy_hp_animation = True
+
                 # Hide battle UI
                 main.fight_buttons_visible = False
                 main.hp_bar_visible = False
                 main.hp_label_visible = False
 
-                # Load frames for special animation
-                self.special_anim_frames = enemy.special_animation()
-                self.special_anim_index = 0
-                self.special_anim_timer = 0
-                self.special_anim_active = True
+                # Play special animation
+                self.play_special_animation(enemy)
 
                 # Store popup text to show after special animation
                 self.pending_special_popup = f"The {enemy.name} healed {healed_amount} HP!"
@@ -563,17 +556,14 @@ class BattleScreen:
                 return
 
             # Debuff
-            elif decision == 2:
+            elif decision == DEBUFF:
                 # Hide battle UI
                 main.fight_buttons_visible = False
                 main.hp_bar_visible = False
                 main.hp_label_visible = False
                 
-                # Load frames for special animation
-                self.special_anim_frames = enemy.special_animation()
-                self.special_anim_index = 0
-                self.special_anim_timer = 0
-                self.special_anim_active = True
+                # Play special animation
+                self.play_special_animation(enemy)
 
                 # Store popup text to show special after animation
                 self.pending_special_popup = f"The {enemy.name} nullified your specials!"
@@ -596,17 +586,14 @@ class BattleScreen:
                 return  # damage handled inside dodge
 
         # Regular enemy attack
-        damage, self.guard = enemy.calc_damage(self.guard, self.character)
+        damage = self.engine.enemy_attack()
 
         # Play enemy attack
-        main.sfx_speed = random.uniform(1, 1.1)
+        main.sfx_speed = RNG.audio.uniform(1, 1.1)
         main.current_sfx = arcade.play_sound(main.necromancer_attack_sfx, .5, 0, False, main.sfx_speed)
         
         # Play enemy attack animation
-        self.enemy_attack_frames = enemy.attack_animation()
-        self.enemy_attack_frame_index = 0
-        self.enemy_attack_frame_timer = 0.0
-        self.enemy_sprite_attack_animation_active = True
+        self.play_enemy_attack_animation(enemy)
 
         # Wait until animation finishes before applying damage
         self.pending_enemy_damage = damage
@@ -654,29 +641,25 @@ class BattleScreen:
         self.attack_animation_sprite.visible = False
         self.pointer_sprite.visible = False
 
-        # Apply Overclock damage boost
-        if self.overclock > 0:
-            self.attack_total_damage *= 2
-            self.overclock -= 1
+        # Apply the combo's damage, doubled by Overclock
+        self.engine.enemy = enemy
+        self.attack_total_damage = self.engine.attack(self.total_attack_hits)
 
         # If damage was dealt
         if self.attack_total_damage > 0:   
             # Play hit SFX
-            main.sfx_speed = random.uniform(1, 1.1)
+            main.sfx_speed = RNG.audio.uniform(1, 1.1)
             main.current_sfx = arcade.play_sound(main.hit_sfx, .5, 0, False, main.sfx_speed)
-            
-            # Apply damage
-            enemy.hp = max(0, enemy.hp - self.attack_total_damage)
 
             # Animate enemy HP bar
             self.start_enemy_hp_animation = True
 
             # play enemy Hurt animation
-            self.enemy_hurt_frames = enemy.hurt_animation()
-            self.enemy_hurt_frame_index = 0
-            self.enemy_hurt_frame_timer = 0.0
             self.enemy_hurt_animation_active = True
-            main.fight_enemy.texture = self.enemy_hurt_frames[0]
+            self.animator.play(
+                "hurt", main.fight_enemy, enemy.hurt_animation(),
+                self.enemy_hurt_frame_duration, self.finish_enemy_hurt_animation
+            )
 
             if enemy.hp > 0:
                 main.loot_popup_text = (
@@ -706,17 +689,16 @@ class BattleScreen:
             return
 
         # Play enemy death animation
-        self.enemy_death_frames = enemy.death_animation()
-        self.enemy_death_index = 0
-        self.enemy_death_timer = 0.0
         self.enemy_death_animation_active = True
+        self.animator.play(
+            "death", main.fight_enemy, enemy.death_animation(),
+            self.enemy_death_frame_duration, self.finish_enemy_death_animation
+        )
 
         # Battle ends and buffs are reset
         self.turn = "player"
         main.enemy_action_timer = 0
-        self.overclock = 0
-        self.guard = 0
-        self.repair = 0
+        self.engine.end()
         
         
     def handle_attack_input(self, enemy):
@@ -746,13 +728,9 @@ class BattleScreen:
         # If attack lands
         if hit:
 
-            # Calculate immediate hit damage (before combo bonus)
-            damage = self.character.atk
-            defense = getattr(enemy, "defense", 0)
-            total_damage = max(0, damage - defense)
-
-            # Add to combo total
-            self.attack_total_damage += total_damage
+            # Add this hit to the combo total (before Overclock)
+            self.engine.enemy = enemy
+            self.attack_total_damage += self.engine.hit_damage()
             self.attack_hits += 1
             self.total_attack_hits += 1
 
@@ -811,7 +789,7 @@ class BattleScreen:
         self.pointer_x = self.dodge_bar_left
 
         # Choose arrow direction & pick arrow sprite from MainScreen
-        self.dodge_direction = random.choice(["Up", "Down", "Left", "Right"])
+        self.dodge_direction = RNG.qte.choice(["Up", "Down", "Left", "Right"])
 
         # Example: main.dodge_up, main.dodge_left…
         self.current_dodge_arrow = getattr(self, f"dodge_{self.dodge_direction.lower()}")
@@ -832,12 +810,7 @@ class BattleScreen:
         w = 500
 
         # Background panel
-        arcade.draw_lrbt_rectangle_filled(
-            cx - w/2, cx + w/2, cy - h/2, cy + h/2, arcade.color.BLACK
-        )
-        arcade.draw_lrbt_rectangle_outline(
-            cx - w/2, cx + w/2, cy - h/2, cy + h/2, arcade.color.RED, 3
-        )
+        panel = [ScreenChanger.button(cx, cy, w, h, border_width=3)]
 
         # Define buttons
         buttons = ["Attack", "Items", "Special"]
@@ -847,17 +820,20 @@ class BattleScreen:
 
         start_x = cx - (len(buttons) * box_w + (len(buttons) - 1) * spacing) / 2
 
-        # Draw each button using ScreenChnager's draw_button method
+        # Lay out each button with ScreenChanger's button method
         for i, option in enumerate(buttons):
             cx_button = start_x + i * (box_w + spacing) + box_w / 2
-            ScreenChanger.draw_button(
+            panel.append(ScreenChanger.button(
                 cx_button,
                 cy,
                 box_w,
                 box_h,
                 option,
                 highlighted=(i == main.fight_menu_index)
-            )
+            ))
+
+        # The panel and buttons are drawn as one batch
+        ScreenChanger.draw_buttons(panel)
 
 
     def apply_dodge_result(self, enemy, forced_fail=False):
@@ -872,45 +848,21 @@ class BattleScreen:
         """
         
         main = self.main
-        character = self.character
 
         # Track accumulated damage
         if not hasattr(self, "dodge_total_damage"):
             self.dodge_total_damage = 0
 
-        base_damage = max(0, enemy.atk - character.defense)
-
-        # Determine damage multiplier
-        if forced_fail or base_damage == 0:
+        # Determine damage multiplier from the Block/Dodge zone the pointer stopped in
+        if forced_fail:
             damage_multiplier = 1.0
-            self.blocked_percent = 0
         else:
             bar_center = (self.dodge_bar_left + self.dodge_bar_right) / 2
-            distance = abs(self.pointer_x - bar_center)
-
-            # Block/Dodge zones
-            half_green = 33 / 2
-            yellow_outer = half_green + 31
-            orange_outer = yellow_outer + 62
-
-            if distance <= half_green:
-                damage_multiplier = 0.25
-            elif distance <= yellow_outer:
-                damage_multiplier = 0.50
-            elif distance <= orange_outer:
-                damage_multiplier = 0.75
-            else:
-                damage_multiplier = 1.00
+            damage_multiplier = dodge_multiplier(abs(self.pointer_x - bar_center))
 
         # Apply damage
-        damage = round(base_damage * damage_multiplier)
-
-        if self.guard > 0:
-            damage = round(damage / 2)
-
-        old_hp = character.hp
-        character.hp = max(0, character.hp - damage)
-        actual_damage = old_hp - character.hp
+        self.engine.enemy = enemy
+        actual_damage = self.engine.dodge(damage_multiplier)
 
         # Add to total
         self.dodge_total_damage += actual_damage
@@ -935,8 +887,7 @@ class BattleScreen:
         # FINAL dodge round applies total damage
         # Play boss attack animation
         if not self.boss_attack_animation_played:
-            self.enemy_attack_frames = enemy.attack_animation()
-            self.enemy_sprite_attack_animation_active = True
+            self.play_enemy_attack_animation(enemy)
             self.boss_attack_animation_played = True
 
         # Show popup
@@ -950,8 +901,7 @@ class BattleScreen:
         self.start_hp_animation = True
 
         # Update guard
-        if self.guard > 0:
-            self.guard -= 1
+        self.engine.finish_dodges()
 
         # Reset UI
         self.dodge_active = False
@@ -1007,96 +957,70 @@ class BattleScreen:
         self.pointer_list.append(self.pointer_sprite)
 
 
-    def update_enemy_death_animation(self, delta_time):
-        """
-        Advance enemy death animation and handle fight cleanup
+    def finish_enemy_death_animation(self):
+        """Cleans up the fight once the enemy death animation is done"""
         
-        Args:
-            delta_time: Seconds since the last frame
-        """
         main = self.main
 
+        self.enemy_death_animation_active = False
+        if not main.in_boss_fight:
+            main.in_fight = False
+            main.fight_enemy.visible = False
+            main.fight_sprites = arcade.SpriteList()
+            main.post_fight_cooldown = 1
 
-        if not self.enemy_death_animation_active:
-            return
+            # Determine whether the enemy dropped an item
+            text = main.current_enemy.drop_loot(main.character)
+            if text == None:
+                main.loot_popup_text = f"The {main.current_enemy.name} died"
+            else:
+                main.loot_popup_text = f"The {main.current_enemy.name} dropped an {text}"
 
-        self.enemy_death_timer += delta_time
+            main.loot_popup_state = "loot"
+            main.loot_popup_timer = 0.0
+            main.transition_music(main.overworld)
 
-        # Keeps track of how long every individual sprite should stay up
-        if self.enemy_death_timer >= self.enemy_death_frame_duration:
-            self.enemy_death_timer = 0.0
-            self.enemy_death_index += 1
-            
-            # Advances to the next sprite when appropriate
-            if self.enemy_death_index < len(self.enemy_death_frames):
-                main.fight_enemy.texture = self.enemy_death_frames[self.enemy_death_index]
-            else:
-                # Finish animation and perform cleanup
-                self.enemy_death_animation_active = False
-                if not main.in_boss_fight:
-                    main.in_fight = False
-                    main.fight_enemy.visible = False
-                    main.fight_sprites = arcade.SpriteList()
-                    main.post_fight_cooldown = 1
-
-                    # Determine whether the enemy dropped an item
-                    text = main.current_enemy.drop_loot(main.character)
-                    if text == None:
-                        main.loot_popup_text = f"The {main.current_enemy.name} died"
-                    else:
-                        main.loot_popup_text = f"The {main.current_enemy.name} dropped an {text}"
-
-                    main.loot_popup_state = "loot"
-                    main.loot_popup_timer = 0.0
-                    main.transition_music(main.overworld)
-
-                # Set-up the win screen if it was a boss fight
-                else:
-                    main.win = True
-                    main.popup_options = ["OK"]
-                    main.menu_index = 0
-                    main.transition_music(main.win_music)
-
-
-    def update_special_animation(self, delta_time):
+        # Set-up the win screen if it was a boss fight
+        else:
+            main.win = True
+            main.popup_options = ["OK"]
+            main.menu_index = 0
+            main.transition_music(main.win_music)
+
+
+    def play_special_animation(self, enemy):
         """
-        Update NightBorne heal/debuff animation frames
+        Starts the NightBorne heal/debuff animation
         
         Args:
-            delta_time: Seconds since the last frame
+            enemy: The current enemy
         """
+        
+        self.special_anim_active = True
+        self.animator.play(
+            "special", self.main.fight_enemy, enemy.special_animation(),
+            self.special_anim_frame_duration, self.finish_special_animation
+        )
 
-        if not self.special_anim_active:
-            return
-
-        self.special_anim_timer += delta_time
-
-        # Keeps track of how long every individual sprite should stay up
-        if self.special_anim_timer >= self.special_anim_frame_duration:
-            self.special_anim_timer = 0
-            self.special_anim_index += 1
 
-            # Advances to the next sprite when appropriate
-            if self.special_anim_index < len(self.special_anim_frames):
-                self.main.fight_enemy.texture = self.special_anim_frames[self.special_anim_index]
-                return
+    def finish_special_animation(self):
+        """Shows what the special did and gives the turn back once its animation is done"""
 
-            # Animation finished
-            self.special_anim_active = False
+        self.special_anim_active = False
 
-            # Return to idle frame
-            enemy = self.main.current_enemy
-            self.main.fight_enemy.texture = enemy.frames[0]
+        # Return to idle frame
+        enemy = self.main.current_enemy
+        self.main.fight_enemy.texture = enemy.animation("idle")[0]
 
-            # Show popup with stored text
-            self.main.loot_popup_text = self.pending_special_popup
-            self.main.loot_popup_state = "loot"
-            self.main.loot_popup_timer = 0.0
-            self.pending_special_popup = None
+        # Show popup with stored text
+        self.main.loot_popup_text = self.pending_special_popup
+        self.main.loot_popup_state = "loot"
+        self.main.loot_popup_timer = 0.0
+        self.pending_special_popup = None
 
-            # Restore UI
-            self.main.fight_buttons_visible = True
-            self.main.hp_bar_visible = True
-            self.main.hp_label_visible = True
+        # Restore UI
+        self.main.fight_buttons_visible = True
+        self.main.hp_bar_visible = True
+        self.main.hp_label_visible = True
 
-            self.turn = "player"
+        self.turn = "player"
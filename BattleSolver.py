@@ -0,0 +1,379 @@
+import hashlib
+import json
+import os
+import tempfile
+from CombatEngine import (
+    Fighter, Skill, BOSSES, BOSS_HEAL, DODGE_ROUNDS, REPAIR_HEAL, SPECIALS
+)
+
+# Where solved fights are kept between runs
+CACHE_DIR = os.path.join("Simple_RPG", ".cache", "battles")
+
+# What Hp_Potion and Mp_Potion restore
+POTION_RESTORE = 20
+
+# Where a move can end up besides another state
+WIN = -1
+LOSS = -2
+
+
+class BattleSolver:
+    """
+    This class works out the exact chance of winning a fight and how many
+    turns it lasts on average, for every state the fight can get into,
+    instead of sampling fights like the simulators do
+
+    A state is whose turn it is, the player's HP and MP, the enemy's HP,
+    the overclock, guard and repair counters and the potions left
+    Every state the fight can reach is found once with its moves and
+    their chances, then the values are worked out from the end of the
+    fight backwards, going over them again until nothing changes since
+    the boss healing can send a fight back to a state it was in before
+
+    Solved fights are saved to disk, keyed by the stats, the skill and
+    the policy, so the same fight is only ever solved once
+    """
+
+    def __init__(self, enemy="Necromancer", skill=None, player=None, special=None,
+                 hp_potions=0, mp_potions=0, potion_at=0, cache_dir=CACHE_DIR):
+        """
+        This is the class setup
+
+        Args:
+            enemy: The enemy's name in ENEMIES, or a Fighter with its stats
+
+            skill: The Skill the QTE results come from, if None an average player
+
+            player: A Fighter with the player's stats, if None their starting stats
+
+            special: A special the player uses whenever its buff runs out,
+                     like "Overclock", if None the player only attacks
+
+            hp_potions, mp_potions: Potions the player starts with
+
+            potion_at: The player drinks an HP potion on their turn at
+                       or below this much HP, an MP potion is drunk when
+                       the special is due but there isn't the MP for it
+
+            cache_dir: Folder for solved fights, None turns the on-disk cache off
+        """
+
+        if special is not None and special not in SPECIALS:
+            raise ValueError(f"Unknown special {special}")
+
+        self.enemy = Fighter.enemy(enemy) if isinstance(enemy, str) else enemy
+        self.skill = skill or Skill()
+        self.player = player or Fighter.player()
+        self.special = special
+        self.hp_potions = hp_potions
+        self.mp_potions = mp_potions
+        self.potion_at = potion_at
+        self.cache_dir = cache_dir
+
+        # State -> (chance of winning, turns left on average), once solved
+        self.table = None
+
+    def key(self):
+        """Returns everything that changes the answer, which the cache is keyed by"""
+
+        player = self.player
+        enemy = self.enemy
+        return [
+            [player.max_hp, player.max_mp, player.atk, player.defense, player.spd],
+            [enemy.name, enemy.max_hp, enemy.atk, enemy.defense, enemy.spd],
+            [self.skill.hit_chance, list(self.skill.dodge_chances), self.skill.max_hits],
+            [self.special, self.hp_potions, self.mp_potions, self.potion_at],
+        ]
+
+    def cache_path(self):
+        """Returns the file this fight is saved in, or None if the cache is off"""
+
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha256(json.dumps(self.key()).encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self.enemy.name}-{digest}.json")
+
+    def start(self):
+        """Returns the state the fight starts in"""
+
+        player = self.player
+        turn = 0 if player.spd > self.enemy.spd else 1
+        return (turn, player.max_hp, player.max_mp, self.enemy.max_hp, 0, 0, 0,
+                self.hp_potions, self.mp_potions)
+
+    def solve(self):
+        """
+        Returns the chance of winning the fight and how many turns
+        it lasts on average, solving it first if it isn't yet
+        """
+
+        if self.table is None:
+            self.table = self.load()
+            if self.table is None:
+                self.table = self.solve_table()
+                self.save()
+        return self.table[self.start()]
+
+    # Chances of each QTE result
+    def hit_chances(self):
+        """Returns the chance of each number of presses landing in an attack"""
+
+        chance = self.skill.hit_chance
+        most = self.skill.max_hits
+        chances = [chance ** hits * (1 - chance) for hits in range(most)]
+        chances.append(chance ** most)
+        return chances
+
+    def dodge_chances(self, guarded):
+        """
+        Returns the chance of each total damage from a whole boss attack,
+        as a dict of damage -> chance
+
+        Args:
+            guarded: Whether Tight Guard halves each hit
+        """
+
+        base_damage = max(0, self.enemy.atk - self.player.defense)
+
+        # One dodge, the last zone is everything the skill doesn't cover
+        zones = self.skill.dodge_zones
+        single = {}
+        below = 0
+        for edge, multiplier in list(zones) + [(1.0, 1.00)]:
+            damage = round(base_damage * multiplier) if base_damage > 0 else 0
+            if guarded:
+                damage = round(damage / 2)
+            single[damage] = single.get(damage, 0) + max(0, edge - below)
+            below = max(below, edge)
+
+        # All the dodges together
+        total = {0: 1.0}
+        for _ in range(DODGE_ROUNDS):
+            after = {}
+            for so_far, chance in total.items():
+                for damage, hit_chance in single.items():
+                    after[so_far + damage] = after.get(so_far + damage, 0) + chance * hit_chance
+            total = after
+        return total
+
+    # Moves
+    def player_moves(self, state, hit_chances):
+        """
+        Returns where the player's turn can go from a state, as a dict of
+        next state (or WIN) -> chance
+
+        Args:
+            state: The state, which has to be the player's turn
+
+            hit_chances: The chance of each number of presses landing
+        """
+
+        _, hp, mp, enemy_hp, overclock, guard, repair, hp_potions, mp_potions = state
+        player = self.player
+
+        # Drinking an HP potion
+        if hp_potions > 0 and hp <= self.potion_at:
+            hp = min(player.max_hp, hp + POTION_RESTORE)
+            return {(1, hp, mp, enemy_hp, overclock, guard, repair, hp_potions - 1, mp_potions): 1.0}
+
+        # Keeping the special up, with an MP potion if there isn't the MP
+        if self.special is not None:
+            buff, turns, cost = SPECIALS[self.special]
+            buffs = {"overclock": overclock, "guard": guard, "repair": repair}
+            if buffs[buff] == 0:
+                if mp >= cost:
+                    buffs[buff] = turns
+                    return {(1, hp, mp - cost, enemy_hp, buffs["overclock"], buffs["guard"],
+                             buffs["repair"], hp_potions, mp_potions): 1.0}
+                if mp_potions > 0:
+                    mp = min(player.max_mp, mp + POTION_RESTORE)
+                    return {(1, hp, mp, enemy_hp, overclock, guard, repair, hp_potions, mp_potions - 1): 1.0}
+
+        # Attacking
+        hit_damage = max(0, player.atk - self.enemy.defense)
+        after_overclock = overclock - 1 if overclock > 0 else 0
+        moves = {}
+        for hits, chance in enumerate(hit_chances):
+            if chance == 0:
+                continue
+            damage = hits * hit_damage * (2 if overclock > 0 else 1)
+            left = max(0, enemy_hp - damage)
+            if left == 0:
+                target = WIN
+            else:
+                target = (1, hp, mp, left, after_overclock, guard, repair, hp_potions, mp_potions)
+            moves[target] = moves.get(target, 0) + chance
+        return moves
+
+    def enemy_moves(self, state, dodges):
+        """
+        Returns where the enemy's turn can go from a state, as a dict of
+        next state (or LOSS) -> chance
+
+        Args:
+            state: The state, which has to be the enemy's turn
+
+            dodges: Damage -> chance for a boss attack, without and with guard
+        """
+
+        _, hp, mp, enemy_hp, overclock, guard, repair, hp_potions, mp_potions = state
+        player = self.player
+        enemy = self.enemy
+
+        def attacked(damage_chances):
+            """Moves after taking a hit, with Auto-Repairs if it's up"""
+
+            moves = {}
+            after_guard = guard - 1 if guard > 0 else 0
+            for damage, chance in damage_chances.items():
+                left = max(0, hp - damage)
+                if left == 0:
+                    target = LOSS
+                elif repair > 0:
+                    target = (0, min(player.max_hp, left + REPAIR_HEAL), mp, enemy_hp,
+                              overclock, after_guard, repair - 1, hp_potions, mp_potions)
+                else:
+                    target = (0, left, mp, enemy_hp, overclock, after_guard, repair, hp_potions, mp_potions)
+                moves[target] = moves.get(target, 0) + chance
+            return moves
+
+        if enemy.name not in BOSSES:
+            damage = max(0, enemy.atk - player.defense)
+            if guard > 0:
+                damage = round(damage / 2)
+            return attacked({damage: 1.0})
+
+        # The bands from CombatEngine.boss_action, as chances out of 100
+        buffed = overclock > 0 or guard > 0 or repair > 0
+        if enemy_hp <= 40:
+            heal = 0.40
+            debuff = 0.20 if buffed else 0
+        else:
+            heal = 0.20 if enemy_hp <= 75 else 0
+            debuff = 0.10 if buffed else 0
+
+        moves = {}
+        for target, chance in attacked(dodges[guard > 0]).items():
+            moves[target] = chance * (1 - heal - debuff)
+        if heal:
+            healed = enemy_hp + min(enemy.max_hp - enemy_hp, BOSS_HEAL)
+            target = (0, hp, mp, healed, overclock, guard, repair, hp_potions, mp_potions)
+            moves[target] = moves.get(target, 0) + heal
+        if debuff:
+            target = (0, hp, mp, enemy_hp, 0, 0, 0, hp_potions, mp_potions)
+            moves[target] = moves.get(target, 0) + debuff
+        return moves
+
+    def solve_table(self, tolerance=1e-12, max_sweeps=100000):
+        """
+        Finds every state the fight can reach and returns
+        state -> (chance of winning, turns left on average)
+
+        Args:
+            tolerance: How little the values can change in a sweep
+                       for them to count as solved
+
+            max_sweeps: Sweeps before giving up on a fight that can go on forever
+        """
+
+        hit_chances = self.hit_chances()
+        dodges = {False: self.dodge_chances(False), True: self.dodge_chances(True)}
+
+        # Every reachable state, numbered so children come before their parents
+        start = self.start()
+        number = {}
+        states = []
+        moves = []
+        stack = [(start, None)]
+        seen = {start}
+        while stack:
+            state, children = stack[-1]
+            if children is None:
+                if state[0] == 0:
+                    children = self.player_moves(state, hit_chances)
+                else:
+                    children = self.enemy_moves(state, dodges)
+                stack[-1] = (state, children)
+                for child in children:
+                    if child not in (WIN, LOSS) and child not in seen:
+                        seen.add(child)
+                        stack.append((child, None))
+                continue
+
+            stack.pop()
+            number[state] = len(states)
+            states.append(state)
+            moves.append(children)
+
+        # Each state's chance of winning straight away and its other moves
+        wins = []
+        links = []
+        for children in moves:
+            wins.append(children.get(WIN, 0))
+            links.append([(chance, number[child]) for child, chance in children.items() if child not in (WIN, LOSS)])
+
+        # Children first means a fight without any way back is solved in one
+        # sweep, the boss healing needs a few more to settle
+        win = [0.0] * len(states)
+        turns = [0.0] * len(states)
+        for _ in range(max_sweeps):
+            change = 0.0
+            for index, children in enumerate(links):
+                chance = wins[index]
+                length = 1.0
+                for move_chance, child in children:
+                    chance += move_chance * win[child]
+                    length += move_chance * turns[child]
+                change = max(change, abs(chance - win[index]), abs(length - turns[index]) / length)
+                win[index] = chance
+                turns[index] = length
+            if change < tolerance:
+                break
+        else:
+            raise ValueError("This fight can go on forever, nobody can win it")
+
+        return {state: (win[index], turns[index]) for index, state in enumerate(states)}
+
+    # Disk cache
+    def load(self):
+        """
+        Returns the solved fight from disk, or None if it isn't there
+        or the file is broken, so it's solved again and written over
+        """
+
+        path = self.cache_path()
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as cache_file:
+                saved = json.load(cache_file)
+            if saved["key"] != self.key():
+                return None
+            return {tuple(state): (win, turns) for state, win, turns in saved["table"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self):
+        """Saves the solved fight to disk"""
+
+        path = self.cache_path()
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        saved = {
+            "key": self.key(),
+            "table": [[list(state), win, turns] for state, (win, turns) in self.table.items()],
+        }
+
+        # Written next to it first so a half written file is never loaded,
+        # each save gets its own so processes saving at once don't clash
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), suffix=".tmp", delete=False) as cache_file:
+                temp_path = cache_file.name
+                json.dump(saved, cache_file)
+            os.replace(temp_path, path)
+        finally:
+            # Left over only if the save failed
+            if temp_path is not None and os.path.exists(temp_path):
+                os.remove(temp_path)
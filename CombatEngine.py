@@ -0,0 +1,595 @@
+from bisect import bisect_left, bisect_right
+from RandomStreams import RNG, RandomStreams
+
+# Starting stats, the player's are the same as Character.reset
+PLAYER = {"hp": 50, "mp": 50, "atk": 12, "defense": 8, "spd": 10}
+ENEMIES = {
+    "Necromancer": {"hp": 30, "atk": 10, "defense": 5, "spd": 11},
+    "NightBorne": {"hp": 100, "atk": 16, "defense": 9, "spd": 14},
+}
+
+# Enemies that fight with the dodge QTE and boss actions
+BOSSES = ("NightBorne",)
+
+# The buff each special sets, how many turns it lasts and its MP cost
+SPECIALS = {
+    "Overclock": ("overclock", 2, 10),
+    "Tight Guard": ("guard", 2, 10),
+    "Auto-Repairs": ("repair", 3, 15),
+}
+
+# What the boss does on its turn, the numbers decide_action has always returned
+HEAL = 1
+DEBUFF = 2
+ATTACK = 3
+
+# How much the boss heals, and how much Auto-Repairs heals after each attack
+BOSS_HEAL = 40
+REPAIR_HEAL = 10
+
+# A boss attack is dodged this many times
+DODGE_ROUNDS = 4
+
+# How far from the middle of the dodge bar the pointer can stop for each
+# damage multiplier, stopping anywhere further out or missing takes full damage
+DODGE_ZONES = (
+    (33 / 2, 0.25),
+    (33 / 2 + 31, 0.50),
+    (33 / 2 + 31 + 62, 0.75),
+)
+DODGE_MULTIPLIERS = (0.25, 0.50, 0.75, 1.00)
+
+
+def enemy_damage(atk, defense, guard):
+    """
+    Returns how much damage a regular enemy attack does and
+    how many turns of guard are left after it
+
+    Args:
+        atk: The enemy's attack
+
+        defense: The player's defense
+
+        guard: How many turns of Tight Guard the player has left
+    """
+
+    damage = atk - defense if atk > defense else 0
+    if guard > 0:
+        damage = round(damage / 2)
+        guard -= 1
+    return damage, guard
+
+
+def boss_action(hp, roll, buffed):
+    """
+    Returns what the boss does on its turn, HEAL, DEBUFF or ATTACK
+    Healing gets more likely the lower its HP is and it only
+    debuffs when the player has a buff to take away
+
+    Args:
+        hp: The boss's HP
+
+        roll: A number from 1 to 100
+
+        buffed: Whether the player has any buff active
+    """
+
+    # More likely to heal when HP is at or below 40%
+    if hp <= 40:
+        if roll <= 40:
+            return HEAL
+        if roll <= 60 and buffed:
+            return DEBUFF
+        return ATTACK
+
+    # Heal chance only if below 75% HP, then a smaller debuff chance
+    if hp <= 75 and roll <= 20:
+        return HEAL
+    if 20 < roll <= 30 and buffed:
+        return DEBUFF
+    return ATTACK
+
+
+def dodge_multiplier(distance):
+    """
+    Returns how much of a boss hit gets through for where the dodge pointer stopped
+
+    Args:
+        distance: How far the pointer is from the middle of the bar in pixels
+    """
+
+    for edge, multiplier in DODGE_ZONES:
+        if distance <= edge:
+            return multiplier
+    return 1.00
+
+
+class Fighter:
+    """
+    This class is just a fighter's stats, it stands in for the Character
+    and the enemies when fights are played without a window
+    """
+
+    __slots__ = ("name", "hp", "max_hp", "mp", "max_mp", "atk", "defense", "spd")
+
+    def __init__(self, name, hp, atk, defense, spd, mp=0):
+        """
+        This is the class setup
+
+        Args:
+            name: Who this is, like "PAWN" or "Necromancer"
+
+            hp, mp: Starting and max HP and MP
+
+            atk, defense, spd: Attack, defense and speed
+        """
+
+        self.name = name
+        self.hp = self.max_hp = hp
+        self.mp = self.max_mp = mp
+        self.atk = atk
+        self.defense = defense
+        self.spd = spd
+
+    @classmethod
+    def player(cls):
+        """Returns the player with their starting stats"""
+        return cls("PAWN", **PLAYER)
+
+    @classmethod
+    def enemy(cls, name):
+        """
+        Returns an enemy from ENEMIES
+
+        Args:
+            name: The enemy's name, like "NightBorne"
+        """
+
+        return cls(name, **ENEMIES[name])
+
+
+class Skill:
+    """
+    This class stands in for a player pressing keys in the QTEs,
+    each attack press and each dodge lands by chance
+    """
+
+    def __init__(self, hit_chance=0.75, dodge_chances=(0.25, 0.25, 0.25, 0.25), max_hits=8):
+        """
+        This is the class setup
+
+        Args:
+            hit_chance: The chance each press in the attack QTE lands,
+                        the combo ends on the first miss
+
+            dodge_chances: The chances of a dodge taking 25%, 50%, 75%
+                           and full damage, they should add up to 1
+
+            max_hits: The longest combo the player can keep up
+        """
+
+        self.hit_chance = hit_chance
+        self.max_hits = max_hits
+        self.dodge_chances = dodge_chances
+
+        # Running totals with their multipliers, so a dodge only needs one roll
+        self.dodge_zones = []
+        total = 0
+        for chance, multiplier in zip(dodge_chances[:-1], DODGE_MULTIPLIERS):
+            total += chance
+            self.dodge_zones.append((total, multiplier))
+        self.dodge_edges = [edge for edge, _ in self.dodge_zones]
+
+        # Results that come out the same whatever the roll, so no roll is
+        # used up on them, the combo length or the dodge zone, else None
+        self.sure_hits = None
+        if hit_chance >= 1:
+            self.sure_hits = max_hits
+        elif hit_chance <= 0:
+            self.sure_hits = 0
+        lowest = bisect_right(self.dodge_edges, 0.0)
+        self.sure_zone = lowest if lowest == bisect_left(self.dodge_edges, 1.0) else None
+
+        # Base damage -> each zone's damage, kept since run() needs it every fight
+        self.damage_tables = {}
+
+    def hits(self, roll):
+        """
+        Returns how many presses land in one attack
+
+        Args:
+            roll: Returns a random number from 0 to 1
+        """
+
+        if self.sure_hits is not None:
+            return self.sure_hits
+        hit_chance = self.hit_chance
+        for hits in range(self.max_hits):
+            if roll() >= hit_chance:
+                return hits
+        return self.max_hits
+
+    def dodge(self, roll):
+        """
+        Returns the damage multiplier for one dodge
+
+        Args:
+            roll: Returns a random number from 0 to 1
+        """
+
+        zone = self.sure_zone
+        if zone is None:
+            zone = bisect_right(self.dodge_edges, roll())
+        return self.dodge_zones[zone][1] if zone < len(self.dodge_zones) else 1.00
+
+    def zone_damage(self, base_damage):
+        """
+        Returns the damage a dodge lets through in each zone, the last
+        zone is a full hit, without Tight Guard and with it
+
+        Args:
+            base_damage: The damage of a hit that isn't dodged at all
+        """
+
+        tables = self.damage_tables.get(base_damage)
+        if tables is None:
+            damage = [round(base_damage * multiplier) for _, multiplier in self.dodge_zones]
+            damage.append(base_damage)
+            tables = (damage, [round(hit / 2) for hit in damage])
+            self.damage_tables[base_damage] = tables
+        return tables
+
+
+class CombatEngine:
+    """
+    This class has the fighting rules, combo damage, the player's buffs,
+    enemy and boss turns, dodges and Auto-Repairs, without any drawing
+    or sound so fights can be played without a window
+
+    BattleScreen works a fight out through it and only animates the results
+    The QTEs are given to it as results, how many presses landed or how
+    much of a hit got through, or rolled from a Skill to simulate fights
+    """
+
+    def __init__(self, player, rng=None):
+        """
+        This is the class setup
+
+        Args:
+            player: The Character, or a Fighter when simulating
+
+            rng: Where random numbers come from, anything with
+                 random() and randint() works, if None the game's "ai" stream
+        """
+
+        self.player = player
+        self.enemy = None
+        self.random = rng or RNG.ai
+
+        # Buffs, how many turns each has left
+        self.overclock = 0
+        self.guard = 0
+        self.repair = 0
+
+        # Turns taken in the last fight run()
+        self.turns = 0
+
+    def start(self, enemy):
+        """
+        Begins a fight with the enemy at full HP and returns
+        who goes first, "player" or "enemy"
+
+        Args:
+            enemy: The enemy being fought
+        """
+
+        self.enemy = enemy
+        enemy.hp = enemy.max_hp
+        if self.player.spd > enemy.spd:
+            return "player"
+        return "enemy"
+
+    def end(self):
+        """Takes away the buffs once a fight is won"""
+
+        self.overclock = 0
+        self.guard = 0
+        self.repair = 0
+
+    def buffed(self):
+        """Returns whether the player has any buff active"""
+        return self.overclock > 0 or self.guard > 0 or self.repair > 0
+
+    # Player turn
+    def hit_damage(self):
+        """Returns the damage each landed press in the attack QTE adds"""
+        damage = self.player.atk - self.enemy.defense
+        return damage if damage > 0 else 0
+
+    def attack(self, hits):
+        """
+        Finishes the player's attack, doubling it if Overclock
+        is up, and returns the damage dealt
+
+        Args:
+            hits: How many presses landed in the attack QTE
+        """
+
+        enemy = self.enemy
+        damage = hits * (self.player.atk - enemy.defense) if self.player.atk > enemy.defense else 0
+        if self.overclock > 0:
+            damage *= 2
+            self.overclock -= 1
+        enemy.hp = enemy.hp - damage if enemy.hp > damage else 0
+        return damage
+
+    def use_special(self, name, mp_cost=None):
+        """
+        Uses one of the player's specials, returns False
+        without doing anything if there isn't enough MP
+
+        Args:
+            name: The special's name, like "Overclock"
+
+            mp_cost: What it costs, if None the cost from SPECIALS is used
+        """
+
+        buff, turns, cost = SPECIALS[name]
+        if mp_cost is not None:
+            cost = mp_cost
+        if self.player.mp < cost:
+            return False
+
+        self.player.mp -= cost
+        setattr(self, buff, turns)
+        return True
+
+    # Enemy turn
+    def enemy_attack(self):
+        """
+        Returns how much damage a regular enemy attack does, using
+        up a turn of guard, the damage is taken with take_damage
+        """
+
+        damage, self.guard = enemy_damage(self.enemy.atk, self.player.defense, self.guard)
+        return damage
+
+    def take_damage(self, damage):
+        """
+        Takes HP off the player and returns how much was taken
+
+        Args:
+            damage: How much damage the hit does
+        """
+
+        player = self.player
+        hp = player.hp
+        player.hp = hp - damage if hp > damage else 0
+        return hp - player.hp
+
+    def boss_turn(self, roll=None):
+        """
+        Picks and carries out the boss's action, returns the action
+        and how much it healed, or None if it didn't heal
+        An ATTACK is carried out with dodge() and finish_dodges()
+
+        Args:
+            roll: A number from 1 to 100, if None one is rolled
+        """
+
+        if roll is None:
+            roll = self.random.randint(1, 100)
+        enemy = self.enemy
+        action = boss_action(enemy.hp, roll, self.buffed())
+
+        if action == HEAL:
+            healed = min(enemy.max_hp - enemy.hp, BOSS_HEAL)
+            enemy.hp += healed
+            return action, healed
+        if action == DEBUFF:
+            self.end()
+        return action, None
+
+    def dodge(self, multiplier):
+        """
+        Takes one of the boss's hits and returns how much damage got through
+
+        Args:
+            multiplier: How much of the hit gets through, from
+                        dodge_multiplier or 1.0 for a miss
+        """
+
+        base_damage = self.enemy.atk - self.player.defense
+        if base_damage <= 0:
+            return 0
+        damage = round(base_damage * multiplier)
+        if self.guard > 0:
+            damage = round(damage / 2)
+        return self.take_damage(damage)
+
+    def finish_dodges(self):
+        """Uses up a turn of guard once every dodge round is done"""
+
+        if self.guard > 0:
+            self.guard -= 1
+
+    def repair_tick(self):
+        """
+        Heals the player with Auto-Repairs after an enemy attack,
+        returns how much was healed, or 0 if it's not active
+        """
+
+        if self.repair <= 0:
+            return 0
+        hp = self.player.hp
+        self.player.hp = min(self.player.max_hp, hp + REPAIR_HEAL)
+        self.repair -= 1
+        return self.player.hp - hp
+
+    def run(self, enemy, skill, policy=None, max_turns=1000):
+        """
+        Plays a whole fight with QTE results rolled from a skill,
+        returns whether the player won
+        The player and enemy aren't reset except for the enemy's HP
+
+        Args:
+            enemy: The enemy to fight
+
+            skill: The Skill that rolls the QTE results
+
+            policy: Takes the engine and returns what the player does on
+                    their turn, "Attack" or a special's name, if None the
+                    player always attacks, a special without the MP attacks
+
+            max_turns: Turns before the fight counts as lost, so a fight
+                       nobody can win still ends
+        """
+
+        # This is the same as going through attack(), enemy_attack(),
+        # boss_turn(), dodge() and repair_tick() with the rolls from
+        # Skill.hits() and Skill.dodge(), but everything a turn changes is
+        # kept in locals and the damage is worked out once, since a
+        # fight is over in a few microseconds
+        player = self.player
+        roll = self.random.random
+        hit_chance = skill.hit_chance
+        max_hits = skill.max_hits
+        sure_hits = skill.sure_hits
+        sure_zone = skill.sure_zone
+        boss = enemy.name in BOSSES
+
+        # The same as start()
+        self.enemy = enemy
+        player_turn = player.spd > enemy.spd
+
+        hp = player.hp
+        max_hp = player.max_hp
+        enemy_hp = enemy_max_hp = enemy.max_hp
+        overclock = self.overclock
+        guard = self.guard
+        repair = self.repair
+
+        hit_damage = player.atk - enemy.defense if player.atk > enemy.defense else 0
+        base_damage = enemy.atk - player.defense if enemy.atk > player.defense else 0
+        hit = base_damage
+        guarded_hit = round(base_damage / 2)
+
+        # Each dodge zone's damage, picked by where the roll lands among the zone edges
+        edges = skill.dodge_edges
+        zone_damage, guarded_zone_damage = skill.zone_damage(base_damage)
+        rounds = range(DODGE_ROUNDS)
+
+        won = False
+        turns = max_turns
+        for turn in range(1, max_turns + 1):
+            if player_turn:
+                player_turn = False
+
+                if policy is not None:
+                    # The policy looks at the engine, so it has to be up to date
+                    player.hp, enemy.hp = hp, enemy_hp
+                    self.overclock, self.guard, self.repair = overclock, guard, repair
+                    action = policy(self)
+                    if action != "Attack" and self.use_special(action):
+                        overclock, guard, repair = self.overclock, self.guard, self.repair
+                        continue
+
+                # The attack QTE, presses land until one misses
+                if sure_hits is None:
+                    hits = 0
+                    while hits < max_hits and roll() < hit_chance:
+                        hits += 1
+                else:
+                    hits = sure_hits
+                damage = hits * hit_damage
+                if overclock > 0:
+                    damage *= 2
+                    overclock -= 1
+                enemy_hp = enemy_hp - damage if enemy_hp > damage else 0
+                if enemy_hp <= 0:
+                    won = True
+                    turns = turn
+                    break
+                continue
+
+            player_turn = True
+            if not boss:
+                if guard > 0:
+                    damage = guarded_hit
+                    guard -= 1
+                else:
+                    damage = hit
+            else:
+                # The bands from boss_action
+                action_roll = int(roll() * 100) + 1
+                buffed = overclock > 0 or guard > 0 or repair > 0
+                if enemy_hp <= 40:
+                    heal = action_roll <= 40
+                    debuff = action_roll <= 60 and buffed
+                else:
+                    heal = enemy_hp <= 75 and action_roll <= 20
+                    debuff = 20 < action_roll <= 30 and buffed
+                if heal:
+                    enemy_hp += min(enemy_max_hp - enemy_hp, BOSS_HEAL)
+                    continue
+                if debuff:
+                    overclock = guard = repair = 0
+                    continue
+
+                table = zone_damage
+                if guard > 0:
+                    table = guarded_zone_damage
+                    guard -= 1
+                if sure_zone is None:
+                    damage = 0
+                    for _ in rounds:
+                        damage += table[bisect_right(edges, roll())]
+                else:
+                    damage = table[sure_zone] * DODGE_ROUNDS
+
+            hp = hp - damage if hp > damage else 0
+            if hp <= 0:
+                turns = turn
+                break
+            if repair > 0:
+                hp = hp + REPAIR_HEAL if hp + REPAIR_HEAL < max_hp else max_hp
+                repair -= 1
+
+        player.hp = hp
+        enemy.hp = enemy_hp
+        self.turns = turns
+        if won:
+            overclock = guard = repair = 0
+        self.overclock, self.guard, self.repair = overclock, guard, repair
+        return won
+
+
+def simulate(enemy="Necromancer", skill=None, battles=1000, seed=None, policy=None):
+    """
+    Plays fights from the player's starting stats and returns how many were won
+
+    Args:
+        enemy: The enemy's name in ENEMIES
+
+        skill: The Skill that rolls the QTE results, if None an average player
+
+        battles: How many fights to play
+
+        seed: Makes the results repeatable, if None they're random
+
+        policy: What the player does on their turn, see CombatEngine.run
+    """
+
+    if skill is None:
+        skill = Skill()
+    player = Fighter.player()
+    opponent = Fighter.enemy(enemy)
+    engine = CombatEngine(player, RandomStreams(seed).ai)
+
+    wins = 0
+    for _ in range(battles):
+        player.hp = player.max_hp
+        player.mp = player.max_mp
+        engine.end()
+        wins += engine.run(opponent, skill, policy)
+    return wins
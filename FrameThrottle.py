@@ -0,0 +1,65 @@
+import arcade
+
+class FrameThrottle:
+    """
+    This class slows the game's frames down while nothing on screen
+    is changing, like when the player is sitting on a menu, so the game
+    doesn't keep redrawing the same picture 60 times a second
+
+    The view says every update whether anything is moving, once it's
+    been still for a little while the window drops to the idle rate,
+    anything moving again or a key press brings it straight back
+    """
+
+    def __init__(self, full_rate=1 / 60, idle_rate=1 / 10, delay=0.5):
+        """
+        This is the class setup
+
+        Args:
+            full_rate: Seconds between frames while things are moving
+
+            idle_rate: Seconds between frames while nothing is
+
+            delay: Seconds things have to stay still before slowing down
+        """
+
+        self.full_rate = full_rate
+        self.idle_rate = idle_rate
+        self.delay = delay
+
+        # How long nothing has changed, and whether the frames are slowed
+        self.still_time = 0
+        self.idle = False
+
+    def update(self, busy, delta_time):
+        """
+        Slows the frames down or speeds them back up, this should
+        be called every update
+
+        Args:
+            busy: Whether anything on screen is fading, animating or
+                  counting down
+
+            delta_time: Seconds since the last update
+        """
+
+        if busy:
+            self.wake()
+            return
+
+        self.still_time += delta_time
+        if not self.idle and self.still_time >= self.delay:
+            self.idle = True
+            window = arcade.get_window()
+            window.set_update_rate(self.idle_rate)
+            window.set_draw_rate(self.idle_rate)
+
+    def wake(self):
+        """Goes back to full speed, this should be called on any input"""
+
+        self.still_time = 0
+        if self.idle:
+            self.idle = False
+            window = arcade.get_window()
+            window.set_update_rate(self.full_rate)
+            window.set_draw_rate(self.full_rate)
@@ -1,6 +1,14 @@
+import time
+
+# When the game started, for measuring how long the intro takes to show up
+STARTED = time.perf_counter()
+
+import argparse
 import arcade
-from Character import Character
-from MainScreen import MainScreen
+from AssetPreloader import AssetPreloader
+from MazeGenerator import MazeGenerator
+from FrameThrottle import FrameThrottle
+from RandomStreams import RNG
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
@@ -14,10 +22,43 @@ class Intro(arcade.View):
     Anner, Isaac
     """
     
-    def __init__(self):
-        """This is the class setup"""
+    def __init__(self, report_startup=False, rooms=None, seed=None):
+        """
+        This is the class setup
+        
+        Args:
+            report_startup: Whether to print how long the game took
+                            to get the intro on screen
+            
+            rooms: How many rooms a randomly made maze should have,
+                   if None the built in maze is played
+            
+            seed: Makes the random maze and every roll in the game repeatable
+        """
         
         super().__init__()
+        
+        # The same seed plays out the same loot, fights and rolls
+        if seed is not None:
+            RNG.reseed(seed)
+        
+        # The maze to play, made here so a big one is ready by the hand-off
+        if rooms is None:
+            self.maze, self.connections = create_maze_data()
+            self.positions = None
+        else:
+            self.maze, self.connections, self.positions = MazeGenerator(seed).generate(rooms)
+        
+        # Seconds from launch until the first frame was drawn
+        self.startup_time = None
+        self.report_startup = report_startup
+        
+        # Loads the rest of the game while the intro plays
+        self.assets = AssetPreloader()
+        
+        # Slows the frames down once the text is up and waiting
+        self.throttle = FrameThrottle()
+        
         # Load the image as a sprite
         self.image_sprite = arcade.Sprite("Simple_RPG/Art/PAWN.png")
 
@@ -83,12 +124,33 @@ class Intro(arcade.View):
                 0, SCREEN_WIDTH, SCREEN_HEIGHT, 0,
                 (0, 0, 0, int(self.fade_out_alpha))
             )
+        
+        # Start loading once the intro is on screen so the
+        # worker threads don't hold up the first frame
+        if self.startup_time is None:
+            self.startup_time = time.perf_counter() - STARTED
+            self.assets.start()
+            if self.report_startup:
+                print(f"Intro shown after {self.startup_time:.3f}s")
 
     
+    def is_idle(self):
+        """Returns whether the intro is just waiting for the player"""
+        
+        return self.text_alpha >= 255 and not self.is_fading_out and self.assets.done
+    
+    
     def on_update(self, delta_time):
         """This method keeps track of what's supposed to be on screen every frame"""
         
         self.frame_count += 1
+        
+        # Nothing moves once the text is in and everything is loaded
+        self.throttle.update(not self.is_idle(), delta_time)
+        
+        # Keep the background loading moving along
+        self.assets.update()
+        
         # Fade in sequence
         if not self.is_fading_out:
             if self.bg_alpha < 255:
@@ -101,10 +163,18 @@ class Intro(arcade.View):
             self.fade_out_alpha += 300 * delta_time
             if self.fade_out_alpha >= 255:
                 self.fade_out_alpha = 255
+                
+                # Hold on the black screen until every asset is ready
+                if not self.assets.done:
+                    return
+                
+                # These were imported in the background during the intro
+                from Character import Character
+                from MainScreen import MainScreen
+                
                 # Once fade is complete, transition to MainScreen
                 player = Character()
-                maze, connections = create_maze_data()
-                main_view = MainScreen(player, maze, connections)
+                main_view = MainScreen(player, self.maze, self.connections, self.assets, self.positions)
                 self.window.show_view(main_view)
 
 
@@ -119,6 +189,8 @@ class Intro(arcade.View):
             such as SHIFT, CTRL, or ALT
         """
         
+        self.throttle.wake()
+        
         # Start gameplay once the player presses Z
         if key == arcade.key.Z and self.text_alpha >= 255 and not self.is_fading_out:
             self.is_fading_out = True
@@ -137,25 +209,25 @@ def create_maze_data():
         "A": (False, ("Start", "Room 2")),
         "B": (False, ("Room 2", "Room 3")),
         "C": (False, ("Room 2", "Room 4")),
-        "D": (False, ("Room 13", "Room 14")),
-        "E": (False, ("Room 5", "Room 1")),
-        "F": (False, ("Room 10", "Room 9")),
+        "D": (False, ("Room 4", "Room 5")),
+        "E": (False, ("Room 1", "Room 5")),
+        "F": (False, ("Start", "Room 1")),
         "G": (False, ("Start", "Room 6")),
-        "H": (False, ("Room 15", "Room 12")),
-        "I": (False, ("Room 15", "Room 8")),
-        "J": (False, ("Room 14", "Room 7")),
-        "K": (False, ("Room 18", "Room 19")),
-        "L": (False, ("Room 19", "Room 20")),
-        "M": (False, ("Room 18", "Room 6")),
-        "N": (False, ("Room 21", "Room 22")),
-        "O": (False, ("Room 18", "Room 22")),
-        "P": (False, ("Room 22", "End")),
-        "Q": (False, ("Room 12", "Room 23")),
-        "R": (False, ("Room 23", "End")),
-        "S": (False, ("Room 23", "Room 24")),
-        "T": (False, ("Room 24", "End")),
-        "U": (False, ("Room 13", "Room 25")),
-        "V": (False, ("Room 17", "Room 26"))
+        "H": (False, ("Room 3", "Room 6")),
+        "I": (False, ("Room 6", "Room 8")),
+        "J": (False, ("Room 5", "Room 7")),
+        "K": (False, ("Room 8", "Room 9")),
+        "L": (False, ("Room 9", "Room 10")),
+        "M": (False, ("Room 8", "Room 11")),
+        "N": (False, ("Room 11", "Room 12")),
+        "O": (False, ("Room 8", "Room 12")),
+        "P": (False, ("Room 12", "End")),
+        "Q": (False, ("Room 3", "Room 13")),
+        "R": (False, ("Room 13", "End")),
+        "S": (False, ("Room 13", "Room 14")),
+        "T": (False, ("Room 14", "End")),
+        "U": (False, ("Room 4", "Room 15")),
+        "V": (False, ("Room 7", "Shop"))
     }
 
     maze = {
@@ -183,7 +255,13 @@ def create_maze_data():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--startup-time", action="store_true", help="print how long the intro took to show up")
+    parser.add_argument("--rooms", type=int, help="play a randomly made maze with this many rooms")
+    parser.add_argument("--seed", type=int, help="seed for the random maze and the game's rolls")
+    args = parser.parse_args()
+    
     window = arcade.Window(SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_TITLE)
-    intro_view = Intro()
+    intro_view = Intro(args.startup_time, args.rooms, args.seed)
     window.show_view(intro_view)
     arcade.run()
\ No newline at end of file
@@ -1,18 +1,36 @@
 import arcade
-import random
 from arcade.types import Rect
+from arcade.shape_list import ShapeElementList, create_line, create_rectangle_filled, create_rectangle_outline
 from Hp_Potion import Hp_Potion
 from Mp_Potion import Mp_Potion
 from Necromancer import Necromancer
 from NightBorne import NightBorne
 from ScreenChanger import ScreenChanger
 from BattleScreen import BattleScreen
+from RandomStreams import RNG
+from AssetPreloader import AssetPreloader
+from MusicManager import MusicManager
+from MazeGraph import MazeGraph
+from WorldState import WorldState
+from RoutePlanner import RoutePlanner, UNREACHED
+from RoomLayer import RoomLayer
+from FrameThrottle import FrameThrottle
+from TextCache import TEXT_CACHE
 
 # Scaling and room size
 SCALE = 2
 ROOM_WIDTH = 40
 ROOM_HEIGHT = 20
 
+# Map units shown across the minimap at the closest zoom
+VIEW = 140
+# Map units per spatial grid cell, rooms far apart land in different cells
+GRID_CELL = 35
+# How many times the minimap can zoom out, each level halves the scale
+MAX_ZOOM = 3
+# Rooms drawn smaller than this many pixels wide are merged into blocks
+MIN_ROOM_WIDTH = 8
+
 class MiniMap:
     """
     This class handles the Minimap and inherits the maze
@@ -20,9 +38,16 @@ class MiniMap:
     It also sets up the positions of the minimap
     rooms in the game window
     
+    Rooms are kept in a spatial grid so only the ones near the player
+    are looked at, big mazes scroll with the player and zooming out
+    merges rooms that would be too small to see into blocks
+    
     Anner, Tiffany, Alexandra
     """
     
+    # How many minimap textures have been made, so each gets its own name
+    textures_made = 0
+    
     positions = {
         "Start": (50, 45),
         "Room 1": (70, 25),
@@ -44,19 +69,327 @@ class MiniMap:
         "End": (40, 115)
     }
 
-    def __init__(self, character, maze, connections):
-        """This is the class setup"""
+    def __init__(self, character, maze, connections, positions=None):
+        """
+        This is the class setup
+        
+        Args:
+            character: The instance of character the game is using
+            
+            maze: The rooms of the maze and how they link together
+            
+            connections: The paths between rooms and whether
+                         they've been revealed
+            
+            positions: Where each room sits in map units, if None
+                       the layout of the built in maze is used
+        """
         
         self.character = character
         self.maze = maze
         self.connections = connections
-        self.width = 140 * SCALE
-        self.height = 140 * SCALE
+        self.width = VIEW * SCALE
+        self.height = VIEW * SCALE
+        if positions is not None:
+            self.positions = positions
+        
+        # 0 shows rooms at full size, every level above shows twice as much
+        self.zoom = 0
 
         # Mark start room as visited
         neighbors, _, looted = self.maze[self.character.currentPosition]
         self.maze[self.character.currentPosition] = (neighbors, True, looted)
         
+        # Rooms by the grid cell their corner is in
+        self.grid = {}
+        for room, (x, y) in self.positions.items():
+            self.grid.setdefault(self.cell(x, y), []).append(room)
+        
+        # The corners of the box around every room, mazes that fit
+        # in the minimap are shown whole instead of scrolling
+        xs = [x for x, _ in self.positions.values()]
+        ys = [y for _, y in self.positions.values()]
+        self.bounds = (
+            min(xs), min(ys),
+            max(xs) + ROOM_WIDTH / SCALE, max(ys) + ROOM_HEIGHT / SCALE
+        )
+        
+        # Where the visible paths and rooms go, measured from the
+        # minimap's corner, only worked out again when the map changes
+        self.dirty = True
+        self.lines = []
+        self.rooms = []
+        self.blocks = []
+        
+        # The lines and rooms batched into one shape list, and the
+        # texture they're drawn into so a frame only has to copy it
+        self.shapes = None
+        self.texture = None
+        
+    
+    @staticmethod
+    def cell(x, y):
+        """
+        Returns the grid cell a point in map units falls in
+        
+        Args:
+            x, y: The point in map units
+        """
+        
+        return (int(x // GRID_CELL), int(y // GRID_CELL))
+        
+        
+    def invalidate(self):
+        """
+        Marks the minimap as changed so it gets rebuilt on the next draw
+        This should be called whenever a room is visited or looted,
+        a connection is revealed or the player moves
+        """
+        
+        self.dirty = True
+        
+        
+    def set_zoom(self, zoom):
+        """
+        Changes how far out the minimap is zoomed
+        
+        Args:
+            zoom: The new zoom level, kept between 0 and MAX_ZOOM
+        """
+        
+        zoom = max(0, min(MAX_ZOOM, zoom))
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.invalidate()
+        
+        
+    def viewport(self):
+        """
+        Returns the left and bottom edge of the minimap in map units
+        and how many map units it spans at the current zoom
+        """
+        
+        span = VIEW * 2 ** self.zoom
+        left, bottom, right, top = self.bounds
+        
+        # Small mazes stay where they are so the map doesn't jump around
+        if left >= 0 and bottom >= 0 and right <= span and top <= span:
+            return 0, 0, span
+        if right - left <= span and top - bottom <= span:
+            return left, bottom, span
+        
+        # Big mazes follow the player
+        x, y = self.positions[self.character.currentPosition]
+        x += ROOM_WIDTH / SCALE / 2
+        y += ROOM_HEIGHT / SCALE / 2
+        return x - span / 2, y - span / 2, span
+        
+        
+    def visible_rooms(self, left, bottom, span):
+        """
+        Returns the visited rooms in the grid cells the minimap covers,
+        with one cell to spare so paths leaving the edge still show
+        
+        Args:
+            left, bottom: The minimap's corner in map units
+            
+            span: How many map units the minimap spans
+        """
+        
+        first_x, first_y = self.cell(left, bottom)
+        last_x, last_y = self.cell(left + span, bottom + span)
+        
+        rooms = []
+        for cell_x in range(first_x - 1, last_x + 1):
+            for cell_y in range(first_y - 1, last_y + 1):
+                for room in self.grid.get((cell_x, cell_y), ()):
+                    if self.maze[room][1]:
+                        rooms.append(room)
+        return rooms
+        
+        
+    def room_color(self, room):
+        """
+        Returns the color that shows what state a room is in
+        
+        Args:
+            room: The room's name
+        """
+        
+        if room == self.character.currentPosition: return arcade.color.YELLOW
+        elif room == "End": return arcade.color.RED
+        elif room == "Shop": return arcade.color.PURPLE
+        elif self.maze[room][2] == True: return arcade.color.GREEN
+        else: return arcade.color.BLUE
+        
+        
+    def build_geometry(self):
+        """Works out the paths and room outlines for the visited rooms in view"""
+        
+        self.lines = []
+        self.rooms = []
+        self.blocks = []
+        
+        left, bottom, span = self.viewport()
+        scale = SCALE / 2 ** self.zoom
+        room_width = ROOM_WIDTH / 2 ** self.zoom
+        room_height = ROOM_HEIGHT / 2 ** self.zoom
+        visible = self.visible_rooms(left, bottom, span)
+        
+        if room_width < MIN_ROOM_WIDTH:
+            self.build_blocks(visible, left, bottom, scale)
+            self.dirty = False
+            self.shapes = None
+            return
+        
+        # Paths first
+        drawn_connections = set()
+        for room in visible:
+            neighbors = self.maze[room][0]
+            room_x, room_y = self.positions[room]
+            room_x = (room_x - left) * scale
+            room_y = (room_y - bottom) * scale
+
+            for target, dir_name, conn_label in neighbors:
+                if conn_label in self.connections and self.connections[conn_label][0] and conn_label not in drawn_connections:
+                    target_x, target_y = self.positions[target]
+                    target_x = (target_x - left) * scale
+                    target_y = (target_y - bottom) * scale
+
+                    if dir_name == "Left":
+                        start_x = room_x
+                        start_y = room_y + room_height / 2
+                        end_x = target_x + room_width
+                        end_y = target_y + room_height / 2
+                    elif dir_name == "Right":
+                        start_x = room_x + room_width
+                        start_y = room_y + room_height / 2
+                        end_x = target_x
+                        end_y = target_y + room_height / 2
+                    elif dir_name == "Forward":
+                        start_x = room_x + room_width / 2
+                        start_y = room_y + room_height
+                        end_x = target_x + room_width / 2
+                        end_y = target_y
+                    elif dir_name == "Backward":
+                        start_x = room_x + room_width / 2
+                        start_y = room_y
+                        end_x = target_x + room_width / 2
+                        end_y = target_y + room_height
+
+                    self.lines.append((start_x, start_y, end_x, end_y))
+                    drawn_connections.add(conn_label)
+
+        # Then rooms, with the color that shows what state they're in
+        for room in visible:
+            x, y = self.positions[room]
+            self.rooms.append(((x - left) * scale, (y - bottom) * scale, room_width, room_height, self.room_color(room)))
+        
+        self.dirty = False
+        self.shapes = None
+        
+        
+    def build_blocks(self, visible, left, bottom, scale):
+        """
+        Merges the rooms in view into one block per grid cell for when
+        they're zoomed out too far to tell apart, a block takes the color
+        of the most important room in it and paths inside a block are dropped
+        
+        Args:
+            visible: The visited rooms in view
+            
+            left, bottom: The minimap's corner in map units
+            
+            scale: Pixels per map unit at the current zoom
+        """
+        
+        # Lower comes first, so the player's block always shows yellow
+        order = [arcade.color.YELLOW, arcade.color.RED, arcade.color.PURPLE, arcade.color.BLUE, arcade.color.GREEN]
+        
+        colors = {}
+        for room in visible:
+            cell = self.cell(*self.positions[room])
+            color = self.room_color(room)
+            if cell not in colors or order.index(color) < order.index(colors[cell]):
+                colors[cell] = color
+        
+        # One path between each pair of blocks that have a revealed path
+        size = GRID_CELL * scale
+        gap = size / 4
+        joined = set()
+        for room in visible:
+            cell = self.cell(*self.positions[room])
+            for target, _, conn_label in self.maze[room][0]:
+                target_cell = self.cell(*self.positions[target])
+                pair = tuple(sorted((cell, target_cell)))
+                if target_cell == cell or pair in joined:
+                    continue
+                if conn_label in self.connections and self.connections[conn_label][0]:
+                    self.lines.append((
+                        (cell[0] * GRID_CELL - left) * scale + size / 2,
+                        (cell[1] * GRID_CELL - bottom) * scale + size / 2,
+                        (target_cell[0] * GRID_CELL - left) * scale + size / 2,
+                        (target_cell[1] * GRID_CELL - bottom) * scale + size / 2
+                    ))
+                    joined.add(pair)
+        
+        for (cell_x, cell_y), color in colors.items():
+            self.blocks.append((
+                (cell_x * GRID_CELL - left) * scale + gap / 2,
+                (cell_y * GRID_CELL - bottom) * scale + gap / 2,
+                size - gap,
+                color
+            ))
+        
+        
+    def build_shapes(self):
+        """Batches the paths and rooms into one shape list"""
+        
+        self.shapes = ShapeElementList()
+        for start_x, start_y, end_x, end_y in self.lines:
+            self.shapes.append(create_line(start_x, start_y, end_x, end_y, arcade.color.WHITE, 2))
+        for x, y, size, color in self.blocks:
+            self.shapes.append(create_rectangle_filled(
+                x + size / 2, y + size / 2,
+                size, size,
+                color
+            ))
+        for x, y, width, height, color in self.rooms:
+            self.shapes.append(create_rectangle_outline(
+                x + width / 2, y + height / 2,
+                width, height,
+                color, 2
+            ))
+        
+        
+    def render(self):
+        """
+        Draws the minimap into its own texture, this only
+        happens when the map changes
+        """
+        
+        atlas = arcade.get_window().ctx.default_atlas
+        if self.texture is None:
+            MiniMap.textures_made += 1
+            self.texture = arcade.Texture.create_empty(
+                f"minimap-{MiniMap.textures_made}",
+                (self.width, self.height)
+            )
+            atlas.add(self.texture)
+        
+        with atlas.render_into(self.texture) as fbo:
+            fbo.clear(color=(0, 0, 0, 0), viewport=fbo.viewport)
+            self.shapes.draw()
+        
+        
+    def update(self):
+        """Rebuilds the minimap's texture if the map changed since the last draw"""
+        
+        if self.dirty:
+            self.build_geometry()
+            self.build_shapes()
+            self.render()
+        
         
     def draw(self, screen_width, screen_height, margin=20, alpha=255):
         """
@@ -73,78 +406,66 @@ class MiniMap:
             alpha: Transparency applied to all minimap elements 
         """
         
-        ox = screen_width - self.width - margin
-        oy = screen_height - self.height - margin
-        drawn_connections = set()
-
-        line_color = (*arcade.color.WHITE[:3], int(alpha))
-        visited_color = (*arcade.color.YELLOW[:3], int(alpha))
-        unvisited_color = (*arcade.color.BLUE[:3], int(alpha))
-        end_color = (*arcade.color.RED[:3], int(alpha))
-        looted_color = (*arcade.color.GREEN[:3], int(alpha))
-        
-        # Draw paths first
-        for room, (neighbors, visited, _) in self.maze.items():
-            if visited:
-                room_x, room_y = self.positions[room]
-                room_x = ox + room_x * SCALE
-                room_y = oy + room_y * SCALE
-
-                for target, dir_name, conn_label in neighbors:
-                    if conn_label in self.connections and self.connections[conn_label][0] and conn_label not in drawn_connections:
-                        target_x, target_y = self.positions[target]
-                        target_x = ox + target_x * SCALE
-                        target_y = oy + target_y * SCALE
-
-                        if dir_name == "Left":
-                            start_x = room_x
-                            start_y = room_y + ROOM_HEIGHT / 2
-                            end_x = target_x + ROOM_WIDTH
-                            end_y = target_y + ROOM_HEIGHT / 2
-                        elif dir_name == "Right":
-                            start_x = room_x + ROOM_WIDTH
-                            start_y = room_y + ROOM_HEIGHT / 2
-                            end_x = target_x
-                            end_y = target_y + ROOM_HEIGHT / 2
-                        elif dir_name == "Forward":
-                            start_x = room_x + ROOM_WIDTH / 2
-                            start_y = room_y + ROOM_HEIGHT
-                            end_x = target_x + ROOM_WIDTH / 2
-                            end_y = target_y
-                        elif dir_name == "Backward":
-                            start_x = room_x + ROOM_WIDTH / 2
-                            start_y = room_y
-                            end_x = target_x + ROOM_WIDTH / 2
-                            end_y = target_y + ROOM_HEIGHT
-
-                        arcade.draw_line(start_x, start_y, end_x, end_y, line_color, 2)
-                        drawn_connections.add(conn_label)
-
-        # Draw rooms
-        for room, (neighbors, visited, looted) in self.maze.items():
-            if visited:
-                x, y = self.positions[room]
-                x = ox + x * SCALE
-                y = oy + y * SCALE
-                if room == self.character.currentPosition: color = visited_color 
-                elif room == "End": color = end_color
-                elif room == "Shop": color = arcade.color.PURPLE
-                elif looted == True: color = looted_color
-                else: color = unvisited_color
-                arcade.draw_lbwh_rectangle_outline(x, y, ROOM_WIDTH, ROOM_HEIGHT, color, 2)
+        self.update()
+        
+        # The whole minimap is one textured quad, faded with the room
+        # It's copied pixel for pixel so the thin lines stay sharp
+        rect = arcade.LBWH(
+            screen_width - self.width - margin,
+            screen_height - self.height - margin,
+            self.width,
+            self.height
+        )
+        arcade.draw_texture_rect(self.texture, rect, alpha=alpha, pixelated=True)
 
 
 class MainScreen(arcade.View):
-    def __init__(self, character, maze, connections):
-        """This is the class setup"""
+    def __init__(self, character, maze, connections, assets=None, positions=None):
+        """
+        This is the class setup
+        
+        Args:
+            character: The instance of character the game is using
+            
+            maze: The rooms of the maze and how they link together
+            
+            connections: The paths between rooms and whether
+                         they've been revealed
+            
+            assets: The AssetPreloader that loaded the game's files
+                    during the intro, if None they're loaded now
+            
+            positions: Where each room goes on the minimap, if None
+                       the layout of the built in maze is used
+        """
         
         super().__init__()
 
+        # Anything the preloader hasn't finished is waited on here
+        # so nothing gets loaded twice
+        self.assets = assets or AssetPreloader()
+        self.assets.finish()
+
         # OVERWORLD STATE
         self.character = character
-        self.maze = maze
-        self.connections = connections
-        self.minimap = MiniMap(character, maze, connections)
+        self.graph = MazeGraph(maze, connections)
+        
+        # Progress is kept as flags, maze and connections
+        # read them like the dicts they came from
+        self.world = WorldState(self.graph, maze, connections)
+        self.maze = self.world.maze
+        self.connections = self.world.connections
+        self.routes = RoutePlanner(self.graph, self.world)
+        # Auto-travel buttons and the rooms they go to
+        self.travel_targets = {}
+        self.positions = positions
+        self.minimap = MiniMap(character, self.maze, self.connections, positions)
+        
+        # The room on screen, drawn once each time the player moves
+        self.room_layer = RoomLayer()
+        
+        # Slows the frames down while the player sits still on a room or menu
+        self.throttle = FrameThrottle()
 
         self.win = False
         self.bg_alpha = 0
@@ -203,8 +524,9 @@ class MainScreen(arcade.View):
         self.game_over_options = ["Restart", "Quit"]
 
         # ROOM BACKGROUNDS
-        self.room_textures = {}
         self.room_texture = None
+        self.room_art = None
+        self.prefetch_rooms()
 
         # ENEMY LISTS
         self.enemies = [Necromancer()]
@@ -236,20 +558,17 @@ class MainScreen(arcade.View):
         self.fade_direction = None
         self.target_music_path = None
         self.new_music_player = None
-        self.current_music_player = arcade.play_sound(
-            arcade.load_sound(self.overworld),
-            volume=self.music_volume,
-            loop=True
-        )
+        self.music = MusicManager()
+        self.current_music_player = self.music.play(self.overworld, volume=self.music_volume)
         
         # SFX
         self.current_sfx = None
         self.sfx_speed = 1
-        self.footsteps_sfx = arcade.load_sound("Simple_RPG/SFX/Footsteps.wav")
-        self.loot_sfx = arcade.load_sound("Simple_RPG/SFX/Loot.wav")
-        self.button_sfx = arcade.load_sound("Simple_RPG/SFX/Button.wav")
-        self.hit_sfx = arcade.load_sound("Simple_RPG/SFX/Hit.wav")
-        self.necromancer_attack_sfx = arcade.load_sound("Simple_RPG/SFX/necromancer_attack.wav")
+        self.footsteps_sfx = self.assets.sound("Simple_RPG/SFX/Footsteps.wav")
+        self.loot_sfx = self.assets.sound("Simple_RPG/SFX/Loot.wav")
+        self.button_sfx = self.assets.sound("Simple_RPG/SFX/Button.wav")
+        self.hit_sfx = self.assets.sound("Simple_RPG/SFX/Hit.wav")
+        self.necromancer_attack_sfx = self.assets.sound("Simple_RPG/SFX/necromancer_attack.wav")
         
         # MISC STATE
         self.post_fight_cooldown = 1
@@ -281,8 +600,7 @@ class MainScreen(arcade.View):
         after the old one finishes fading out
         """
         
-        new_sound = arcade.load_sound(self.target_music_path)
-        self.new_music_player = arcade.play_sound(new_sound, volume=0, loop=True)
+        self.new_music_player = self.music.play(self.target_music_path, volume=0)
         self.fade_direction = "in"
             
     
@@ -302,7 +620,7 @@ class MainScreen(arcade.View):
                 self.current_music_player.volume = new_volume
 
                 if new_volume <= 0:
-                    self.current_music_player.pause()
+                    self.music.stop(self.current_music_player)
                     self.current_music_player = None
                     self.start_new_music()
             else:
@@ -329,18 +647,11 @@ class MainScreen(arcade.View):
         # Reset character stats
         self.character.reset()
 
-        # Reset maze visitation
-        for room, (neighbors, _, looted) in self.maze.items():
-            visited = (room == "Start")
-            self.maze[room] = (neighbors, visited, False)
-
-        # Reset connections
-        for conn_label in self.connections:
-            _, data = self.connections[conn_label]
-            self.connections[conn_label] = (False, data)
+        # Reset maze visitation and connections
+        self.world.reset()
 
         # Reset minimap
-        self.minimap = MiniMap(self.character, self.maze, self.connections)
+        self.minimap = MiniMap(self.character, self.maze, self.connections, self.positions)
 
         # Overworld fields
         self.in_fight = False
@@ -407,9 +718,7 @@ class MainScreen(arcade.View):
         self.battle.boss_attack_animation_played = False
 
         # Reset buffs
-        self.battle.overclock = 0
-        self.battle.guard = 0
-        self.battle.repair = 0
+        self.battle.engine.end()
         self.battle.repair_pending = False
         self.battle.repair_timer = 0
 
@@ -423,45 +732,69 @@ class MainScreen(arcade.View):
         self.target_music_path = None
         self.new_music_player = None
         self.transition_music(self.overworld)
+        
+        # Start loading the start room's neighbors again
+        self.prefetch_rooms()
     
     
-    def on_draw(self):
+    def room_art_title(self, room):
         """
-        This method keeps track of what's supposed to be on screen every
-        frame and interatcs with the BattleScreen and ScreenChanger classes
+        Returns the name of a room's background art, which is made
+        from the directions you can leave the room in
+        
+        Args:
+            room: The name of the room
         """
         
-        self.clear()
-        screen_width, screen_height = self.window.get_size()
+        return self.graph.background(room)
+    
+    
+    def room_background_path(self, art_title):
+        """
+        Returns where a room background is stored
         
-        # Draw game over screen
-        if self.game_over:
-            self.screen_changer.draw_game_over(
-                self.window,
-                self.game_over_options,
-                self.game_over_menu_index
-                )
-            return
+        Args:
+            art_title: The name of the background art
+        """
         
-        # Draw win screen
-        if self.win:
-            self.screen_changer.draw_win_screen(self.window, self.popup_options, self.menu_index)
-            return
+        return f"Simple_RPG/Art/Room_Backgrounds/{art_title}.png"
+    
+    
+    def prefetch_rooms(self):
+        """
+        Starts loading the backgrounds for the current room and every
+        room next to it in the background, so whichever way the player
+        goes next the texture is already there
+        """
+        
+        current = self.character.currentPosition
+        rooms = [current] + self.graph.next_to(current)
+        
+        for room in rooms:
+            art_title = self.room_art_title(room)
+            self.assets.prefetch_texture(self.room_background_path(art_title))
+    
+    
+    def draw_room(self):
+        """
+        This method draws the room background, the minimap and the
+        movement options, the room layer calls it when the room changes
+        """
+        
+        screen_width, screen_height = self.window.get_size()
         
         # Draw room background
-        if self.character.currentPosition == "Shop":
-            art_title = "Shop"
-        else:
-            art_title = "_".join(option for _, option, _ in self.maze[self.character.currentPosition][0] if option != "Backward")
-        if art_title == "":
-            art_title = "Backward"
-        
-        # Load room texture if it's not cached
-        if art_title not in self.room_textures:
-            self.room_textures[art_title] = arcade.load_texture(
-                f"Simple_RPG/Art/Room_Backgrounds/{art_title}.png"
-            )
-        self.room_texture = self.room_textures[art_title]
+        art_title = self.room_art_title(self.character.currentPosition)
+        
+        # The texture was prefetched when the player walked next to
+        # this room, so this only picks up the finished load
+        if art_title != self.room_art:
+            path = self.room_background_path(art_title)
+            self.room_texture = self.assets.texture(path)
+            self.room_art = art_title
+            
+            # The background on screen is never dropped from the cache
+            self.assets.textures.pin("room", [path])
         
         # Create a rectangle covering the whole screen
         rect = Rect(
@@ -475,34 +808,64 @@ class MainScreen(arcade.View):
             y=screen_height / 2
             )
         
-        # Draw texture with alpha
-        arcade.draw_texture_rect(
-            self.room_texture,
-            rect,
-            alpha=int(self.bg_alpha)
-            )
+        arcade.draw_texture_rect(self.room_texture, rect)
 
 
         # Draw minimap
-        self.minimap.draw(screen_width, screen_height, alpha=int(self.bg_alpha))
+        self.minimap.draw(screen_width, screen_height)
 
         # Draw bottom-centered movement options
         current = self.character.currentPosition
-        neighbors, _, looted = self.maze[current]
-
-        directions = [dir_name.upper() for _, dir_name, _ in neighbors]
         
         # Add Z and X options
         if current == "Shop":
-            directions += ["Z - Use Shop", "X - Check Stats"]
+            options = ["Z - Use Shop", "X - Check Stats"]
         else:
-            directions += ["Z - Investigate", "X - Check Stats"]
-        movement_line = " | ".join(directions)
+            options = ["Z - Investigate", "X - Check Stats"]
+        movement_line = " | ".join(self.graph.directions(current) + options)
         
         font_size = 16
-        text = arcade.Text(movement_line, 0, 0, arcade.color.WHITE, font_size)
-        text.x = (screen_width - text.content_width) / 2
-        text.draw()
+        TEXT_CACHE.draw(movement_line, screen_width / 2, 0, arcade.color.WHITE, font_size, anchor_x="center")
+    
+    
+    def on_draw(self):
+        """
+        This method keeps track of what's supposed to be on screen every
+        frame and interatcs with the BattleScreen and ScreenChanger classes
+        """
+        
+        self.clear()
+        screen_width, screen_height = self.window.get_size()
+        
+        # Draw game over screen
+        if self.game_over:
+            self.screen_changer.draw_game_over(
+                self.window,
+                self.game_over_options,
+                self.game_over_menu_index
+                )
+            return
+        
+        # Draw win screen
+        if self.win:
+            self.screen_changer.draw_win_screen(self.window, self.popup_options, self.menu_index)
+            return
+        
+        # Draw the room, the minimap is drawn into its own texture
+        # so it has to be brought up to date before the room layer
+        if self.minimap.dirty:
+            self.minimap.update()
+            self.room_layer.invalidate()
+        
+        # The room layer only draws the room again after a move,
+        # fading in just changes how strongly it's copied
+        self.room_layer.draw(
+            self.character.currentPosition,
+            screen_width,
+            screen_height,
+            self.draw_room,
+            alpha=int(self.bg_alpha)
+            )
         
         
         # Draw popup if one is open
@@ -553,6 +916,9 @@ class MainScreen(arcade.View):
                 
             elif self.popup_state == "boss_battle_tutorial":
                 self.screen_changer.draw_boss_battle_tutorial_popup(self.window)
+            
+            elif self.popup_state == "travel":
+                self.screen_changer.draw_travel_popup(self.window, self.popup_options, self.menu_index)
                         
         # This loot popup serves as a miscelannous tool
         # that we use for many purposes throughout the game
@@ -661,13 +1027,13 @@ class MainScreen(arcade.View):
 
                 # Draw active Buffs
                 if self.battle.overclock > 0:
-                    arcade.draw_text(f"Overclock: {self.battle.overclock}", screen_width/2 - 150, 100, arcade.color.WHITE, 14, bold=True)
+                    TEXT_CACHE.draw(f"Overclock: {self.battle.overclock}", screen_width/2 - 150, 100, arcade.color.WHITE, 14, bold=True)
 
                 if self.battle.guard > 0:
-                    arcade.draw_text(f"Guard: {self.battle.guard}", screen_width/2 - 30, 100, arcade.color.WHITE, 14, bold=True)
+                    TEXT_CACHE.draw(f"Guard: {self.battle.guard}", screen_width/2 - 30, 100, arcade.color.WHITE, 14, bold=True)
 
                 if self.battle.repair > 0:
-                    arcade.draw_text(f"Repairs: {self.battle.repair}", screen_width/2 + 90, 100, arcade.color.WHITE, 14, bold=True)
+                    TEXT_CACHE.draw(f"Repairs: {self.battle.repair}", screen_width/2 + 90, 100, arcade.color.WHITE, 14, bold=True)
 
                 # Item popup takes priority
                 if self.popup_state == "Item":
@@ -711,10 +1077,10 @@ class MainScreen(arcade.View):
         """This method handle room searching for items"""
         
         items = []
-        num = random.randint(1,10)
+        num = RNG.loot.randint(1,10)
         if num == 1 or num == 2:
             items.append("HP Potion")
-        num = random.randint(1,10)
+        num = RNG.loot.randint(1,10)
         if num == 1 or num == 2:
             items.append("MP Potion")
         return items
@@ -775,6 +1141,9 @@ class MainScreen(arcade.View):
             such as SHIFT, CTRL, or ALT
         """
         
+        # Any key brings the frames back up to speed
+        self.throttle.wake()
+        
         # Only allow input if fade-in is complete
         if not self.fade_in_complete:
             return
@@ -828,12 +1197,12 @@ class MainScreen(arcade.View):
         # Game Over menu navigation
         if self.game_over:
             if key == arcade.key.RIGHT:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.game_over_menu_index = (self.game_over_menu_index + 1) % len(self.game_over_options)
             
             elif key == arcade.key.LEFT:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.game_over_menu_index = (self.game_over_menu_index - 1) % len(self.game_over_options)
             
@@ -858,12 +1227,12 @@ class MainScreen(arcade.View):
         if self.popup_state == "shop":
             
             if key == arcade.key.UP:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.shop_menu_index = (self.shop_menu_index - 1) % len(self.Shop_items)
             
             elif key == arcade.key.DOWN:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.shop_menu_index = (self.shop_menu_index + 1) % len(self.Shop_items)
             
@@ -935,12 +1304,12 @@ class MainScreen(arcade.View):
         if self.popup_state == "special":
             if key == arcade.key.UP:
                 
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.battle.special_menu_index = (self.battle.special_menu_index - 1) % len(self.battle.special_menu_options)
             
             elif key == arcade.key.DOWN:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.battle.special_menu_index = (self.battle.special_menu_index + 1) % len(self.battle.special_menu_options)
             
@@ -957,20 +1326,16 @@ class MainScreen(arcade.View):
 
                 name, desc, mp_cost = val
 
-                if self.character.mp >= mp_cost:
-                    # Deduct MP and trigger animation
-                    self.character.mp -= mp_cost
+                # The engine deducts the MP and sets the buff if there's enough
+                if self.battle.engine.use_special(selected_option, mp_cost):
+                    # Trigger MP animation
                     self.battle.start_mp_animation = True
 
-                    # Trigger specific special
                     if selected_option == "Overclock":
-                        self.battle.overclock = 2
                         self.loot_popup_text = "You used Overclock!"
                     elif selected_option == "Tight Guard":
-                        self.battle.guard = 2
                         self.loot_popup_text = "You used Tight Guard!"
                     elif selected_option == "Auto-Repairs":
-                        self.battle.repair = 3
                         self.battle.repair_delay = 1.5
                         self.battle.repair_timer = 0
                         self.loot_popup_text = "You used Auto Repairs!"
@@ -991,15 +1356,19 @@ class MainScreen(arcade.View):
         
         # Navigation in popups
         if self.popup_state is not None:
+            # The travel list goes up and down as well
+            if self.popup_state == "travel" and key in (arcade.key.UP, arcade.key.DOWN):
+                key = arcade.key.RIGHT if key == arcade.key.DOWN else arcade.key.LEFT
+            
             if key == arcade.key.RIGHT:
                 if self.popup_state != "equip" and self.popup_state != "shop_tutorial" and self.popup_state != "battle_tutorial":
-                    self.sfx_speed = random.uniform(1.1, 1.15)
+                    self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                     self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.menu_index = (self.menu_index + 1) % len(self.popup_options)
             
             elif key == arcade.key.LEFT:
                 if self.popup_state != "equip" and self.popup_state != "shop_tutorial" and self.popup_state != "battle_tutorial":
-                    self.sfx_speed = random.uniform(1.1, 1.15)
+                    self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                     self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.menu_index = (self.menu_index - 1) % len(self.popup_options)
             
@@ -1059,6 +1428,12 @@ class MainScreen(arcade.View):
                         # ensures it only shows once
                         self.boss_battle_tutorial_seen = True
                         self.battle.start_fight(boss_fight=True)
+                
+                # Travel popup
+                elif self.popup_state == "travel":
+                    self.popup_state = None
+                    if selected != "Exit":
+                        self.travel_to(self.travel_targets[selected])
             
             # Skip other inputs while popup is open
             return
@@ -1075,12 +1450,12 @@ class MainScreen(arcade.View):
                 return
     
             if key == arcade.key.RIGHT:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.fight_menu_index = (self.fight_menu_index + 1) % len(self.fight_buttons)
             
             elif key == arcade.key.LEFT:
-                self.sfx_speed = random.uniform(1.1, 1.15)
+                self.sfx_speed = RNG.audio.uniform(1.1, 1.15)
                 self.current_sfx = arcade.play_sound(self.button_sfx, .6, 0, False, self.sfx_speed)
                 self.fight_menu_index = (self.fight_menu_index - 1) % len(self.fight_buttons)
             
@@ -1108,10 +1483,23 @@ class MainScreen(arcade.View):
                 self.popup_options = self.menu_options.copy()
             return
         
+        # Overworld T key opens auto-travel, never mid fight
+        if key == arcade.key.T and not self.in_fight and not self.game_over and not self.win:
+            self.open_travel_menu()
+            return
+        
+        # Overworld - and = keys zoom the minimap out and in
+        if key == arcade.key.MINUS:
+            self.minimap.set_zoom(self.minimap.zoom + 1)
+            return
+        if key == arcade.key.EQUAL:
+            self.minimap.set_zoom(self.minimap.zoom - 1)
+            return
+        
         # Overworld Z key investigates rooms
         if key == arcade.key.Z:
             current = self.character.currentPosition
-            neighbors, visited, looted = self.maze[current]
+            looted = self.world.is_looted(current)
             
             if current == "Shop":
                 # Open shop popup
@@ -1121,7 +1509,7 @@ class MainScreen(arcade.View):
             else:
                 if not looted:
                     # Play Loot SFX
-                    self.sfx_speed = random.uniform(1, 1.1)
+                    self.sfx_speed = RNG.audio.uniform(1, 1.1)
                     self.current_sfx = arcade.play_sound(self.loot_sfx, 1.1, 0, False, self.sfx_speed)
                     
                     
@@ -1129,10 +1517,11 @@ class MainScreen(arcade.View):
                     loot = self.generate_Item()
                     for item in loot:
                         self.character.pickup(item)
-                    self.maze[current] = (neighbors, visited, True)
+                    self.world.loot(current)
+                    self.minimap.invalidate()
                     
                     # Gold drop
-                    gold_amount = random.randint(0, 4)  
+                    gold_amount = RNG.loot.randint(0, 4)  
                     if gold_amount > 0:
                         # Add gold directly to character
                         item_name, amount = self.character.items["Gold"]
@@ -1168,80 +1557,166 @@ class MainScreen(arcade.View):
             return
 
         current = self.character.currentPosition
-        neighbors, visited, looted = self.maze[current]
-        moved = False
-
-        for target, dir_name, conn_label in neighbors:
-            if dir_name == direction:
-                curr_neighbors, curr_visited, curr_looted = self.maze[current]
-                self.maze[current] = (curr_neighbors, True, curr_looted)
-
-                self.character.currentPosition = target
-                n, visited, looted = self.maze[target]
-                self.maze[target] = (n, True, looted)
-
-                if conn_label in self.connections:
-                    visited, data = self.connections[conn_label]
-                    if not visited:
-                        self.connections[conn_label] = (True, data)
-                moved = True
-
-                # Check for fight if we're not moving into the Shop
-                if self.character.currentPosition != "Shop" and self.character.currentPosition != "End":
-                    self.battle.try_fight()
-                    break
-
-        if moved:
-            
-            # Play footsetp SFX
-            self.sfx_speed = random.uniform(1.15, 1.25)
-            self.current_sfx = arcade.play_sound(self.footsteps_sfx, 0.7, 0, False, self.sfx_speed)
-            
-            # Setup room fade
-            self.bg_alpha = 0
-            self.text_alpha = 0
-            self.text_timer = 0
-            self.fade_in_complete = False
-            
-            # Leaving shop return to overworld music
-            if self.left_shop and self.character.currentPosition != "Shop" and self.shop_transition_cooldown <= 0:
-                self.music_volume = .5
-                self.transition_music(self.overworld)
-                self.left_shop = False
-                # prevents instant retrigger
-                self.shop_transition_cooldown = 2.0
-
-            # Entering shop
-            if self.character.currentPosition == "Shop" and self.shop_transition_cooldown <= 0:
-                self.music_volume = .25
-                self.transition_music(self.shop)
-                self.left_shop = True
-                # prevents overlap
-                self.shop_transition_cooldown = 2.0
+        move = self.graph.move(current, direction)
+
+        if move is not None:
+            target, conn_label = move
+            self.world.visit(current)
 
+            self.character.currentPosition = target
+            self.world.visit(target)
+            self.world.reveal(conn_label)
+
+            # Check for fight if we're not moving into the Shop
+            if self.character.currentPosition != "Shop" and self.character.currentPosition != "End":
+                self.battle.try_fight()
             
-            # Check if this is the final room
-            if self.character.currentPosition == "End":
-                # trigger final boss popup
-                self.popup_state = "End"
-                self.menu_index = 0
-                self.popup_options = ["Yes", "No"]
-                
-            # Check for Shop tutorial
-            if self.character.currentPosition == "Shop" and not getattr(self, "shop_tutorial_seen", False):
-                self.popup_state = "shop_tutorial"
-                self.menu_index = 0
-                # Only one option to dismiss
-                self.popup_options = ["OK"]
-                # ensures it only shows once
-                self.shop_tutorial_seen = True
+            self.entered_room()
+    
+    
+    def entered_room(self):
+        """
+        This method sets up the sound, fade, music and popups
+        for the room the player just walked into
+        """
+        
+        # The minimap shows the new room and path
+        self.minimap.invalidate()
+        
+        # Get the next set of neighboring rooms loading
+        self.prefetch_rooms()
+        
+        # Play footsetp SFX
+        self.sfx_speed = RNG.audio.uniform(1.15, 1.25)
+        self.current_sfx = arcade.play_sound(self.footsteps_sfx, 0.7, 0, False, self.sfx_speed)
+        
+        # Setup room fade
+        self.bg_alpha = 0
+        self.text_alpha = 0
+        self.text_timer = 0
+        self.fade_in_complete = False
+        
+        # Leaving shop return to overworld music
+        if self.left_shop and self.character.currentPosition != "Shop" and self.shop_transition_cooldown <= 0:
+            self.music_volume = .5
+            self.transition_music(self.overworld)
+            self.left_shop = False
+            # prevents instant retrigger
+            self.shop_transition_cooldown = 2.0
+
+        # Entering shop
+        if self.character.currentPosition == "Shop" and self.shop_transition_cooldown <= 0:
+            self.music_volume = .25
+            self.transition_music(self.shop)
+            self.left_shop = True
+            # prevents overlap
+            self.shop_transition_cooldown = 2.0
+
+        
+        # Check if this is the final room
+        if self.character.currentPosition == "End":
+            # trigger final boss popup
+            self.popup_state = "End"
+            self.menu_index = 0
+            self.popup_options = ["Yes", "No"]
+            
+        # Check for Shop tutorial
+        if self.character.currentPosition == "Shop" and not getattr(self, "shop_tutorial_seen", False):
+            self.popup_state = "shop_tutorial"
+            self.menu_index = 0
+            # Only one option to dismiss
+            self.popup_options = ["OK"]
+            # ensures it only shows once
+            self.shop_tutorial_seen = True
+    
+    
+    def open_travel_menu(self):
+        """
+        This method opens the auto-travel popup with every room the
+        player has already been to, closest first, after a shortcut
+        to the closest room that hasn't been searched yet
+        """
+        
+        current = self.character.currentPosition
+        self.travel_targets = {}
+        
+        # The closest room that hasn't been searched yet
+        unsearched = self.routes.nearest(
+            current,
+            lambda room: room not in ("Shop", "End") and not self.world.is_looted(room)
+        )
+        if unsearched is not None and self.world.is_visited(unsearched):
+            self.travel_targets["Unsearched"] = unsearched
+        
+        # Every visited room with a revealed way back, by how many rooms away
+        # The tree is kept, so picking one reads the route straight off it
+        distance, _ = self.routes.tree(self.graph.ids[current])
+        rooms = [
+            room for room in self.world.visited_rooms()
+            if room != current and distance[self.graph.ids[room]] != UNREACHED
+        ]
+        rooms.sort(key=lambda room: distance[self.graph.ids[room]])
+        for room in rooms:
+            self.travel_targets[room] = room
+        
+        self.popup_state = "travel"
+        self.menu_index = 0
+        self.popup_options = list(self.travel_targets) + ["Exit"]
+    
+    
+    def travel_to(self, room):
+        """
+        This method walks the player to a visited room along the shortest
+        revealed route in one go, with one footstep, one fade and
+        one chance of a fight when they get there
+        
+        Args:
+            room: The name of the room to go to
+        """
+        
+        route = self.routes.route(self.character.currentPosition, room)
+        if not route:
+            return False
+        
+        self.character.currentPosition = route[-1]
+        
+        # Check for fight if we're not moving into the Shop
+        if self.character.currentPosition != "Shop" and self.character.currentPosition != "End":
+            self.battle.try_fight()
+        
+        self.entered_room()
+        return True
+    
+    
+    def is_idle(self):
+        """
+        This method returns whether nothing on screen is changing, no fades,
+        fights, music changes, popups on a timer or cooldowns, so the
+        frames can slow down
+        """
+        
+        return (
+            not self.in_fight
+            and not self.battle.enemy_death_animation_active
+            and not self.transition_active
+            and self.fade_in_complete
+            and self.loot_popup_state is None
+            and self.post_fight_cooldown <= 0
+            and self.shop_transition_cooldown <= 0
+            and not self.assets.busy
+            )
     
     
     def on_update(self, delta_time: float):
         """This method keeps track of what's supposed to be on screen every frame"""
         
+        self.throttle.update(not self.is_idle(), delta_time)
+        
         self.update_music_fade(delta_time)
         
+        # Pick up any rooms that finished loading in the background
+        self.assets.update()
+        
         if self.shop_transition_cooldown > 0:
             self.shop_transition_cooldown -= delta_time
         
@@ -1316,20 +1791,11 @@ class MainScreen(arcade.View):
         # Smooth HP bar animation for enemy
         self.battle.update_enemy_hp_animation(delta_time)
         
-        # Enemy hurt animation
-        self.battle.update_enemy_hurt_animation(delta_time)
-        
-        # Enemy Attack Animation
-        self.battle.update_enemy_attack_animation(delta_time)
+        # Enemy hurt, attack, death and special animations
+        self.battle.animator.update(delta_time)
         
         # Apply enemy damage after animation finishes
         self.battle.apply_pending_enemy_damage()
-                
-        # Enemy death animation
-        self.battle.update_enemy_death_animation(delta_time)
-        
-        # Enemy special animation
-        self.battle.update_special_animation(delta_time)
 
         # Auto-Repairs after enemy attack
         if self.battle.repair_pending and self.battle.repair > 0:
@@ -1337,17 +1803,16 @@ class MainScreen(arcade.View):
             if not self.battle.start_hp_animation and self.battle.turn == "player":
                 self.battle.repair_timer += delta_time
                 if self.battle.repair_timer >= self.battle.repair_delay:
-                    # Heal 10 HP
-                    self.character.hp = min(self.character.max_hp, self.character.hp + 10)
+                    # Heal 10 HP and use up a turn of repairs
+                    self.battle.engine.repair_tick()
                     # Triggers smooth HP bar update
                     self.battle.start_hp_animation = True
                     self.loot_popup_text = "Repaired 10 HP!"
                     self.loot_popup_state = "loot"
                     self.loot_popup_timer = 0.0
 
-                    # Reset timer and decrease remaining turns
+                    # Reset timer
                     self.battle.repair_timer = 0.0
-                    self.battle.repair -= 1
                     
                     # If no repairs left, disable pending flag
                     self.battle.repair_pending = False
@@ -0,0 +1,206 @@
+import random
+from collections import deque
+
+# Where a step in each direction moves on the room grid
+STEPS = {
+    "Left": (-1, 0),
+    "Forward": (0, 1),
+    "Right": (1, 0),
+    "Backward": (0, -1),
+}
+
+# The direction that leads back the way you came
+OPPOSITE = {
+    "Left": "Right",
+    "Right": "Left",
+    "Forward": "Backward",
+    "Backward": "Forward",
+}
+
+# The order a room lists its paths in, which the background art names follow
+ORDER = {"Left": 0, "Forward": 1, "Right": 2, "Backward": 3}
+
+# Map units between neighboring rooms on the minimap, rooms
+# are 20 by 10 units so this leaves a gap for the paths
+X_STEP = 30
+Y_STEP = 20
+
+class MazeGenerator:
+    """
+    This class makes random mazes in the same shape create_maze_data
+    returns, along with where each room goes on the minimap
+
+    Rooms sit on a grid and grow out from the start room as a tree,
+    so every room, the Shop and the End can always be reached, then
+    a few extra paths are added between rooms that are next to each other
+    The same seed always makes the same maze
+    """
+
+    def __init__(self, seed=None, loops=0.1):
+        """
+        This is the class setup
+
+        Args:
+            seed: Makes the maze repeatable, if None it's random every time
+
+            loops: The chance that two rooms next to each other without
+                   a path between them get one anyway
+        """
+
+        self.random = random.Random(seed)
+        self.loops = loops
+
+    @staticmethod
+    def label(number):
+        """
+        Returns the connection label for a number, going A to Z then AA, AB...
+
+        Args:
+            number: Which connection this is, starting at 0
+        """
+
+        label = ""
+        number += 1
+        while number > 0:
+            number, letter = divmod(number - 1, 26)
+            label = chr(ord("A") + letter) + label
+        return label
+
+    @staticmethod
+    def allowed(exits, direction):
+        """
+        Returns whether a room can get a new path in a direction
+
+        There is no background for a room you can only leave to the
+        Left, so a Left path can't be the only way forward out of a room
+
+        Args:
+            exits: The directions the room already has paths in
+
+            direction: The direction of the new path
+        """
+
+        if direction != "Left":
+            return True
+        return any(exit != "Backward" for exit in exits)
+
+    def generate(self, rooms=18):
+        """
+        Returns a new maze, its connections and its minimap positions
+
+        Args:
+            rooms: How many rooms the maze has, at least 3 so there's
+                   room for the Start, the Shop and the End
+        """
+
+        if rooms < 3:
+            raise ValueError("A maze needs at least 3 rooms")
+
+        # Grid cells, each room's number is where it is in this list
+        cells = [(0, 0)]
+        taken = {(0, 0): 0}
+        # The directions each room has paths in, and the paths themselves
+        exits = [{}]
+        # Rooms that might still have somewhere to grow
+        growing = [0]
+
+        # Tree first, every new room hangs off one that's already there
+        # New rooms are never reached by going Right, that would leave
+        # them with only a Left path
+        while len(cells) < rooms:
+            index = self.random.randrange(len(growing))
+            room = growing[index]
+            x, y = cells[room]
+            options = [
+                direction for direction in ("Left", "Forward", "Backward")
+                if (x + STEPS[direction][0], y + STEPS[direction][1]) not in taken
+                and MazeGenerator.allowed(exits[room], direction)
+            ]
+            if not options:
+                growing[index] = growing[-1]
+                growing.pop()
+                continue
+
+            direction = self.random.choice(options)
+            cell = (x + STEPS[direction][0], y + STEPS[direction][1])
+            new_room = len(cells)
+            taken[cell] = new_room
+            cells.append(cell)
+            exits.append({OPPOSITE[direction]: room})
+            exits[room][direction] = new_room
+            growing.append(new_room)
+
+        # Then some loops between rooms that sit side by side
+        for room, (x, y) in enumerate(cells):
+            for direction in ("Forward", "Right"):
+                other = taken.get((x + STEPS[direction][0], y + STEPS[direction][1]))
+                if other is None or direction in exits[room]:
+                    continue
+                if not MazeGenerator.allowed(exits[other], OPPOSITE[direction]):
+                    continue
+                if self.random.random() < self.loops:
+                    exits[room][direction] = other
+                    exits[other][OPPOSITE[direction]] = room
+
+        names = self.name_rooms(exits)
+
+        # Paths in the order the background art expects
+        maze = {}
+        connections = {}
+        labels = {}
+        for room in range(len(cells)):
+            neighbors = []
+            for direction, other in sorted(exits[room].items(), key=lambda item: ORDER[item[0]]):
+                pair = (min(room, other), max(room, other))
+                if pair not in labels:
+                    labels[pair] = MazeGenerator.label(len(labels))
+                    connections[labels[pair]] = (False, (names[pair[0]], names[pair[1]]))
+                neighbors.append((names[other], direction, labels[pair]))
+            maze[names[room]] = (neighbors, False, False)
+
+        # Minimap positions, moved so the lowest room sits just above zero
+        low_x = min(x for x, _ in cells)
+        low_y = min(y for _, y in cells)
+        positions = {
+            names[room]: ((x - low_x) * X_STEP + 5, (y - low_y) * Y_STEP + 5)
+            for room, (x, y) in enumerate(cells)
+        }
+
+        return maze, connections, positions
+
+    def name_rooms(self, exits):
+        """
+        Returns a name for every room, the End is the room furthest
+        from the start and the Shop is a dead end about halfway there
+
+        Args:
+            exits: The directions each room has paths in, and where they go
+        """
+
+        # How many steps each room is from the start
+        distance = [None] * len(exits)
+        distance[0] = 0
+        queue = deque([0])
+        while queue:
+            room = queue.popleft()
+            for other in exits[room].values():
+                if distance[other] is None:
+                    distance[other] = distance[room] + 1
+                    queue.append(other)
+
+        end = max(range(len(exits)), key=lambda room: distance[room])
+        others = [room for room in range(1, len(exits)) if room != end]
+        dead_ends = [room for room in others if len(exits[room]) == 1] or others
+        shop = min(dead_ends, key=lambda room: abs(distance[room] - distance[end] / 2))
+
+        names = ["Start"]
+        number = 1
+        for room in range(1, len(exits)):
+            if room == end:
+                names.append("End")
+            elif room == shop:
+                names.append("Shop")
+            else:
+                names.append(f"Room {number}")
+                number += 1
+        return names
@@ -0,0 +1,159 @@
+class MazeGraph:
+    """
+    This class checks the maze from create_maze_data and turns it into
+    tables that can be looked up directly instead of searched
+
+    Every room gets a number, and moving, listing a room's exits and
+    finding its background are all worked out once when it's built
+    The maze dictionary still holds which rooms are visited and looted
+    """
+
+    # The directions a room can be left in, in the order they're shown
+    DIRECTIONS = ["Left", "Forward", "Right", "Backward"]
+
+    def __init__(self, maze, connections):
+        """
+        This is the class setup
+
+        Args:
+            maze: The rooms of the maze and how they link together
+
+            connections: The paths between rooms and whether
+                         they've been revealed
+        """
+
+        MazeGraph.validate(maze, connections)
+
+        # Room numbers, in the order the maze lists them
+        self.names = list(maze)
+        self.ids = {name: room_id for room_id, name in enumerate(self.names)}
+
+        # Connection numbers and the two rooms each one joins
+        self.labels = list(connections)
+        self.connection_ids = {label: conn_id for conn_id, label in enumerate(self.labels)}
+        self.joins = [connections[label][1] for label in self.labels]
+
+        # (room number, direction) -> (target room number, connection)
+        self.moves = {}
+        # Each room's (target, direction, connection) list
+        self.paths = []
+        # Room numbers next to each room
+        self.neighbors = []
+        # The directions out of each room, as shown on screen
+        self.exits = []
+        # The background art for each room
+        self.art = []
+
+        for name in self.names:
+            room_id = self.ids[name]
+            neighbors = maze[name][0]
+            for target, dir_name, conn_label in neighbors:
+                self.moves[(room_id, dir_name)] = (self.ids[target], conn_label)
+            self.paths.append(neighbors)
+            self.neighbors.append([self.ids[target] for target, _, _ in neighbors])
+            self.exits.append([dir_name.upper() for _, dir_name, _ in neighbors])
+            self.art.append(MazeGraph.art_title(name, neighbors))
+
+    @staticmethod
+    def art_title(name, neighbors):
+        """
+        Returns the name of a room's background art, which is made
+        from the directions you can leave the room in
+
+        Args:
+            name: The name of the room
+
+            neighbors: The room's (target, direction, connection) list
+        """
+
+        if name == "Shop":
+            return "Shop"
+        art_title = "_".join(option for _, option, _ in neighbors if option != "Backward")
+        if art_title == "":
+            art_title = "Backward"
+        return art_title
+
+    @staticmethod
+    def validate(maze, connections):
+        """
+        Checks that every path in the maze leads somewhere real and
+        matches its connection, raising a ValueError listing every problem
+
+        Args:
+            maze: The rooms of the maze and how they link together
+
+            connections: The paths between rooms and whether
+                         they've been revealed
+        """
+
+        problems = []
+
+        for label, (_, rooms) in connections.items():
+            for room in rooms:
+                if room not in maze:
+                    problems.append(f"connection {label} uses missing room {room}")
+
+        for name, (neighbors, _, _) in maze.items():
+            seen = set()
+            for target, dir_name, conn_label in neighbors:
+                if dir_name not in MazeGraph.DIRECTIONS:
+                    problems.append(f"{name} has unknown direction {dir_name}")
+                if dir_name in seen:
+                    problems.append(f"{name} has two paths going {dir_name}")
+                seen.add(dir_name)
+                if target not in maze:
+                    problems.append(f"{name} leads to missing room {target}")
+                if conn_label not in connections:
+                    problems.append(f"{name} uses missing connection {conn_label}")
+                elif set(connections[conn_label][1]) != {name, target}:
+                    problems.append(f"connection {conn_label} doesn't join {name} and {target}")
+
+        if problems:
+            raise ValueError("Invalid maze: " + ", ".join(problems))
+
+    def move(self, room, direction):
+        """
+        Returns the room and connection a move leads to,
+        or None if the room has no path that way
+
+        Args:
+            room: The name of the room being left
+
+            direction: "Left", "Forward", "Right" or "Backward"
+        """
+
+        found = self.moves.get((self.ids[room], direction))
+        if found is None:
+            return None
+        target, conn_label = found
+        return self.names[target], conn_label
+
+    def directions(self, room):
+        """
+        Returns the directions out of a room, as shown on screen
+
+        Args:
+            room: The name of the room
+        """
+
+        return self.exits[self.ids[room]]
+
+    def background(self, room):
+        """
+        Returns the name of a room's background art
+
+        Args:
+            room: The name of the room
+        """
+
+        return self.art[self.ids[room]]
+
+    def next_to(self, room):
+        """
+        Returns the names of the rooms next to a room
+
+        Args:
+            room: The name of the room
+        """
+
+        return [self.names[target] for target in self.neighbors[self.ids[room]]]
@@ -0,0 +1,108 @@
+import os
+from collections import OrderedDict
+import arcade
+
+class MusicManager:
+    """
+    This class plays the background music for MainScreen
+
+    Short tracks are decoded once and kept in a small cache so
+    switching back to them doesn't touch the disk, long tracks are
+    streamed from disk instead of being decoded into memory
+    """
+
+    def __init__(self, max_tracks=3, stream_size=2_000_000):
+        """
+        This is the class setup
+
+        Args:
+            max_tracks: How many tracks are kept ready at once before
+                        the least recently played one is dropped
+
+            stream_size: Files bigger than this many bytes are streamed
+        """
+
+        self.max_tracks = max_tracks
+        self.stream_size = stream_size
+
+        # Decoded tracks, the most recently played one is last
+        self.tracks = OrderedDict()
+        # Streamed tracks keep their player since a streaming
+        # source can only ever be queued on one player
+        self.stream_players = {}
+
+    def is_streamed(self, path):
+        """
+        Returns whether a track is long enough to be streamed
+
+        Args:
+            path: Where the music file is stored
+        """
+
+        return os.path.getsize(path) > self.stream_size
+
+    def play(self, path, volume=1.0, loop=True):
+        """
+        Starts a track from the beginning and returns its player
+
+        Args:
+            path: Where the music file is stored
+
+            volume: How loud the track starts out
+
+            loop: Whether the track repeats when it ends
+        """
+
+        # Streamed tracks rewind the player they already have
+        if path in self.stream_players:
+            self.tracks.move_to_end(path)
+            player = self.stream_players[path]
+            player.seek(0)
+            player.volume = volume
+            player.loop = loop
+            player.play()
+            return player
+
+        if path in self.tracks:
+            self.tracks.move_to_end(path)
+            sound = self.tracks[path]
+        else:
+            sound = arcade.load_sound(path, streaming=self.is_streamed(path))
+            self.tracks[path] = sound
+            self._trim(keep=path)
+
+        player = arcade.play_sound(sound, volume=volume, loop=loop)
+        if sound.source.is_player_source:
+            self.stream_players[path] = player
+        return player
+
+    def stop(self, player):
+        """
+        Pauses a player, streamed tracks keep theirs for next time
+
+        Args:
+            player: The player returned by play
+        """
+
+        if player is None:
+            return
+        player.pause()
+        if player not in self.stream_players.values():
+            player.delete()
+
+    def _trim(self, keep):
+        """
+        Drops the least recently played tracks until the cache fits
+
+        Args:
+            keep: The track that was just loaded, it's never dropped
+        """
+
+        while len(self.tracks) > self.max_tracks:
+            path = next(iter(self.tracks))
+            if path == keep:
+                break
+            del self.tracks[path]
+            player = self.stream_players.pop(path, None)
+            if player is not None:
+                player.delete()
@@ -1,8 +1,9 @@
 import arcade
-import random
-from PIL import Image
-from io import BytesIO
 import os
+from SpriteSheet import SpriteSheet
+from TextureCache import TEXTURE_CACHE
+from CombatEngine import ENEMIES, enemy_damage
+from RandomStreams import RNG
 
 class Necromancer:
     """
@@ -17,56 +18,74 @@ class Necromancer:
     COLUMNS = 17
     ROWS = 7
 
-    _cached_frames = None
+    # Frame ranges (start, end) in the sprite sheet for each animation
+    ANIMATIONS = {
+        "idle": (0, 1),
+        "hurt": (17, 21),
+        "attack": (68, 81),
+        "death": (0, 9),
+    }
+
+    # Shared by every Necromancer, loaded on first use
+    _sheet = None
 
     def __init__(self):
         """This is the class setrup"""
         
         self.name = "Necromancer"
-        self.hp = 30
-        self.max_hp = 30
-        self.atk = 10
-        self.defense = 5
-        self.spd = 11
-
-        # Load frames once for all Necromancers
-        if Necromancer._cached_frames is None:
-            Necromancer._cached_frames = Necromancer._load_frames()
+        stats = ENEMIES[self.name]
+        self.hp = stats["hp"]
+        self.max_hp = stats["hp"]
+        self.atk = stats["atk"]
+        self.defense = stats["defense"]
+        self.spd = stats["spd"]
 
-        self.frames = Necromancer._cached_frames
-        
         self.sprite = arcade.Sprite(scale=self.SPRITE_SCALE)
-        self.sprite.texture = self.frames[0]
+        self.sprite.texture = self.animation("idle")[0]
         self.sprite.visible = False
 
     @staticmethod
-    def _load_frames():
-        """
-        Loads and returns the sprite sheet for this enemy
-        sliced into frames in a list
-        """
+    def _load_sheet():
+        """Loads and returns the sprite sheet for this enemy"""
         
         sheet_path = os.path.join("Simple_RPG", "Art", "Enemies", "Necromancer.png")
-        sheet = Image.open(sheet_path).convert("RGBA")
-        sheet_width, sheet_height = sheet.size
-
-        # Stores the sliced sprites/frames
-        frames = []
-        for row in range(Necromancer.ROWS):
-            for col in range(Necromancer.COLUMNS):
-                left = col * Necromancer.FRAME_WIDTH
-                top = sheet_height - (row + 1) * Necromancer.FRAME_HEIGHT
-                right = left + Necromancer.FRAME_WIDTH
-                bottom = top + Necromancer.FRAME_HEIGHT
+        sheet = SpriteSheet(
+            sheet_path,
+            Necromancer.COLUMNS,
+            Necromancer.ROWS,
+            Necromancer.FRAME_WIDTH,
+            Necromancer.FRAME_HEIGHT
+        )
+        return sheet
 
-                frame_img = sheet.crop((left, top, right, bottom))
+    @staticmethod
+    def animation(name):
+        """
+        Returns the frames for one of the animations in ANIMATIONS
+        The frames are kept in the texture cache until it needs the room
+        
+        Args:
+            name: The animation's name, like "hurt" or "attack"
+        """
+        
+        # Load the sheet once for all Necromancers
+        if Necromancer._sheet is None:
+            Necromancer._sheet = Necromancer._load_sheet()
+        start, end = Necromancer.ANIMATIONS[name]
+        return TEXTURE_CACHE.get(
+            f"Necromancer/{name}",
+            lambda: Necromancer._sheet.textures(start, end)
+        )
 
-                temp = BytesIO()
-                frame_img.save(temp, format="PNG")
-                temp.seek(0)
-                frames.append(arcade.load_texture(temp))
+    @staticmethod
+    def animation_keys():
+        """Returns the names this enemy's animations are cached under"""
+        return [f"Necromancer/{name}" for name in Necromancer.ANIMATIONS]
 
-        return frames
+    @staticmethod
+    def load_animations():
+        """Makes and returns the textures for every animation ahead of time"""
+        return [frame for name in Necromancer.ANIMATIONS for frame in Necromancer.animation(name)]
 
     def idle_sprite(self):
         """Returns the enemys idle sprite"""
@@ -74,15 +93,15 @@ class Necromancer:
     
     def hurt_animation(self):
         """Returns the enemys hurt frames"""
-        return self.frames[17:21]
+        return self.animation("hurt")
     
     def attack_animation(self):
         """Returns the enemys attack frames"""
-        return self.frames[68:81]
+        return self.animation("attack")
     
     def death_animation(self):
         """Returns the enemys death frames"""
-        return self.frames[0:9]
+        return self.animation("death")
     
     def calc_damage(self, guard, character):
         """
@@ -94,11 +113,7 @@ class Necromancer:
             character: The instance of character the game is using
         """
         
-        damage = max(0, self.atk - character.defense)
-        if guard > 0:
-            damage = round(damage/2)
-            guard -= 1
-        return damage, guard
+        return enemy_damage(self.atk, character.defense, guard)
 
     def drop_loot(self, character):
         """
@@ -109,7 +124,7 @@ class Necromancer:
         """
         
         loot = None
-        num = random.randint(1,10)
+        num = RNG.loot.randint(1,10)
         if num == 1:
             loot = "HP Potion"
             character.pickup("HP Potion")
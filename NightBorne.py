@@ -1,8 +1,9 @@
 import arcade
 import os
-import random
-from PIL import Image
-from io import BytesIO
+from SpriteSheet import SpriteSheet
+from TextureCache import TEXTURE_CACHE
+from CombatEngine import ENEMIES, BOSS_HEAL, HEAL, DEBUFF, boss_action, enemy_damage
+from RandomStreams import RNG
 
 class NightBorne:
     """
@@ -17,59 +18,77 @@ class NightBorne:
     FRAME_WIDTH  = 80
     FRAME_HEIGHT = 80
 
-    _cached_frames = None  # only load once
+    # Frame ranges (start, end) in the sprite sheet for each animation
+    ANIMATIONS = {
+        "idle": (0, 1),
+        "attack": (46, 58),
+        "hurt": (23, 28),
+        "death": (0, 23),
+        "special": (92, 101),
+    }
+
+    # Shared by every NightBorne, loaded on first use
+    _sheet = None
 
     def __init__(self):
         """This is the class setrup"""
         
         self.name = "NightBorne"
-        self.hp = 100
-        self.max_hp = 100
-        self.atk = 16
-        self.defense = 9
-        self.spd = 14
-
-        # Load frames
-        if NightBorne._cached_frames is None:
-            NightBorne._cached_frames = NightBorne._load_frames()
-
-        self.frames = NightBorne._cached_frames
+        stats = ENEMIES[self.name]
+        self.hp = stats["hp"]
+        self.max_hp = stats["hp"]
+        self.atk = stats["atk"]
+        self.defense = stats["defense"]
+        self.spd = stats["spd"]
 
         self.sprite = arcade.Sprite(scale=self.SPRITE_SCALE)
-        self.sprite.texture = self.frames[0]
+        self.sprite.texture = self.animation("idle")[0]
         self.sprite.visible = False
 
 
     @staticmethod
-    def _load_frames():
+    def _load_sheet():
+        """Loads and returns the sprite sheet for this boss"""
+        
+        path = os.path.join("Simple_RPG", "Art", "Enemies", "NightBorne.png")
+        sheet = SpriteSheet(path, NightBorne.COLUMNS, NightBorne.ROWS)
+
+        NightBorne.FRAME_WIDTH  = sheet.frame_width
+        NightBorne.FRAME_HEIGHT = sheet.frame_height
+
+        return sheet
+
+
+    @staticmethod
+    def animation(name):
         """
-        Loads and returns the sprite sheet for this boss
-        sliced into frames in a list
+        Returns the frames for one of the animations in ANIMATIONS
+        The frames are kept in the texture cache until it needs the room
+        
+        Args:
+            name: The animation's name, like "hurt" or "special"
         """
         
-        path = os.path.join("Simple_RPG", "Art", "Enemies", "NightBorne.png")
-        sheet = Image.open(path).convert("RGBA")
-        sheet_width, sheet_height = sheet.size
+        # Load the sheet only once
+        if NightBorne._sheet is None:
+            NightBorne._sheet = NightBorne._load_sheet()
+        start, end = NightBorne.ANIMATIONS[name]
+        return TEXTURE_CACHE.get(
+            f"NightBorne/{name}",
+            lambda: NightBorne._sheet.textures(start, end)
+        )
 
-        NightBorne.FRAME_WIDTH  = sheet_width  // NightBorne.COLUMNS
-        NightBorne.FRAME_HEIGHT = sheet_height // NightBorne.ROWS
 
-        # Stores the sliced sprites/frames
-        frames = []
-        for row in range(NightBorne.ROWS):
-            for col in range(NightBorne.COLUMNS):
-                left   = col * NightBorne.FRAME_WIDTH
-                top    = sheet_height - (row+1) * NightBorne.FRAME_HEIGHT
-                right  = left + NightBorne.FRAME_WIDTH
-                bottom = top  + NightBorne.FRAME_HEIGHT
+    @staticmethod
+    def animation_keys():
+        """Returns the names this boss's animations are cached under"""
+        return [f"NightBorne/{name}" for name in NightBorne.ANIMATIONS]
 
-                frame = sheet.crop((left, top, right, bottom))
-                temp = BytesIO()
-                frame.save(temp, format="PNG")
-                temp.seek(0)
-                frames.append(arcade.load_texture(temp))
 
-        return frames
+    @staticmethod
+    def load_animations():
+        """Makes and returns the textures for every animation ahead of time"""
+        return [frame for name in NightBorne.ANIMATIONS for frame in NightBorne.animation(name)]
 
 
     # Animations
@@ -79,19 +98,19 @@ class NightBorne:
     
     def attack_animation(self):
         """Returns the boss enemys attack frames"""
-        return self.frames[46:58]
+        return self.animation("attack")
     
     def hurt_animation(self):
         """Returns the boss enemys hurt frames"""
-        return self.frames[23:28]
+        return self.animation("hurt")
     
     def death_animation(self):
         """Returns the boss enemys death frames"""
-        return self.frames[0:23]
+        return self.animation("death")
     
     def special_animation(self):
         """Returns the boss enemys special move frames"""
-        return self.frames[92:101]
+        return self.animation("special")
 
 
     def calc_damage(self, guard, character):
@@ -104,11 +123,7 @@ class NightBorne:
             character: The instance of character the game is using
         """
         
-        damage = max(0, self.atk - character.defense)
-        if guard > 0:
-            damage = round(damage / 2)
-            guard -= 1
-        return damage, guard
+        return enemy_damage(self.atk, character.defense, guard)
 
 
     def decide_action(self, battle):
@@ -122,46 +137,24 @@ class NightBorne:
             battle: The instance of BattleScreen the game is using
         """
         
-        num = random.randint(1, 100)
-
-        # More likely to heal when HP is at or below 40%
-        if self.hp <= 40:
-            
-            # Try heal (40%)
-            if num <= 40:
-                healed_amount = self.heal()
-                battle.start_enemy_hp_animation = True
-                return 1, healed_amount
-            
-            # Try debuff (20%) only if useful
-            if 40 < num <= 60 and (battle.guard > 0 or battle.overclock > 0 or battle.repair > 0):
-                self.debuff(battle)
-                return 2, None
-            
-            # Otherwise attack (remaining 40% - 60%)
-            return 3, None
-        
-
-        else:
-
-            # Heal chance only if below 75% HP (20%)
-            if self.hp <= 75 and num <= 20:
-                healed_amount = self.heal()
-                battle.start_enemy_hp_animation = True
-                return 1, healed_amount
-
-            # Debuff (10%) only if relevant
-            if 20 < num <= 30 and (battle.guard > 0 or battle.overclock > 0 or battle.repair > 0):
-                self.debuff(battle)
-                return 2, None
-            
-            # Otherwise attack (remaining 70–80%)
-            return 3, None
+        num = RNG.ai.randint(1, 100)
+        buffed = battle.guard > 0 or battle.overclock > 0 or battle.repair > 0
+
+        # The chances are in CombatEngine.boss_action
+        decision = boss_action(self.hp, num, buffed)
+        if decision == HEAL:
+            healed_amount = self.heal()
+            battle.start_enemy_hp_animation = True
+            return decision, healed_amount
+
+        if decision == DEBUFF:
+            self.debuff(battle)
+        return decision, None
         
         
     def heal(self):
         """This method handles the healing special move"""
-        healed_hp = min(self.max_hp - self.hp, 40)
+        healed_hp = min(self.max_hp - self.hp, BOSS_HEAL)
         self.hp += healed_hp
         return healed_hp
     
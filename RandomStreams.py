@@ -0,0 +1,112 @@
+import hashlib
+import os
+import random
+
+# The streams the game draws from, one for each thing that rolls dice
+STREAMS = ("loot", "encounters", "ai", "qte", "audio")
+
+class RandomStreams:
+    """
+    This class hands out the game's random numbers from separate named
+    streams, like "loot" and "audio", that are all seeded from one number
+
+    Each stream only moves when its own part of the game rolls, so a sound
+    playing doesn't change what an enemy drops, and the same seed with the
+    same inputs plays out the same way every time
+    Every stream's seed is a hash of the main seed and its name, and
+    spawn() makes a whole new set the same way for worker processes
+    """
+
+    def __init__(self, seed=None):
+        """
+        This is the class setup
+
+        Args:
+            seed: The main seed, if None a new one is picked
+                  and kept in self.seed so the run can be replayed
+        """
+
+        self.streams = {}
+        for name in STREAMS:
+            self.streams[name] = random.Random()
+            setattr(self, name, self.streams[name])
+        self.reseed(seed)
+
+    @staticmethod
+    def derive(seed, name):
+        """
+        Returns the seed for a stream, mixing the main seed and a name
+        so streams with different names don't line up
+
+        Args:
+            seed: The main seed
+
+            name: The stream's name, or anything else to tell seeds apart
+        """
+
+        digest = hashlib.sha256(f"{seed}/{name}".encode()).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def reseed(self, seed=None):
+        """
+        Starts every stream over from a main seed, the stream
+        objects stay the same so anything holding one keeps working
+
+        Args:
+            seed: The main seed, if None a new one is picked
+        """
+
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "big")
+        self.seed = seed
+        for name, stream in self.streams.items():
+            stream.seed(RandomStreams.derive(seed, name))
+
+    def stream(self, name):
+        """
+        Returns a stream by name, making it if it isn't one of STREAMS
+
+        Args:
+            name: The stream's name, like "loot"
+        """
+
+        if name not in self.streams:
+            self.streams[name] = random.Random(RandomStreams.derive(self.seed, name))
+        return self.streams[name]
+
+    def spawn(self, key):
+        """
+        Returns a new set of streams for a worker or a simulation, it's
+        repeatable from this set's seed but independent of it
+
+        Args:
+            key: What tells this set apart from other spawned ones, like a worker number
+        """
+
+        return RandomStreams(RandomStreams.derive(self.seed, f"spawn/{key}"))
+
+    def snapshot(self):
+        """Returns where every stream is up to, for restore() to go back to"""
+
+        return self.seed, {name: stream.getstate() for name, stream in self.streams.items()}
+
+    def restore(self, snapshot):
+        """
+        Puts every stream back where it was when a snapshot was taken
+
+        Args:
+            snapshot: What snapshot() returned
+        """
+
+        self.seed, states = snapshot
+        for name, state in states.items():
+            self.stream(name).setstate(state)
+
+        # Streams made after the snapshot go back to their start
+        for name, stream in self.streams.items():
+            if name not in states:
+                stream.seed(RandomStreams.derive(self.seed, name))
+
+
+# The one set of streams the game uses
+RNG = RandomStreams()
@@ -0,0 +1,74 @@
+import arcade
+
+class RoomLayer:
+    """
+    This class keeps the room the player is standing in drawn into its
+    own texture, the background, the minimap and the movement line,
+    so a frame only has to copy one picture to the screen
+
+    The room is only drawn again when the player moves, the map
+    changes or the window is resized, fading the room in only
+    changes the alpha the texture is copied with
+    """
+
+    # How many layer textures have been made, so each gets its own name
+    textures_made = 0
+
+    def __init__(self):
+        """This is the class setup"""
+
+        # What the texture was drawn for, and whether it has to be drawn again
+        self.key = None
+        self.dirty = True
+        self.texture = None
+
+    def invalidate(self):
+        """Marks the layer as changed so it gets drawn again on the next frame"""
+
+        self.dirty = True
+
+    def render(self, width, height, compose):
+        """
+        Draws the room into the layer's texture
+
+        Args:
+            width, height: The size of the game window in pixels
+
+            compose: Draws everything in the room at full strength,
+                     the texture is cleared to black before it's called
+        """
+
+        atlas = arcade.get_window().ctx.default_atlas
+        if self.texture is None or self.texture.size != (width, height):
+            RoomLayer.textures_made += 1
+            self.texture = arcade.Texture.create_empty(
+                f"room-layer-{RoomLayer.textures_made}",
+                (width, height)
+            )
+            atlas.add(self.texture)
+
+        with atlas.render_into(self.texture) as fbo:
+            fbo.clear(color=(0, 0, 0, 255), viewport=fbo.viewport)
+            compose()
+
+    def draw(self, key, width, height, compose, alpha=255):
+        """
+        Copies the room onto the screen, drawing it first if it changed
+
+        Args:
+            key: What's in the room, like the room's name, a new
+                 key means the room is drawn again
+
+            width, height: The size of the game window in pixels
+
+            compose: Draws everything in the room at full strength
+
+            alpha: How faded in the room is
+        """
+
+        if self.dirty or key != self.key or self.texture is None or self.texture.size != (width, height):
+            self.render(width, height, compose)
+            self.key = key
+            self.dirty = False
+
+        arcade.draw_texture_rect(self.texture, arcade.LBWH(0, 0, width, height), alpha=alpha, pixelated=True)
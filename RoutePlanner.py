@@ -0,0 +1,200 @@
+from collections import OrderedDict, deque
+
+# Distance of a room that can't be reached yet
+UNREACHED = float("inf")
+
+class RoutePlanner:
+    """
+    This class finds the shortest way between rooms along the paths
+    the player has already revealed, for auto-travel
+
+    For each destination it keeps how far every room is from it and
+    which way to step to get closer, so a route is read off one step at
+    a time without searching the maze again
+    When a path is revealed only the rooms it brings closer are updated,
+    it hears about every revealed path from the WorldState
+    """
+
+    def __init__(self, graph, world, max_trees=8):
+        """
+        This is the class setup
+
+        Args:
+            graph: The MazeGraph the routes go through
+
+            world: The WorldState that says which paths are revealed
+
+            max_trees: How many destinations are kept worked out at once
+                       before the least recently used is dropped
+        """
+
+        self.graph = graph
+        self.world = world
+        self.max_trees = max_trees
+
+        # Destination room number -> (distances, next step) for every room
+        self.trees = OrderedDict()
+        self.rebuild()
+        world.subscribe(self.world_changed)
+
+    def world_changed(self, label):
+        """
+        Keeps the routes up to date with the WorldState
+
+        Args:
+            label: The path that was revealed, or None if they all may have changed
+        """
+
+        if label is None:
+            self.rebuild()
+        else:
+            self.reveal(label)
+
+    def rebuild(self):
+        """Works out the revealed paths again, after a reset or a load"""
+
+        self.adjacent = [[] for _ in self.graph.names]
+        for label, (first, second) in zip(self.graph.labels, self.graph.joins):
+            if self.world.is_revealed(label):
+                self.adjacent[self.graph.ids[first]].append(self.graph.ids[second])
+                self.adjacent[self.graph.ids[second]].append(self.graph.ids[first])
+        self.trees.clear()
+
+    def reveal(self, label):
+        """
+        Adds a newly revealed path, only updating the rooms
+        it makes closer to each destination
+
+        Args:
+            label: The connection's label, like "A"
+        """
+
+        first, second = self.graph.joins[self.graph.connection_ids[label]]
+        first, second = self.graph.ids[first], self.graph.ids[second]
+        self.adjacent[first].append(second)
+        self.adjacent[second].append(first)
+
+        for distance, step in self.trees.values():
+            if distance[first] + 1 < distance[second]:
+                self._relax(distance, step, second, first)
+            elif distance[second] + 1 < distance[first]:
+                self._relax(distance, step, first, second)
+
+    def _relax(self, distance, step, room, toward):
+        """
+        Moves a room closer to a destination through a new path, then
+        passes the change on to every room it makes closer in turn
+
+        Args:
+            distance: How far each room is from the destination
+
+            step: Which room each room should step to next
+
+            room: The room number the new path brought closer
+
+            toward: The room number on the other end of the new path
+        """
+
+        distance[room] = distance[toward] + 1
+        step[room] = toward
+        queue = deque([room])
+        while queue:
+            current = queue.popleft()
+            for other in self.adjacent[current]:
+                if distance[current] + 1 < distance[other]:
+                    distance[other] = distance[current] + 1
+                    step[other] = current
+                    queue.append(other)
+
+    def tree(self, destination):
+        """
+        Returns how far every room is from a destination and which way
+        to step from each room, working it out if it isn't kept yet
+
+        Args:
+            destination: The destination's room number
+        """
+
+        if destination in self.trees:
+            self.trees.move_to_end(destination)
+            return self.trees[destination]
+
+        distance = [UNREACHED] * len(self.graph.names)
+        step = [None] * len(self.graph.names)
+        distance[destination] = 0
+        queue = deque([destination])
+        while queue:
+            current = queue.popleft()
+            for other in self.adjacent[current]:
+                if distance[other] == UNREACHED:
+                    distance[other] = distance[current] + 1
+                    step[other] = current
+                    queue.append(other)
+
+        self.trees[destination] = (distance, step)
+        if len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+        return distance, step
+
+    def route(self, start, destination):
+        """
+        Returns the rooms walked through going from one room to another,
+        ending with the destination, or None if there's no revealed way
+        This only walks the route, as long as either room's tree is kept
+
+        Args:
+            start: The name of the room to leave from
+
+            destination: The name of the room to go to
+        """
+
+        start = self.graph.ids[start]
+        destination = self.graph.ids[destination]
+
+        if destination in self.trees:
+            distance, step = self.tree(destination)
+            if distance[start] == UNREACHED:
+                return None
+            rooms = []
+            current = start
+            while distance[current] > 0:
+                current = step[current]
+                rooms.append(self.graph.names[current])
+            return rooms
+
+        # Paths go both ways, so the start's tree, like the one the travel
+        # menu worked out, gives the route read backwards from the destination
+        distance, step = self.tree(start)
+        if distance[destination] == UNREACHED:
+            return None
+        rooms = []
+        current = destination
+        while distance[current] > 0:
+            rooms.append(self.graph.names[current])
+            current = step[current]
+        rooms.reverse()
+        return rooms
+
+    def nearest(self, start, wanted):
+        """
+        Returns the closest room that's wanted by walking revealed paths,
+        or None if there isn't one
+
+        Args:
+            start: The name of the room to search from
+
+            wanted: Takes a room name and returns whether it's wanted
+        """
+
+        start = self.graph.ids[start]
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            if current != start and wanted(self.graph.names[current]):
+                return self.graph.names[current]
+            for other in self.adjacent[current]:
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        return None
@@ -1,4 +1,7 @@
+from collections import OrderedDict
 import arcade
+from arcade.shape_list import ShapeElementList, create_rectangle_filled, create_rectangle_outline
+from TextCache import TEXT_CACHE
 
 class ScreenChanger:
     """
@@ -7,6 +10,73 @@ class ScreenChanger:
     Isaac
     """
     
+    # Popup panels and buttons already sent to the GPU, by layout
+    _chrome = OrderedDict()
+    MAX_CHROME = 64
+    
+    @staticmethod
+    def button(cx, cy, w, h, text="", highlighted=False,
+               fill_color=arcade.color.BLACK, outline_color=arcade.color.RED, font_size=16, border_width=2):
+        """
+        Returns the layout of a rectangular button with text,
+        draw_buttons draws a list of these in one batch
+        
+        Args:
+            cx, cy: center coordinates of the button
+            w, h: width and height
+            
+            text: label text
+            
+            highlighted: if True, outline is yellow instead of default
+            
+            fill_color: button fill color
+            
+            outline_color: outline color when not highlighted,
+                           None leaves the outline off
+            
+            font_size: size of the text
+            
+            border_width: how thick the outline is
+        """
+        
+        if highlighted:
+            outline_color = arcade.color.YELLOW
+        return (cx, cy, w, h, fill_color, outline_color, border_width, text, font_size)
+    
+    @staticmethod
+    def draw_buttons(buttons):
+        """
+        Draws a list of buttons, all their rectangles are drawn as one
+        shape list that's only rebuilt when the layout changes,
+        like when the window is resized or a new button is highlighted
+        
+        Args:
+            buttons: Button layouts from the button method, in the
+                     order they should be drawn
+        """
+        
+        # Everything but the text decides what the rectangles look like
+        key = tuple(button[:7] for button in buttons)
+        
+        shapes = ScreenChanger._chrome.get(key)
+        if shapes is None:
+            shapes = ShapeElementList()
+            for cx, cy, w, h, fill_color, outline_color, border_width in key:
+                shapes.append(create_rectangle_filled(cx, cy, w, h, fill_color))
+                if outline_color is not None:
+                    shapes.append(create_rectangle_outline(cx, cy, w, h, outline_color, border_width))
+            ScreenChanger._chrome[key] = shapes
+            if len(ScreenChanger._chrome) > ScreenChanger.MAX_CHROME:
+                ScreenChanger._chrome.popitem(last=False)
+        else:
+            ScreenChanger._chrome.move_to_end(key)
+        shapes.draw()
+        
+        # Labels go on top of the rectangles
+        for cx, cy, *_, text, font_size in buttons:
+            if text:
+                TEXT_CACHE.draw(text, cx, cy - font_size / 2, arcade.color.WHITE, font_size, anchor_x="center")
+    
     @staticmethod
     def draw_button(cx, cy, w, h, text="", highlighted=False, 
                     fill_color=arcade.color.BLACK, outline_color=arcade.color.RED, font_size=16):
@@ -28,19 +98,9 @@ class ScreenChanger:
             font_size: size of the text
         """
         
-        if highlighted:
-            outline_color = arcade.color.YELLOW
-
-        left = cx - w / 2
-        right = cx + w / 2
-        top = cy + h / 2
-        bottom = cy - h / 2
-
-        arcade.draw_lrbt_rectangle_filled(left, right, bottom, top, fill_color)
-        arcade.draw_lrbt_rectangle_outline(left, right, bottom, top, outline_color, 2)
-
-        if text:
-            arcade.draw_text(text, cx, cy - 8, arcade.color.WHITE, font_size, anchor_x="center")
+        ScreenChanger.draw_buttons([
+            ScreenChanger.button(cx, cy, w, h, text, highlighted, fill_color, outline_color, font_size)
+        ])
 
 
     def draw_game_over(self, window, game_over_options, selected_index):
@@ -58,34 +118,23 @@ class ScreenChanger:
         screen_width, screen_height = window.get_size()
 
         # Full black overlay
-        arcade.draw_lrbt_rectangle_filled(
-            0, screen_width, 0, screen_height,
-            arcade.color.BLACK
-        )
-
-        # "GAME OVER" text
-        arcade.draw_text(
-            "GAME OVER",
-            screen_width / 2,
-            screen_height / 2 + 50,
-            arcade.color.RED,
-            40,
-            anchor_x="center",
-            anchor_y="center",
-            bold=True
-        )
+        buttons = [self.button(
+            screen_width / 2, screen_height / 2,
+            screen_width, screen_height,
+            outline_color=None
+        )]
 
         # Button panel background
         panel_height = 80
         panel_width = 400
         panel_y = panel_height / 2 + 30
 
-        self.draw_button(
+        buttons.append(self.button(
             screen_width / 2, panel_y,
             panel_width, panel_height,
             fill_color=arcade.color.BLACK,
             outline_color=arcade.color.RED
-        )
+        ))
 
         # Draw the Restart/Quit buttons inside the panel
         spacing = 20
@@ -98,7 +147,21 @@ class ScreenChanger:
         for i, option in enumerate(game_over_options):
             cx = start_x + i * (button_width + spacing) + button_width / 2
             highlighted = (i == selected_index)
-            self.draw_button(cx, panel_y, button_width, button_height, option, highlighted=highlighted)
+            buttons.append(self.button(cx, panel_y, button_width, button_height, option, highlighted=highlighted))
+
+        self.draw_buttons(buttons)
+
+        # "GAME OVER" text
+        TEXT_CACHE.draw(
+            "GAME OVER",
+            screen_width / 2,
+            screen_height / 2 + 50,
+            arcade.color.RED,
+            40,
+            anchor_x="center",
+            anchor_y="center",
+            bold=True
+        )
 
 
     def draw_battle_tutorial_popup(self, window):
@@ -115,7 +178,7 @@ class ScreenChanger:
         h = 300
 
         # Main popup box
-        self.draw_button(cx, cy, w, h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons = [self.button(cx, cy, w, h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)]
 
         tutorial_lines = [
             "LOOKS LIKE THIS IS YOUR FIRST FIGHT",
@@ -128,25 +191,28 @@ class ScreenChanger:
             "THE MORE YOU ATTACK THE FASTER IT WILL SPIN",
         ]
 
-        for i, line in enumerate(tutorial_lines):
-            arcade.draw_text(
-                line,
-                cx, cy + 100 - i * 30,
-                arcade.color.RED,
-                14,
-                anchor_x="center"
-            )
-
         # Bottom command bar
         bar_h = 80
         bar_margin = 20
         bar_cy = cy - h / 2 - bar_h / 2 - bar_margin
-        self.draw_button(cx, bar_cy, w, bar_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons.append(self.button(cx, bar_cy, w, bar_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED))
 
         # OK button
         box_w = 200
         box_h = 60
-        self.draw_button(cx, bar_cy, box_w, box_h, "OK", highlighted=True)
+        buttons.append(self.button(cx, bar_cy, box_w, box_h, "OK", highlighted=True))
+
+        self.draw_buttons(buttons)
+
+        # Tutorial text goes on top of the panels
+        for i, line in enumerate(tutorial_lines):
+            TEXT_CACHE.draw(
+                line,
+                cx, cy + 100 - i * 30,
+                arcade.color.RED,
+                14,
+                anchor_x="center"
+            )
 
 
     def draw_boss_battle_tutorial_popup(self, window):
@@ -162,7 +228,7 @@ class ScreenChanger:
         w = 600
         h = 300
 
-        self.draw_button(cx, cy, w, h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons = [self.button(cx, cy, w, h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)]
 
         tutorial_lines = [
             "LOOKS LIKE THIS IS YOUR FIRST BOSS FIGHT",
@@ -174,25 +240,28 @@ class ScreenChanger:
             "PRESSING THE WRONG ARROW WILL MAKE YOU TAKE 100%"
         ]
 
-        for i, line in enumerate(tutorial_lines):
-            arcade.draw_text(
-                line,
-                cx, cy + 90 - i * 30,
-                arcade.color.RED,
-                14,
-                anchor_x="center"
-            )
-
         # Command bar
         bar_h = 80
         bar_margin = 20
         bar_cy = cy - h / 2 - bar_h / 2 - bar_margin
-        self.draw_button(cx, bar_cy, w, bar_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons.append(self.button(cx, bar_cy, w, bar_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED))
 
         # OK button
         box_w = 200
         box_h = 60
-        self.draw_button(cx, bar_cy, box_w, box_h, "OK", highlighted=True)
+        buttons.append(self.button(cx, bar_cy, box_w, box_h, "OK", highlighted=True))
+
+        self.draw_buttons(buttons)
+
+        # Tutorial text goes on top of the panels
+        for i, line in enumerate(tutorial_lines):
+            TEXT_CACHE.draw(
+                line,
+                cx, cy + 90 - i * 30,
+                arcade.color.RED,
+                14,
+                anchor_x="center"
+            )
 
 
     def draw_shop_tutorial_popup(self, window):
@@ -209,7 +278,7 @@ class ScreenChanger:
         h = 300
 
         # Main popup box
-        self.draw_button(cx, cy, w, h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons = [self.button(cx, cy, w, h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)]
 
         tutorial_lines = [
             "WE'VE NOTICED YOUR HARD WORK PAWN,",
@@ -220,27 +289,30 @@ class ScreenChanger:
             "WE'LL SEND THEM DOWN THE PIPE FOR YOU!"
         ]
 
-        for i, line in enumerate(tutorial_lines):
-            arcade.draw_text(
-                line,
-                cx,
-                cy + 80 - i * 30,
-                arcade.color.RED,
-                16,
-                anchor_x="center"
-            )
-
         # Bottom bar
         bar_h = 80
         bar_margin = 20
         bar_cy = cy - h / 2 - bar_h / 2 - bar_margin
 
-        self.draw_button(cx, bar_cy, w, bar_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons.append(self.button(cx, bar_cy, w, bar_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED))
 
         # OK button
         box_w = 200
         box_h = 60
-        self.draw_button(cx, bar_cy, box_w, box_h, "OK", highlighted=True)
+        buttons.append(self.button(cx, bar_cy, box_w, box_h, "OK", highlighted=True))
+
+        self.draw_buttons(buttons)
+
+        # Tutorial text goes on top of the panels
+        for i, line in enumerate(tutorial_lines):
+            TEXT_CACHE.draw(
+                line,
+                cx,
+                cy + 80 - i * 30,
+                arcade.color.RED,
+                16,
+                anchor_x="center"
+            )
         
 
     def draw_status_popup(self, window, character, popup_options, menu_index):
@@ -263,37 +335,18 @@ class ScreenChanger:
         h = 220
 
         # Main stats box
-        self.draw_button(cx, cy, w, h,
+        buttons = [self.button(cx, cy, w, h,
                     fill_color=arcade.color.BLACK,
-                    outline_color=arcade.color.RED)
-
-        # Stats text
-        stats_lines = [
-            f"Name: {character.name}",
-            f"Status: {character.title}",
-            f"HP: {character.hp}/{character.max_hp}",
-            f"MP: {character.mp}/{character.max_mp}",
-            f"ATK: {character.atk} | DEF: {character.defense} | SPD: {character.spd}",
-        ]
-
-        for i, line in enumerate(stats_lines):
-            arcade.draw_text(
-                line,
-                cx,
-                cy + 70 - i * 25,
-                arcade.color.WHITE,
-                16,
-                anchor_x="center"
-            )
+                    outline_color=arcade.color.RED)]
 
         # Command bar under stats
         bar_w = 420
         bar_h = 100
         bar_cy = cy - h / 2 - bar_h / 2 - 10
 
-        self.draw_button(cx, bar_cy, bar_w, bar_h,
+        buttons.append(self.button(cx, bar_cy, bar_w, bar_h,
                     fill_color=arcade.color.BLACK,
-                    outline_color=arcade.color.RED)
+                    outline_color=arcade.color.RED))
 
         # Row of buttons
         num_buttons = len(popup_options)
@@ -307,13 +360,34 @@ class ScreenChanger:
 
         for i, option in enumerate(popup_options):
             cx_button = start_x + i * (box_w + spacing) + box_w / 2
-            self.draw_button(
+            buttons.append(self.button(
                 cx_button,
                 button_y,
                 box_w,
                 box_h,
                 option,
                 highlighted=(i == menu_index)
+            ))
+
+        self.draw_buttons(buttons)
+
+        # Stats text
+        stats_lines = [
+            f"Name: {character.name}",
+            f"Status: {character.title}",
+            f"HP: {character.hp}/{character.max_hp}",
+            f"MP: {character.mp}/{character.max_mp}",
+            f"ATK: {character.atk} | DEF: {character.defense} | SPD: {character.spd}",
+        ]
+
+        for i, line in enumerate(stats_lines):
+            TEXT_CACHE.draw(
+                line,
+                cx,
+                cy + 70 - i * 25,
+                arcade.color.WHITE,
+                16,
+                anchor_x="center"
             )
             
     
@@ -337,27 +411,11 @@ class ScreenChanger:
         h = 220
 
         # Outer box using shared button style
-        self.draw_button(
+        buttons = [self.button(
             cx, cy, w, h,
             fill_color=arcade.color.BLACK,
             outline_color=arcade.color.RED
-        )
-
-        # Equipment text
-        equip_lines = [
-            f"{character.equipment['Armor'][0]}: +{character.equipment['Armor'][1]} DEF",
-            f"{character.equipment['Weapon'][0]}: +{character.equipment['Weapon'][1]} ATK",
-        ]
-
-        for i, line in enumerate(equip_lines):
-            arcade.draw_text(
-                line,
-                cx,
-                cy + 40 - i * 30,
-                arcade.color.WHITE,
-                16,
-                anchor_x="center"
-            )
+        )]
 
         # Buttons
         num_buttons = len(popup_options)
@@ -372,17 +430,35 @@ class ScreenChanger:
             start_x = cx - total_width / 2
             button_y = cy - h / 2 + 50
 
-            # Draw each button
+            # Add each button
             for i, option in enumerate(popup_options):
                 cx_button = start_x + i * (box_w + spacing) + box_w / 2
-                self.draw_button(
+                buttons.append(self.button(
                     cx_button,
                     button_y,
                     box_w,
                     box_h,
                     option,
                     highlighted=(i == menu_index)
-                )
+                ))
+
+        self.draw_buttons(buttons)
+
+        # Equipment text
+        equip_lines = [
+            f"{character.equipment['Armor'][0]}: +{character.equipment['Armor'][1]} DEF",
+            f"{character.equipment['Weapon'][0]}: +{character.equipment['Weapon'][1]} ATK",
+        ]
+
+        for i, line in enumerate(equip_lines):
+            TEXT_CACHE.draw(
+                line,
+                cx,
+                cy + 40 - i * 30,
+                arcade.color.WHITE,
+                16,
+                anchor_x="center"
+            )
                 
     
     def draw_item_popup(self, window, character, popup_options, menu_index):
@@ -405,28 +481,11 @@ class ScreenChanger:
         h = 220
 
         # Outer box using your shared button style
-        self.draw_button(
+        buttons = [self.button(
             cx, cy, w, h,
             fill_color=arcade.color.BLACK,
             outline_color=arcade.color.RED
-        )
-
-        # Item counts
-        item_lines = [
-            f"{character.items['HP Potion'][0]}: {character.items['HP Potion'][1]}",
-            f"{character.items['MP Potion'][0]}: {character.items['MP Potion'][1]}",
-            f"{character.items['Gold'][0]}: {character.items['Gold'][1]}",
-        ]
-
-        for i, line in enumerate(item_lines):
-            arcade.draw_text(
-                line,
-                cx,
-                cy + h / 2 - 40 - i * 30,
-                arcade.color.WHITE,
-                16,
-                anchor_x="center"
-            )
+        )]
 
         # Buttons
         num_buttons = len(popup_options)
@@ -441,14 +500,33 @@ class ScreenChanger:
 
             for i, option in enumerate(popup_options):
                 cx_button = start_x + i * (box_w + spacing) + box_w / 2
-                self.draw_button(
+                buttons.append(self.button(
                     cx_button,
                     button_y,
                     box_w,
                     box_h,
                     option,
                     highlighted=(i == menu_index)
-                )
+                ))
+
+        self.draw_buttons(buttons)
+
+        # Item counts
+        item_lines = [
+            f"{character.items['HP Potion'][0]}: {character.items['HP Potion'][1]}",
+            f"{character.items['MP Potion'][0]}: {character.items['MP Potion'][1]}",
+            f"{character.items['Gold'][0]}: {character.items['Gold'][1]}",
+        ]
+
+        for i, line in enumerate(item_lines):
+            TEXT_CACHE.draw(
+                line,
+                cx,
+                cy + h / 2 - 40 - i * 30,
+                arcade.color.WHITE,
+                16,
+                anchor_x="center"
+            )
     
     
     def draw_loot_popup(self, window, loot_popup_state, loot_popup_text):
@@ -504,11 +582,12 @@ class ScreenChanger:
 
         # Top panel
         top_panel_cy = cy + 40
-        self.draw_button(cx, top_panel_cy, w, top_panel_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons = [self.button(cx, top_panel_cy, w, top_panel_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)]
 
         # Bottom panel
         bottom_panel_cy = top_panel_cy - top_panel_h / 2 - bottom_panel_h / 2 - spacing
-        self.draw_button(cx, bottom_panel_cy, w, bottom_panel_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED)
+        buttons.append(self.button(cx, bottom_panel_cy, w, bottom_panel_h, fill_color=arcade.color.BLACK, outline_color=arcade.color.RED))
+        self.draw_buttons(buttons)
 
         # Item list
         num_items = len(Shop_items)
@@ -534,11 +613,11 @@ class ScreenChanger:
 
             color = arcade.color.YELLOW if i == shop_menu_index else arcade.color.WHITE
 
-            arcade.draw_text(text, cx, start_y - i * item_spacing, color, 16, anchor_x="center")
+            TEXT_CACHE.draw(text, cx, start_y - i * item_spacing, color, 16, anchor_x="center")
 
         # Gold display
         gold_amount = character.items["Gold"][1]
-        arcade.draw_text(
+        TEXT_CACHE.draw(
             f"Gold: {gold_amount}",
             cx,
             start_y - num_items * item_spacing,
@@ -558,7 +637,7 @@ class ScreenChanger:
             if isinstance(item, tuple):
                 desc_text = item[-1]
 
-        arcade.draw_text(
+        TEXT_CACHE.draw(
             desc_text,
             cx,
             bottom_panel_cy,
@@ -594,16 +673,7 @@ class ScreenChanger:
 
         # Selection panel
         top_panel_cy = cy + (bottom_panel_h / 2)
-        arcade.draw_lrbt_rectangle_filled(
-            cx - w/2, cx + w/2,
-            top_panel_cy - top_panel_h/2, top_panel_cy + top_panel_h/2,
-            arcade.color.BLACK
-        )
-        arcade.draw_lrbt_rectangle_outline(
-            cx - w/2, cx + w/2,
-            top_panel_cy - top_panel_h/2, top_panel_cy + top_panel_h/2,
-            arcade.color.RED, 3
-        )
+        buttons = [ScreenChanger.button(cx, top_panel_cy, w, top_panel_h, border_width=3)]
 
         # Description panel
         bottom_panel_cy = cy - h/2 + bottom_panel_h/2
@@ -611,16 +681,8 @@ class ScreenChanger:
         bottom_top = bottom_panel_cy + bottom_panel_h/2 - 20
         bottom_center = (bottom_bottom + bottom_top) / 2
 
-        arcade.draw_lrbt_rectangle_filled(
-            cx - w/2, cx + w/2,
-            bottom_bottom, bottom_top,
-            arcade.color.BLACK
-        )
-        arcade.draw_lrbt_rectangle_outline(
-            cx - w/2, cx + w/2,
-            bottom_bottom, bottom_top,
-            arcade.color.RED, 3
-        )
+        buttons.append(ScreenChanger.button(cx, bottom_center, w, bottom_top - bottom_bottom, border_width=3))
+        ScreenChanger.draw_buttons(buttons)
 
         # List special moves
         options = list(special_menu_options)
@@ -635,7 +697,7 @@ class ScreenChanger:
                 text = f"{name}: {mp_cost} MP"
 
             color = arcade.color.YELLOW if i == special_menu_index else arcade.color.WHITE
-            arcade.draw_text(text, cx, start_y - i*option_spacing, color, 16, anchor_x="center")
+            TEXT_CACHE.draw(text, cx, start_y - i*option_spacing, color, 16, anchor_x="center")
 
         # Description bar
         selected_key = options[special_menu_index]
@@ -645,7 +707,7 @@ class ScreenChanger:
         else:
             desc_text = character.special[selected_key][1]  # skill description
 
-        arcade.draw_text(
+        TEXT_CACHE.draw(
             desc_text,
             cx,
             bottom_center,
@@ -671,10 +733,34 @@ class ScreenChanger:
         screen_w, screen_h = window.get_size()
 
         # Background Black
-        arcade.draw_lrbt_rectangle_filled(0, screen_w, 0, screen_h, arcade.color.BLACK)
+        buttons = [self.button(screen_w/2, screen_h/2, screen_w, screen_h, outline_color=None)]
+
+        # Option buttons
+        button_width = 200
+        button_height = 50
+        spacing = 40
+
+        total_width = len(options) * button_width + (len(options)-1)*spacing
+        start_x = (screen_w - total_width) / 2
+
+        for i, option in enumerate(options):
+            x = start_x + i*(button_width+spacing) + button_width/2
+            y = screen_h/2 - 50
+
+            highlight = (i == selected_index)
+            buttons.append(self.button(
+                x, y,
+                button_width, button_height,
+                option,
+                highlighted=highlight,
+                font_size=20,
+                border_width=3
+            ))
+
+        self.draw_buttons(buttons)
 
         # Win text
-        arcade.draw_text(
+        TEXT_CACHE.draw(
             "YOU WIN!", 
             screen_w/2, screen_h/2 + 120, 
             arcade.color.RED, 
@@ -682,37 +768,72 @@ class ScreenChanger:
         )
 
         # Decorative underline
-        arcade.draw_text(
+        TEXT_CACHE.draw(
             "────────────",
             screen_w/2, screen_h/2 + 90,
             arcade.color.RED,
             40, anchor_x="center"
         )
+    
+    
+    def draw_travel_popup(self, window, options, selected_index, rows=6):
+        """
+        Draw auto-travel destination popup
+        
+        Args:
+            window: The game window
+                                    
+            options: The places to travel to, then Exit
+            
+            selected_index: Which button is currently selected
+            
+            rows: How many places fit in the list, it scrolls
+                  to keep the selected one showing
+        """
+        
+        screen_w, screen_h = window.get_size()
 
-        # Option buttons
-        button_width = 200
-        button_height = 50
-        spacing = 40
+        # Popup panel dimensions
+        rows = min(rows, len(options))
+        button_w, button_h = 260, 40
+        spacing = 50
+        w, h = 400, 100 + rows * spacing
+        cx, cy = screen_w/2, screen_h/2
+        top = cy + h/2
 
-        total_width = len(options) * button_width + (len(options)-1)*spacing
-        start_x = (screen_w - total_width) / 2
+        # Panel background
+        buttons = [self.button(cx, cy, w, h, border_width=3)]
 
-        for i, option in enumerate(options):
-            x = start_x + i*(button_width+spacing) + button_width/2
-            y = screen_h/2 - 50
+        # Scroll so the selected place sits in the list
+        first = min(max(0, selected_index - rows // 2), len(options) - rows)
 
-            highlight = (i == selected_index)
-            outline = arcade.color.YELLOW if highlight else arcade.color.RED
+        # One column of buttons under the title
+        for row in range(rows):
+            i = first + row
+            y = top - 90 - row * spacing
+            buttons.append(self.button(
+                cx, y,
+                button_w, button_h,
+                text=options[i],
+                highlighted=(i == selected_index),
+                fill_color=arcade.color.BLACK
+            ))
+
+        self.draw_buttons(buttons)
 
-            # Draw button
-            arcade.draw_lrbt_rectangle_filled(x-button_width/2, x+button_width/2,
-                                            y-button_height/2, y+button_height/2,
-                                            arcade.color.BLACK)
-            arcade.draw_lrbt_rectangle_outline(x-button_width/2, x+button_width/2,
-                                            y-button_height/2, y+button_height/2,
-                                            outline, 3)
+        # Title text
+        TEXT_CACHE.draw(
+            "Where do you want to go?",
+            cx, top - 40,
+            arcade.color.WHITE,
+            18, anchor_x="center", align="center"
+        )
 
-            arcade.draw_text(option, x, y-10, arcade.color.WHITE, 20, anchor_x="center")
+        # Arrows when there are more places above or below
+        if first > 0:
+            TEXT_CACHE.draw("▲", cx + button_w/2 + 30, top - 90, arcade.color.RED, 16, anchor_x="center", anchor_y="center")
+        if first + rows < len(options):
+            TEXT_CACHE.draw("▼", cx + button_w/2 + 30, top - 90 - (rows - 1) * spacing, arcade.color.RED, 16, anchor_x="center", anchor_y="center")
     
     
     def draw_end_popup(self, window, options, selected_index):
@@ -734,16 +855,7 @@ class ScreenChanger:
         cx, cy = screen_w/2, screen_h/2
 
         # Panel background
-        arcade.draw_lrbt_rectangle_filled(cx-w/2, cx+w/2, cy-h/2, cy+h/2, arcade.color.BLACK)
-        arcade.draw_lrbt_rectangle_outline(cx-w/2, cx+w/2, cy-h/2, cy+h/2, arcade.color.RED, 3)
-
-        # Title text
-        arcade.draw_text(
-            "Do you want to face the final boss and exit the dungeon?",
-            cx, cy+45,
-            arcade.color.WHITE,
-            18, anchor_x="center", align="center"
-        )
+        buttons = [self.button(cx, cy, w, h, border_width=3)]
 
         # Two button layout
         button_w, button_h = 120, 50
@@ -752,10 +864,20 @@ class ScreenChanger:
 
         for i, option in enumerate(options):
             x = cx + (i - 0.5) * spacing
-            self.draw_button(
+            buttons.append(self.button(
                 x, y,
                 button_w, button_h,
                 text=option,
                 highlighted=(i == selected_index),
                 fill_color=arcade.color.BLACK
-            )
\ No newline at end of file
+            ))
+
+        self.draw_buttons(buttons)
+
+        # Title text
+        TEXT_CACHE.draw(
+            "Do you want to face the final boss and exit the dungeon?",
+            cx, cy+45,
+            arcade.color.WHITE,
+            18, anchor_x="center", align="center"
+        )
\ No newline at end of file
@@ -1,12 +1,31 @@
+import os
+import threading
 import pytest
 import arcade
+from PIL import Image
 from Character import Character
 from Hp_Potion import Hp_Potion
 from Mp_Potion import Mp_Potion
 from Necromancer import Necromancer
 from NightBorne import NightBorne
 from BattleScreen import BattleScreen
-from MainScreen import MainScreen
+from BattleSolver import BattleSolver
+from MainScreen import MainScreen, MiniMap, MAX_ZOOM
+from MazeGraph import MazeGraph
+from MazeGenerator import MazeGenerator
+from WorldState import WorldState
+from RoutePlanner import RoutePlanner
+from RandomStreams import RandomStreams, RNG
+from Animator import Animator
+from BalanceSweep import BalanceSweep
+from BatchSimulator import BatchSimulator
+from CombatEngine import CombatEngine, Fighter, Skill, simulate, ATTACK, HEAL
+from Intro import create_maze_data
+from SpriteSheet import SpriteSheet
+from MusicManager import MusicManager
+from TextureCache import TextureCache
+from TextCache import TextCache
+from ScreenChanger import ScreenChanger
 
 # FIXTURES
 
@@ -358,4 +377,863 @@ class Test_Simple_RPG:
         char.mp = 20
         nightborne.debuff(battle)
         assert char.hp == 35
-        assert char.mp == 20
\ No newline at end of file
+        assert char.mp == 20
+
+
+    def test_sprite_sheet_frames(self):
+        """
+        This method tests whether the sprite sheet slices frames
+        the same way cropping the sheet image would
+        """
+
+        path = "Simple_RPG/Art/Enemies/NightBorne.png"
+        sheet = SpriteSheet(path, 23, 5, cache_dir=None)
+        assert sheet.frame_width == 80
+        assert sheet.frame_height == 80
+
+        frames = sheet.frames()
+        assert len(frames) == 23 * 5
+
+        # Frame 0 is the bottom left cell, the last frame is the top right
+        image = Image.open(path).convert("RGBA")
+        for index in (0, 24, 114):
+            row, col = divmod(index, 23)
+            top = sheet.sheet_height - (row + 1) * 80
+            expected = image.crop((col * 80, top, col * 80 + 80, top + 80))
+            assert frames[index].image.tobytes() == expected.tobytes()
+
+
+    def test_sprite_sheet_cache(self, tmp_path):
+        """
+        This method tests whether baked frames are reused on the next
+        load and rebuilt when the frame layout changes
+
+        Args:
+            tmp_path: A temporary folder for the frame cache
+        """
+
+        path = "Simple_RPG/Art/Enemies/NightBorne.png"
+        first = SpriteSheet(path, 23, 5, cache_dir=tmp_path)
+        assert not first.baked
+        assert (tmp_path / os.path.basename(first.cache_path)).exists()
+
+        # The second load maps the baked frames instead of decoding
+        second = SpriteSheet(path, 23, 5, cache_dir=tmp_path)
+        assert second.baked
+        for index in (0, 50, 114):
+            assert second.frame_image(index).tobytes() == first.frame_image(index).tobytes()
+
+        # A different layout gets its own key and replaces the old bake,
+        # but not a sheet whose name only starts the same
+        other = tmp_path / "NightBorne-Two-0123456789abcdef.rgba"
+        other.write_bytes(b"")
+        third = SpriteSheet(path, 46, 5, cache_dir=tmp_path)
+        assert not third.baked
+        assert third.cache_path != first.cache_path
+        assert not os.path.exists(first.cache_path)
+        assert other.exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+        # A broken metadata file is a cache miss that bakes again
+        with open(third.cache_path + ".json", "w") as meta_file:
+            meta_file.write("{")
+        fourth = SpriteSheet(path, 46, 5, cache_dir=tmp_path)
+        assert not fourth.baked
+        assert SpriteSheet(path, 46, 5, cache_dir=tmp_path).baked
+
+        # A bake that fails part way leaves no temporary files behind
+        fourth.frame_image = None
+        with pytest.raises(TypeError):
+            fourth.bake()
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+    def test_enemy_animations(self, nightborne):
+        """
+        This method tests whether enemy animations use the frame ranges
+        from their manifest and only make each clip's textures once
+
+        Args:
+            nightborne: An instance of NightBorne
+        """
+
+        special = nightborne.special_animation()
+        assert len(special) == 101 - 92
+        assert special is nightborne.special_animation()
+
+        # Clips that share frames share the same textures
+        assert nightborne.death_animation()[0] is nightborne.animation("idle")[0]
+
+        # Only the frames from the manifest have been made
+        assert set(NightBorne._sheet.made) <= {
+            i for start, end in NightBorne.ANIMATIONS.values() for i in range(start, end)
+        }
+
+
+    def test_room_prefetch(self, character):
+        """
+        This method tests whether the backgrounds of the rooms next
+        to the player start loading before the player walks in
+
+        Args:
+            character: The character instance being used
+        """
+
+        maze, connections = create_maze_data()
+        screen = MainScreen(character, maze, connections)
+        screen.assets.finish()
+
+        # Every neighbor of the start room already has its background
+        for target, _, _ in maze["Start"][0]:
+            path = screen.room_background_path(screen.room_art_title(target))
+            assert path in screen.assets.textures
+
+        assert screen.room_art_title("Room 10") == "Backward"
+        assert screen.room_art_title("Room 8") == "Left_Forward_Right"
+
+
+    def test_music_cache(self):
+        """
+        This method tests whether short tracks are kept decoded in a
+        bounded cache and long tracks are streamed with one player
+        """
+
+        music = MusicManager(max_tracks=2)
+        overworld = "Simple_RPG/Music/Forest_Carnival.wav"
+        hit = "Simple_RPG/SFX/Hit.wav"
+        loot = "Simple_RPG/SFX/Loot.wav"
+
+        # The long overworld track streams and keeps its player
+        assert music.is_streamed(overworld)
+        player = music.play(overworld, volume=0)
+        music.stop(player)
+        assert music.play(overworld, volume=0) is player
+        music.stop(player)
+
+        # Short tracks are decoded once and reused
+        sound = music.play(hit, volume=0, loop=False)
+        assert not music.is_streamed(hit)
+        cached = music.tracks[hit]
+        music.stop(sound)
+        music.stop(music.play(hit, volume=0, loop=False))
+        assert music.tracks[hit] is cached
+
+        # Loading a third track drops the least recently played one
+        music.stop(music.play(loot, volume=0, loop=False))
+        assert list(music.tracks) == [hit, loot]
+        assert overworld not in music.stream_players
+
+
+    def test_texture_cache(self):
+        """
+        This method tests whether the texture cache stays under budget
+        by dropping the least recently used textures that aren't pinned
+        """
+
+        # Each 10x10 texture is 400 bytes, so three fit in the budget
+        cache = TextureCache(budget=1200)
+        def make(name):
+            return lambda: arcade.Texture(Image.new("RGBA", (10, 10)), hash=name)
+
+        room = cache.get("room", make("room"))
+        cache.pin("room", ["room"])
+        cache.get("a", make("a"))
+        cache.get("b", make("b"))
+        assert cache.get("room") is room
+
+        # "a" is the oldest unpinned texture so it's dropped first
+        cache.get("c", make("c"))
+        assert "a" not in cache
+        assert "room" in cache and "b" in cache and "c" in cache
+
+        # The pinned room survives even after it's the oldest
+        cache.get("d", make("d"))
+        assert "room" in cache and "b" not in cache
+        assert cache.used <= cache.budget
+
+        # Unpinning lets it go once something else needs the room
+        cache.unpin("room")
+        cache.get("e", make("e"))
+        assert "room" not in cache
+
+        assert cache.stats() == {
+            "hits": 1,
+            "misses": 6,
+            "evictions": 3,
+            "entries": 3,
+            "used": 1200,
+            "budget": 1200,
+        }
+
+        # Worker threads filling it while the main thread pins keeps the sizes right
+        cache = TextureCache(budget=4000)
+        texture = make("shared")()
+        def fill(worker):
+            for i in range(300):
+                cache.get(f"{worker}-{i % 20}", lambda: texture)
+        workers = [threading.Thread(target=fill, args=(worker,)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for i in range(300):
+            cache.pin("room", [f"0-{i % 20}"])
+        for worker in workers:
+            worker.join()
+        assert cache.used == 400 * len(cache) and cache.used <= cache.budget
+
+
+    def test_text_cache(self):
+        """
+        This method tests whether cached text objects are reused and
+        only have their position, alpha or string changed
+        """
+
+        cache = TextCache(max_texts=2)
+
+        # Same content, size and color gives back the same object
+        ok = cache.get("OK", 100, 50, arcade.color.WHITE, 16, anchor_x="center")
+        moved = cache.get("OK", 200, 60, (255, 255, 255, 100), 16, anchor_x="center")
+        assert moved is ok
+        assert ok.position == (200, 60)
+        assert ok.color[3] == 100
+
+        # A different color is a different object
+        assert cache.get("OK", 200, 60, arcade.color.YELLOW, 16, anchor_x="center") is not ok
+
+        # Keyed text keeps one object while its string changes
+        hp = cache.get("HP: 50/50", 10, 10, arcade.color.WHITE, 14, key="hp")
+        assert cache.get("HP: 49/50", 10, 10, arcade.color.WHITE, 14, key="hp") is hp
+        assert hp.text == "HP: 49/50"
+
+        # Only the most recently used texts are kept
+        assert len(cache.texts) == 2
+
+
+    def test_popup_chrome_batches(self):
+        """
+        This method tests whether popup panels and buttons are built into
+        one shape list per layout and only rebuilt when the layout changes
+        """
+
+        window = arcade.get_window()
+        screen_changer = ScreenChanger()
+        ScreenChanger._chrome.clear()
+
+        screen_changer.draw_end_popup(window, ["Yes", "No"], 0)
+        assert len(ScreenChanger._chrome) == 1
+        shapes = next(iter(ScreenChanger._chrome.values()))
+
+        # Drawing the same popup again reuses the batch
+        screen_changer.draw_end_popup(window, ["Yes", "No"], 0)
+        assert len(ScreenChanger._chrome) == 1
+        assert next(iter(ScreenChanger._chrome.values())) is shapes
+
+        # Moving the highlight is a new layout
+        screen_changer.draw_end_popup(window, ["Yes", "No"], 1)
+        assert len(ScreenChanger._chrome) == 2
+
+
+    def test_minimap_batch(self, character):
+        """
+        This method tests whether the minimap only rebuilds its shapes
+        when the map changes instead of every frame
+
+        Args:
+            character: The character instance being used
+        """
+
+        maze, connections = create_maze_data()
+        minimap = MiniMap(character, maze, connections)
+
+        minimap.draw(800, 600)
+        shapes = minimap.shapes
+        assert len(minimap.rooms) == 1 and minimap.lines == []
+
+        # Nothing changed so the same batch is drawn, even after a resize
+        minimap.draw(1024, 768)
+        assert minimap.shapes is shapes
+
+        # Visiting a room and revealing its path rebuilds it
+        neighbors, _, looted = maze["Room 2"]
+        maze["Room 2"] = (neighbors, True, looted)
+        connections["A"] = (True, connections["A"][1])
+        minimap.invalidate()
+        texture = minimap.texture
+        minimap.draw(1024, 768)
+        assert minimap.shapes is not shapes
+        assert len(minimap.rooms) == 2 and len(minimap.lines) == 1
+
+        # The new map is drawn into the same texture
+        assert minimap.texture is texture
+
+
+    def test_minimap_viewport(self, character):
+        """
+        This method tests whether a big maze only puts the rooms near
+        the player on the minimap, and whether zooming out far enough
+        merges rooms into blocks
+
+        Args:
+            character: The character instance being used
+        """
+
+        # A long corridor of rooms, every one visited and joined up
+        maze = {}
+        connections = {}
+        positions = {}
+        for i in range(200):
+            neighbors = []
+            if i > 0:
+                neighbors.append((f"Room {i - 1}", "Left", f"C{i - 1}"))
+            if i < 199:
+                neighbors.append((f"Room {i + 1}", "Right", f"C{i}"))
+                connections[f"C{i}"] = (True, (f"Room {i}", f"Room {i + 1}"))
+            maze[f"Room {i}"] = (neighbors, True, False)
+            positions[f"Room {i}"] = (i * 30, 0)
+        character.currentPosition = "Room 100"
+
+        minimap = MiniMap(character, maze, connections, positions)
+        minimap.draw(800, 600)
+        assert 0 < len(minimap.rooms) < 10
+        assert minimap.blocks == []
+
+        # The player's room is in the middle of the minimap
+        colors = {color: (x, y) for x, y, _, _, color in minimap.rooms}
+        x, _ = colors[arcade.color.YELLOW]
+        assert abs(x + 20 - minimap.width / 2) < 1
+
+        # Zoomed all the way out the rooms become blocks
+        minimap.set_zoom(99)
+        assert minimap.zoom == MAX_ZOOM
+        minimap.draw(800, 600)
+        assert minimap.rooms == [] and minimap.blocks
+        assert len(minimap.blocks) < 50
+
+
+    def test_maze_graph(self):
+        """
+        This method tests whether the maze graph finds moves, exits
+        and backgrounds directly and rejects a broken maze
+        """
+
+        maze, connections = create_maze_data()
+        graph = MazeGraph(maze, connections)
+
+        assert graph.move("Start", "Left") == ("Room 2", "A")
+        assert graph.move("Room 10", "Left") is None
+        assert graph.directions("Room 7") == ["LEFT", "FORWARD"]
+        assert graph.background("Start") == "Left_Forward_Right"
+        assert graph.background("Room 10") == "Backward"
+        assert graph.background("Shop") == "Shop"
+        assert sorted(graph.next_to("Room 9")) == ["Room 10", "Room 8"]
+
+        # Every connection joins the two rooms that use it
+        for label, (_, (first, second)) in connections.items():
+            assert any(conn_label == label for _, _, conn_label in maze[first][0])
+            assert any(conn_label == label for _, _, conn_label in maze[second][0])
+
+        # A path to a room that doesn't exist is caught
+        maze["Room 10"] = ([("Room 99", "Left", "L")], False, False)
+        with pytest.raises(ValueError):
+            MazeGraph(maze, connections)
+
+
+    def test_world_state(self):
+        """
+        This method tests whether world progress is kept as flags that
+        still read like the maze dicts, and can be reset and saved
+        """
+
+        maze, connections = create_maze_data()
+        graph = MazeGraph(maze, connections)
+        world = WorldState(graph, maze, connections)
+
+        world.visit("Room 2")
+        world.loot("Room 2")
+        world.reveal("A")
+        assert world.maze["Room 2"] == (maze["Room 2"][0], True, True)
+        assert world.connections["A"] == (True, ("Start", "Room 2"))
+        assert not world.is_visited("Room 3")
+
+        # Writing through the dict view only changes the flags
+        world.maze["Room 3"] = (maze["Room 3"][0], True, False)
+        assert world.is_visited("Room 3") and not world.is_looted("Room 3")
+
+        # Paths revealed through the view go through reveal() and can't be hidden
+        revealed = []
+        world.subscribe(revealed.append)
+        world.connections["B"] = (True, world.connections["B"][1])
+        assert world.is_revealed("B") and revealed == ["B"]
+        with pytest.raises(TypeError):
+            world.connections["B"] = (False, world.connections["B"][1])
+        assert world.visited_rooms() == ["Room 2", "Room 3"]
+
+        # A save is one byte per room and path and loads back the same
+        saved = world.to_bytes()
+        assert len(saved) == len(maze) + len(connections)
+        world.reset()
+        assert world.is_visited("Start") and not world.is_visited("Room 2")
+        assert not any(revealed for revealed, _ in world.connections.values())
+        assert world.visited_rooms() == ["Start"]
+        world.load(saved)
+        assert world.is_looted("Room 2") and world.is_revealed("A")
+        assert world.visited_rooms() == ["Room 2", "Room 3"]
+
+
+    def test_maze_generator(self):
+        """
+        This method tests whether random mazes are repeatable, valid,
+        can reach the Shop and the End, and give every room its own
+        spot on the minimap
+        """
+
+        maze, connections, positions = MazeGenerator(seed=7).generate(200)
+        assert (maze, connections, positions) == MazeGenerator(seed=7).generate(200)
+        assert len(maze) == 200 and set(positions) == set(maze)
+
+        # Checking it through the graph catches any broken path
+        graph = MazeGraph(maze, connections)
+        assert "Left" not in graph.art
+
+        # Walk out from the start to every room that can be reached
+        reached = {"Start"}
+        queue = ["Start"]
+        while queue:
+            for target in graph.next_to(queue.pop()):
+                if target not in reached:
+                    reached.add(target)
+                    queue.append(target)
+        assert "Shop" in reached and "End" in reached
+        assert len(reached) == len(maze)
+
+        # Rooms are 20 by 10 map units on a grid wider than that,
+        # so two rooms never share a spot or overlap
+        spots = list(positions.values())
+        assert len(set(spots)) == len(spots)
+        assert all((x - 5) % 30 == 0 and (y - 5) % 20 == 0 for x, y in spots)
+
+        # Big mazes are quick to make
+        maze, connections, positions = MazeGenerator(seed=1).generate(10000)
+        assert len(maze) == 10000
+
+
+    def test_route_planner(self):
+        """
+        This method tests whether auto-travel routes only use revealed
+        paths and get shorter as soon as a shortcut is revealed
+        """
+
+        maze, connections = create_maze_data()
+        graph = MazeGraph(maze, connections)
+        world = WorldState(graph)
+        routes = RoutePlanner(graph, world)
+
+        # Start -> Room 6 -> Room 3 -> Room 2
+        for label in ["G", "H", "B"]:
+            world.reveal(label)
+        assert routes.route("Start", "Room 2") == ["Room 6", "Room 3", "Room 2"]
+        assert routes.route("Start", "Room 4") is None
+        assert routes.route("Room 2", "Room 2") == []
+
+        # Revealing Start -> Room 2 updates the route already worked out,
+        # even when it's revealed through the connections dict view
+        world.connections["A"] = (True, ("Start", "Room 2"))
+        assert routes.route("Start", "Room 2") == ["Room 2"]
+        assert routes.route("Room 3", "Room 2") == ["Room 2"]
+
+        # The same distances as working everything out from scratch
+        updated = routes.tree(graph.ids["Room 2"])[0]
+        routes.rebuild()
+        assert routes.tree(graph.ids["Room 2"])[0] == updated
+
+        assert routes.nearest("Start", lambda room: room == "Room 3") == "Room 3"
+
+        # With only the start's tree kept, the route is read backwards off it
+        # instead of working out a tree for the destination
+        routes.trees.clear()
+        routes.tree(graph.ids["Room 2"])
+        assert routes.route("Room 2", "Room 6") == ["Start", "Room 6"]
+        assert list(routes.trees) == [graph.ids["Room 2"]]
+
+
+    def test_room_layer(self, character):
+        """
+        This method tests whether the room is only drawn into its layer
+        when the player moves or the map changes, not while it fades in
+
+        Args:
+            character: The character instance being used
+        """
+
+        maze, connections = create_maze_data()
+        screen = MainScreen(character, maze, connections)
+        screen.window = arcade.get_window()
+
+        # Count how often the room is actually drawn
+        drawn = []
+        draw_room = screen.draw_room
+        screen.draw_room = lambda: drawn.append(draw_room())
+
+        for alpha in (0, 100, 255):
+            screen.bg_alpha = alpha
+            screen.on_draw()
+        assert len(drawn) == 1
+        texture = screen.room_layer.texture
+
+        # Looting changes the minimap so the room is drawn again
+        screen.world.loot("Start")
+        screen.minimap.invalidate()
+        screen.on_draw()
+        assert len(drawn) == 2
+
+        # So does walking into another room, into the same texture
+        screen.character.currentPosition = "Room 2"
+        screen.on_draw()
+        assert len(drawn) == 3
+        assert screen.room_layer.texture is texture
+
+
+    def test_frame_throttle(self, character):
+        """
+        This method tests whether the frames slow down once the
+        overworld sits still and speed back up on a key press
+
+        Args:
+            character: The character instance being used
+        """
+
+        maze, connections = create_maze_data()
+        screen = MainScreen(character, maze, connections)
+        screen.window = arcade.get_window()
+        screen.assets.finish()
+
+        # Still fading in, so nothing slows down
+        screen.on_update(0.3)
+        assert not screen.throttle.idle
+
+        # Once the room is in and nothing moves for a moment it does
+        screen.bg_alpha = screen.text_alpha = 255
+        screen.post_fight_cooldown = 0
+        for _ in range(3):
+            screen.on_update(0.3)
+        assert screen.throttle.idle
+        assert screen.window._update_rate == screen.throttle.idle_rate
+
+        # A key press goes straight back to full speed
+        screen.on_key_press(arcade.key.X, 0)
+        assert not screen.throttle.idle
+        assert screen.window._update_rate == screen.throttle.full_rate
+
+
+    def test_animator(self, necromancer):
+        """
+        This method tests whether animations pick their frame from the
+        time passed, skip ahead on a slow frame and are dropped once done
+
+        Args:
+            necromancer: The necromancer instance being used
+        """
+
+        sprite = arcade.Sprite()
+        frames = necromancer.attack_animation()
+        finished = []
+
+        animator = Animator()
+        animator.play("attack", sprite, frames, 0.1, lambda: finished.append(True))
+        assert sprite.texture is frames[0]
+
+        # A slow frame jumps straight to where the clip should be
+        animator.update(0.35)
+        assert sprite.texture is frames[3]
+        assert animator.is_playing("attack")
+
+        # Finishing calls back once and stops updating the clip
+        animator.update(len(frames) * 0.1)
+        assert finished == [True]
+        assert not animator.is_playing("attack") and animator.clips == {}
+        animator.update(1)
+        assert finished == [True]
+
+
+    def test_combat_engine(self, battle, necromancer, nightborne):
+        """
+        This method tests whether fights can be worked out without a window
+        with the same rules the battle screen uses, and whether simulated
+        fights come out the same for the same seed
+
+        Args:
+            battle: An instance of BattleScreen
+
+            necromancer: The necromancer instance being used
+
+            nightborne: The nightborne instance being used
+        """
+
+        engine = CombatEngine(Fighter.player())
+        assert engine.start(necromancer) == "enemy"
+
+        # Landed presses do 7 each, Overclock doubles two attacks
+        engine.use_special("Overclock")
+        assert engine.attack(2) == 28 and necromancer.hp == 2
+        assert engine.attack(1) == 14 and necromancer.hp == 0
+        assert engine.attack(1) == 7 and engine.overclock == 0
+        assert engine.player.mp == 40
+
+        # Guard halves the enemy's hit and is used up, just like calc_damage
+        engine.guard = 1
+        assert engine.enemy_attack() == necromancer.calc_damage(1, engine.player)[0] == 1
+        assert engine.guard == 0
+
+        # The boss heals when it's low and the dodges take off part of a hit
+        engine.start(nightborne)
+        nightborne.hp = 30
+        assert engine.boss_turn(roll=10) == (HEAL, 40)
+        assert engine.boss_turn(roll=90) == (ATTACK, None)
+        assert engine.dodge(0.25) == 2 and engine.dodge(1.0) == 8
+
+        # The battle screen's buffs are the engine's
+        battle.guard = 2
+        assert battle.engine.guard == 2
+
+        # run() plays out the same as taking the turns one by one
+        def play(engine, enemy, skill):
+            roll = engine.random.random
+            turn = engine.start(enemy)
+            for turns in range(1, 1001):
+                if turn == "player":
+                    turn = "enemy"
+                    engine.attack(skill.hits(roll))
+                    if enemy.hp <= 0:
+                        engine.end()
+                        return True, turns, engine.player.hp
+                    continue
+                turn = "player"
+                if enemy.name != "NightBorne":
+                    engine.take_damage(engine.enemy_attack())
+                elif engine.boss_turn(int(roll() * 100) + 1)[0] == ATTACK:
+                    for _ in range(4):
+                        engine.dodge(skill.dodge(roll))
+                    engine.finish_dodges()
+                else:
+                    continue
+                if engine.player.hp <= 0:
+                    return False, turns, 0
+                engine.repair_tick()
+            return False, 1000, engine.player.hp
+
+        for enemy in ("Necromancer", "NightBorne"):
+            for skill in (Skill(), Skill(1.0, (1, 0, 0, 0)), Skill(0.5, (0.1, 0.2, 0.3, 0.4), 3)):
+                stepped = CombatEngine(Fighter.player(), RandomStreams(5).ai)
+                stepped.repair = 2
+                fast = CombatEngine(Fighter.player(), RandomStreams(5).ai)
+                fast.repair = 2
+                result = play(stepped, Fighter.enemy(enemy), skill)
+                assert (fast.run(Fighter.enemy(enemy), skill), fast.turns, fast.player.hp) == result
+
+        # Simulated fights are repeatable and better players win more
+        perfect = Skill(1.0, (1, 0, 0, 0))
+        assert simulate("Necromancer", battles=200, seed=3) == simulate("Necromancer", battles=200, seed=3)
+        assert simulate("Necromancer", perfect, battles=50, seed=3) == 50
+        assert simulate("NightBorne", perfect, battles=200, seed=3) > simulate("NightBorne", battles=200, seed=3)
+
+
+    def test_balance_sweep(self, tmp_path):
+        """
+        This method tests whether a balance sweep reads its ranges, plays
+        every grid point in worker processes and writes the same results
+        for the same seed
+
+        Args:
+            tmp_path: A folder pytest makes for this test
+        """
+
+        assert BalanceSweep.parse_range("10:14:2") == [10, 12, 14]
+        assert BalanceSweep.parse_range("0,2") == [0, 2]
+        assert BalanceSweep.parse_range("0.5:0.7:0.1", float) == [0.5, 0.6, 0.7]
+
+        ranges = {"player_atk": [12, 14], "armor": [0, 2]}
+        sweep = BalanceSweep("Necromancer", battles=100, seed=5)
+        assert sweep.run(ranges, tmp_path / "first.csv", workers=2) == 4
+        sweep.run(ranges, tmp_path / "second.csv", workers=2)
+
+        # Rows come back in whatever order they finish
+        first = (tmp_path / "first.csv").read_text().splitlines()
+        second = (tmp_path / "second.csv").read_text().splitlines()
+        assert first[0].startswith("player_hp,") and "win_rate" in first[0]
+        assert len(first) == 5
+        assert sorted(first) == sorted(second)
+
+
+    def test_batch_simulator(self):
+        """
+        This method tests whether fights played together with NumPy come
+        out the same as fights played one at a time with the engine
+        """
+
+        pytest.importorskip("numpy")
+
+        # A perfect player beats the Necromancer the same way every time
+        perfect = Skill(1.0, (1, 0, 0, 0))
+        results = BatchSimulator("Necromancer", perfect, seed=1).run(100)
+        engine = CombatEngine(Fighter.player())
+        assert engine.run(Fighter.enemy("Necromancer"), perfect)
+        assert results["won"].all()
+        assert (results["turns"] == engine.turns).all()
+        assert (results["hp"] == engine.player.hp).all()
+
+        # Boss fights with a special win about as often as the engine's
+        skill = Skill(0.95, (0.4, 0.3, 0.2, 0.1))
+        results = BatchSimulator("NightBorne", skill, special="Auto-Repairs", seed=1).run(50000)
+        policy = lambda engine: "Auto-Repairs" if engine.repair == 0 and engine.player.mp >= 15 else "Attack"
+        wins = simulate("NightBorne", skill, battles=50000, seed=1, policy=policy)
+        assert abs(results["won"].mean() - wins / 50000) < 0.01
+
+
+    def test_battle_solver(self, tmp_path):
+        """
+        This method tests whether the exact solver agrees with fights
+        that always go the same way and loads solved fights back from disk
+
+        Args:
+            tmp_path: A folder pytest makes for this test
+        """
+
+        # A perfect player always wins in the same number of turns
+        perfect = Skill(1.0, (1, 0, 0, 0))
+        engine = CombatEngine(Fighter.player())
+        engine.run(Fighter.enemy("Necromancer"), perfect)
+        assert BattleSolver("Necromancer", perfect, cache_dir=None).solve() == (1.0, engine.turns)
+
+        # A player who never lands a hit never wins
+        chance, turns = BattleSolver("NightBorne", Skill(0.0), cache_dir=None).solve()
+        assert chance == 0.0 and turns > 1
+
+        # Solved fights are saved and loaded back under their stats
+        solver = BattleSolver("Necromancer", Skill(0.3), special="Tight Guard", hp_potions=1, potion_at=20, cache_dir=tmp_path)
+        answer = solver.solve()
+        assert 0 < answer[0] < 1
+        assert os.path.exists(solver.cache_path())
+
+        again = BattleSolver("Necromancer", Skill(0.3), special="Tight Guard", hp_potions=1, potion_at=20, cache_dir=tmp_path)
+        assert again.load() == solver.table
+        assert again.solve() == answer
+        assert BattleSolver("Necromancer", Skill(0.4), cache_dir=tmp_path).cache_path() != solver.cache_path()
+
+        # A broken or incomplete file is solved again and written over
+        for broken in ("{", "[]", '{"key": 1}'):
+            with open(solver.cache_path(), "w") as cache_file:
+                cache_file.write(broken)
+            again = BattleSolver("Necromancer", Skill(0.3), special="Tight Guard", hp_potions=1, potion_at=20, cache_dir=tmp_path)
+            assert again.load() is None
+            assert again.solve() == answer
+            assert again.load() == solver.table
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+    def test_random_streams(self, necromancer, character):
+        """
+        This method tests whether the random streams repeat for the same
+        seed, don't affect each other and go back to a snapshot
+
+        Args:
+            necromancer: The necromancer instance being used
+
+            character: The character instance being used
+        """
+
+        first = RandomStreams(7)
+        second = RandomStreams(7)
+        assert [first.loot.random() for _ in range(5)] == [second.loot.random() for _ in range(5)]
+
+        # Rolling one stream leaves the others where they were
+        second.audio.random()
+        assert first.ai.random() == second.ai.random()
+        assert first.loot.random() != first.ai.random()
+
+        # A snapshot puts every stream back
+        saved = first.snapshot()
+        rolls = [first.qte.random(), first.stream("maze").random()]
+        first.restore(saved)
+        assert [first.qte.random(), first.stream("maze").random()] == rolls
+
+        # Spawned sets repeat from the seed but differ from each other
+        assert first.spawn(1).ai.random() == second.spawn(1).ai.random()
+        assert first.spawn(1).ai.random() != first.spawn(2).ai.random()
+
+        # The game's drops come from the shared streams, which are put
+        # back afterwards so other tests don't inherit the seed
+        shared = RNG.snapshot()
+        try:
+            RNG.reseed(3)
+            drops = [necromancer.drop_loot(character) for _ in range(20)]
+            RNG.reseed(3)
+            assert [necromancer.drop_loot(character) for _ in range(20)] == drops
+        finally:
+            RNG.restore(shared)
+
+
+
+    def test_travel_key_in_fight(self, character):
+        """
+        This method tests whether the auto-travel key does nothing while
+        a fight is going on, so the player can't walk away from it
+
+        Args:
+            character: The character instance being used
+        """
+
+        maze, connections = create_maze_data()
+        screen = MainScreen(character, maze, connections)
+        screen.window = arcade.get_window()
+
+        # Walk Start -> Room 2 so there's somewhere to travel back to
+        screen.world.visit("Start")
+        screen.world.visit("Room 2")
+        screen.world.reveal("A")
+        screen.character.currentPosition = "Room 2"
+        screen.fade_in_complete = True
+        screen.post_fight_cooldown = 0
+
+        # Mid fight on the enemy's turn T isn't passed on to the overworld
+        screen.in_fight = True
+        screen.battle.turn = "enemy"
+        screen.on_key_press(arcade.key.T, 0)
+        assert screen.popup_state is None
+        assert screen.character.currentPosition == "Room 2"
+
+        # Out of the fight it opens the travel menu again
+        screen.in_fight = False
+        screen.battle.turn = "player"
+        screen.on_key_press(arcade.key.T, 0)
+        assert screen.popup_state == "travel"
+        assert "Start" in screen.popup_options
+
+
+    def test_travel_menu(self, character):
+        """
+        This method tests whether the travel menu lists every visited
+        room the player can walk back to, closest first
+
+        Args:
+            character: The character instance being used
+        """
+
+        maze, connections = create_maze_data()
+        screen = MainScreen(character, maze, connections)
+        screen.window = arcade.get_window()
+
+        # Start -> Room 6 -> Room 3 -> Room 2
+        for room in ["Start", "Room 6", "Room 3", "Room 2"]:
+            screen.world.visit(room)
+        for label in ["G", "H", "B"]:
+            screen.world.reveal(label)
+        screen.character.currentPosition = "Room 2"
+
+        screen.open_travel_menu()
+        assert screen.popup_options == ["Unsearched", "Room 3", "Room 6", "Start", "Exit"]
+        assert screen.travel_targets["Unsearched"] == "Room 3"
+
+        # A short list scrolls to the selected place
+        screen.screen_changer.draw_travel_popup(screen.window, screen.popup_options, 4, rows=2)
+
+        screen.travel_to(screen.travel_targets["Start"])
+        assert screen.character.currentPosition == "Start"
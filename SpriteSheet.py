@@ -0,0 +1,322 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+import arcade
+from PIL import Image
+
+# Where baked frames are kept between launches
+CACHE_DIR = os.path.join("Simple_RPG", ".cache", "frames")
+
+class SpriteSheet:
+    """
+    This class decodes an enemy sprite sheet once and slices it
+    into frame textures that all share one RGBA buffer,
+    so no frame ever has to be cropped, re-encoded or decoded again
+
+    The sliced frames are also baked to disk keyed by the sheet's hash
+    and layout, so later launches memory-map them instead of decoding
+    the sheet at all
+    """
+
+    def __init__(self, path, columns, rows, frame_width=None, frame_height=None, cache_dir=CACHE_DIR):
+        """
+        This is the class setup
+
+        Args:
+            path: Where the sprite sheet image is stored
+
+            columns: How many frames are in each row of the sheet
+
+            rows: How many rows of frames the sheet has
+
+            frame_width: Width of one frame in pixels, if left as None
+                         it's worked out from the sheet size
+
+            frame_height: Height of one frame in pixels, if left as None
+                          it's worked out from the sheet size
+
+            cache_dir: Folder for the baked frames, None turns
+                       the on-disk cache off
+        """
+
+        self.path = path
+        self.columns = columns
+        self.rows = rows
+
+        # Only the header is read here, the pixels stay on disk
+        with Image.open(path) as sheet:
+            self.sheet_width, self.sheet_height = sheet.size
+        self.frame_width = frame_width or self.sheet_width // columns
+        self.frame_height = frame_height or self.sheet_height // rows
+
+        # Textures that are still in use, by frame number
+        # They're only held weakly so frames dropped from the
+        # texture cache can be freed
+        self.made = weakref.WeakValueDictionary()
+
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.cache_path = None
+        if cache_dir is not None:
+            key = SpriteSheet.cache_key(path, columns, rows, self.frame_width, self.frame_height)
+            self.cache_path = os.path.join(cache_dir, f"{self.name}-{key}.rgba")
+
+        if self.cache_path and self._map_cache():
+            return
+
+        self._decode()
+        if self.cache_path:
+            self.bake()
+
+    @staticmethod
+    def cache_key(path, columns, rows, frame_width, frame_height):
+        """
+        Returns the key the baked frames are stored under, it changes
+        whenever the sheet's pixels or its frame layout change
+
+        Args:
+            path: Where the sprite sheet image is stored
+
+            columns, rows: How many frames across and down
+
+            frame_width, frame_height: Size of one frame in pixels
+        """
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as sheet_file:
+            for chunk in iter(lambda: sheet_file.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(f"{columns}x{rows}x{frame_width}x{frame_height}".encode())
+        return digest.hexdigest()[:16]
+
+    def _decode(self):
+        """Decodes the sheet into one buffer the frames can point into"""
+
+        sheet = Image.open(self.path).convert("RGBA")
+        self.stride = self.sheet_width * 4
+
+        # Copy the pixels into one buffer with a spare row at the end
+        # The frames on the last row of memory would otherwise run
+        # past the end of the buffer when they're mapped with a stride
+        self.pixels = bytearray(self.stride * (self.sheet_height + 1))
+        self.pixels[:self.stride * self.sheet_height] = sheet.tobytes()
+        self.view = memoryview(self.pixels)
+        self.baked = False
+
+    def _map_cache(self):
+        """
+        Memory-maps previously baked frames if they match this sheet
+        Returns whether the cache could be used
+        """
+
+        meta_path = self.cache_path + ".json"
+        if not (os.path.exists(self.cache_path) and os.path.exists(meta_path)):
+            return False
+
+        # A broken or half written metadata file just means baking again
+        try:
+            with open(meta_path) as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(meta, dict):
+            return False
+
+        frame_count = self.columns * self.rows
+        frame_bytes = self.frame_width * self.frame_height * 4
+        expected = {
+            "columns": self.columns,
+            "rows": self.rows,
+            "frame_width": self.frame_width,
+            "frame_height": self.frame_height,
+        }
+        if any(meta.get(k) != v for k, v in expected.items()):
+            return False
+        try:
+            if os.path.getsize(self.cache_path) != frame_count * frame_bytes:
+                return False
+            with open(self.cache_path, "rb") as cache_file:
+                self.pixels = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        self.view = memoryview(self.pixels)
+        self.stride = self.frame_width * 4
+        self.baked = True
+        return True
+
+    def _frame_offset(self, index):
+        """
+        Returns where a frame's top-left pixel sits in the buffer
+
+        Args:
+            index: The frame number, counted left to right starting
+                   from the bottom row of the sheet
+        """
+
+        # Baked frames are stored one after another
+        if self.baked:
+            return index * self.frame_width * self.frame_height * 4
+
+        row, col = divmod(index, self.columns)
+        top = self.sheet_height - (row + 1) * self.frame_height
+        return top * self.stride + col * self.frame_width * 4
+
+    def bake(self):
+        """
+        Writes every frame to the cache folder one after another
+        along with a small metadata file describing the layout
+        """
+
+        folder = os.path.dirname(self.cache_path)
+        os.makedirs(folder, exist_ok=True)
+
+        # Drop frames baked from an older version of this sheet, only
+        # files named exactly <name>-<key>.rgba so a sheet called Boss
+        # leaves Boss-Two's frames alone
+        bake_name = re.compile(re.escape(self.name) + r"-[0-9a-f]{16}\.rgba(\.json)?")
+        current = os.path.basename(self.cache_path)
+        for old in os.listdir(folder):
+            if bake_name.fullmatch(old) and old not in (current, current + ".json"):
+                try:
+                    os.remove(os.path.join(folder, old))
+                except FileNotFoundError:
+                    # Another process baking the same sheet got to it first
+                    pass
+
+        meta = {
+            "source": self.path,
+            "columns": self.columns,
+            "rows": self.rows,
+            "frame_width": self.frame_width,
+            "frame_height": self.frame_height,
+        }
+
+        # Write to temporary files first so a half written cache is never used,
+        # each bake gets its own so processes baking at once don't clash
+        temp_paths = []
+        try:
+            with tempfile.NamedTemporaryFile("wb", dir=folder, suffix=".tmp", delete=False) as cache_file:
+                temp_paths.append(cache_file.name)
+                for i in range(self.columns * self.rows):
+                    cache_file.write(self.frame_image(i).tobytes())
+
+            with tempfile.NamedTemporaryFile("w", dir=folder, suffix=".tmp", delete=False) as meta_file:
+                temp_paths.append(meta_file.name)
+                json.dump(meta, meta_file, indent=4)
+
+            os.replace(cache_file.name, self.cache_path)
+            os.replace(meta_file.name, self.cache_path + ".json")
+        finally:
+            # Whatever wasn't moved into place is left over from a failed bake
+            for temp_path in temp_paths:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def frame_image(self, index):
+        """
+        Returns a pillow image for one frame that points straight into
+        the shared buffer instead of holding a copy of the pixels
+
+        Args:
+            index: The frame number, counted left to right starting
+                   from the bottom row of the sheet
+        """
+
+        return Image.frombuffer(
+            "RGBA",
+            (self.frame_width, self.frame_height),
+            self.view[self._frame_offset(index):],
+            "raw",
+            "RGBA",
+            self.stride,
+            1
+        )
+
+    def frame_texture(self, index):
+        """
+        Returns an arcade texture for one frame, a frame's texture
+        is only made again after every user of it has let it go
+
+        Args:
+            index: The frame number, counted left to right starting
+                   from the bottom row of the sheet
+        """
+
+        texture = self.made.get(index)
+        if texture is None:
+            # Naming the texture skips hashing every frame's pixels and
+            # the bounding box hit box skips scanning them for outlines
+            texture = arcade.Texture(
+                self.frame_image(index),
+                hash=f"{self.path}:{self.frame_width}x{self.frame_height}:{index}",
+                hit_box_algorithm=arcade.hitbox.algo_bounding_box
+            )
+            self.made[index] = texture
+        return texture
+
+    def textures(self, start, end):
+        """
+        Returns the textures for a range of frames
+
+        Args:
+            start: The first frame number
+
+            end: The frame number to stop before
+        """
+        return [self.frame_texture(i) for i in range(start, end)]
+
+    def frames(self):
+        """Returns every frame in the sheet as a list of textures"""
+        return self.textures(0, self.columns * self.rows)
+
+
+def enemy_sheets(art_dir):
+    """
+    Returns the path and frame layout of every enemy's sprite sheet,
+    like Enemies/Necromancer.png with Necromancer's COLUMNS and ROWS
+
+    Args:
+        art_dir: The game's art folder
+    """
+
+    # Imported here since the enemies import this module
+    from Necromancer import Necromancer
+    from NightBorne import NightBorne
+
+    sheets = []
+    for enemy in (Necromancer, NightBorne):
+        sheets.append((
+            os.path.join(art_dir, "Enemies", f"{enemy.__name__}.png"),
+            enemy.COLUMNS,
+            enemy.ROWS,
+            enemy.FRAME_WIDTH,
+            enemy.FRAME_HEIGHT
+        ))
+    return sheets
+
+
+def _bake_sheet(path, columns, rows, frame_width, frame_height, cache_dir):
+    """Bakes one sheet, this runs inside a worker process"""
+
+    sheet = SpriteSheet(path, columns, rows, frame_width, frame_height, cache_dir)
+    return path, sheet.cache_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-bake every enemy sprite sheet")
+    parser.add_argument("--art", default=os.path.join("Simple_RPG", "Art"), help="art folder the sheets are in")
+    parser.add_argument("--cache", default=CACHE_DIR, help="folder for the baked frames")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args()
+
+    sheets = enemy_sheets(args.art)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = [pool.submit(_bake_sheet, *sheet, args.cache) for sheet in sheets]
+        for job in jobs:
+            path, cache_path = job.result()
+            print(f"{path} -> {cache_path}")
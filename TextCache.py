@@ -0,0 +1,79 @@
+from collections import OrderedDict
+import arcade
+
+class TextCache:
+    """
+    This class keeps arcade.Text objects around between frames so the
+    popups don't lay out their glyphs from scratch every frame
+
+    Text is looked up by its content, font size and color, moving it or
+    fading it only changes the cached object instead of making a new one
+    """
+
+    def __init__(self, max_texts=256):
+        """
+        This is the class setup
+
+        Args:
+            max_texts: How many text objects are kept before the least
+                       recently drawn one is dropped
+        """
+
+        self.max_texts = max_texts
+
+        # Cached text objects, the most recently drawn is last
+        self.texts = OrderedDict()
+
+    def get(self, text, x, y, color, font_size=12, key=None, **style):
+        """
+        Returns a text object placed and colored as asked
+
+        Args:
+            text: The string to show
+
+            x, y: Where to put the text
+
+            color: An RGB or RGBA color, the alpha can change freely
+
+            font_size: Size of the text
+
+            key: A name for text whose string keeps changing, like a
+                 HP counter, so it reuses one object instead of one
+                 per value
+
+            style: Anything else arcade.Text takes, like anchor_x or bold
+        """
+
+        rgb = tuple(color[:3])
+        alpha = color[3] if len(color) > 3 else 255
+        cache_key = (key if key is not None else text, font_size, rgb, tuple(sorted(style.items())))
+
+        cached = self.texts.get(cache_key)
+        if cached is None:
+            cached = arcade.Text(text, x, y, (*rgb, alpha), font_size, **style)
+            self.texts[cache_key] = cached
+            if len(self.texts) > self.max_texts:
+                self.texts.popitem(last=False)
+            return cached
+
+        self.texts.move_to_end(cache_key)
+
+        # Only touch what changed since the last draw
+        if cached.text != text:
+            cached.text = text
+        if cached.x != x or cached.y != y:
+            cached.position = (x, y)
+        if cached.color[3] != alpha:
+            cached.color = (*rgb, alpha)
+        return cached
+
+    def draw(self, text, x, y, color, font_size=12, key=None, **style):
+        """
+        Draws text through the cache, this takes the same arguments as get
+        """
+
+        self.get(text, x, y, color, font_size, key, **style).draw()
+
+
+# The cache shared by the whole game
+TEXT_CACHE = TextCache()
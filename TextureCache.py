@@ -0,0 +1,170 @@
+import threading
+from collections import OrderedDict
+
+class TextureCache:
+    """
+    This class holds the game's room backgrounds and enemy animations
+    under one memory budget
+
+    When the budget is used up the textures that haven't been used for
+    the longest are dropped, textures that are pinned, like the current
+    room's background or the current enemy's frames, are never dropped
+    The texture atlas frees a texture once nothing refers to it anymore
+    The preloader's worker threads use it too, so everything that
+    touches the entries or pins holds the lock
+    """
+
+    def __init__(self, budget=64 * 1024 * 1024):
+        """
+        This is the class setup
+
+        Args:
+            budget: How many bytes of pixels can be kept at once
+        """
+
+        self.budget = budget
+        self.used = 0
+
+        # Cached textures and their sizes, the most recently used is last
+        self.entries = OrderedDict()
+        # Keys that can't be dropped, by what pinned them
+        self.pins = {}
+        # Re-entrant since put and pin trim while holding it
+        self.lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def size_of(value):
+        """
+        Returns how many bytes of pixels a texture or list of textures holds
+
+        Args:
+            value: A texture or a list of textures
+        """
+
+        if isinstance(value, list):
+            return sum(TextureCache.size_of(texture) for texture in value)
+        return value.width * value.height * 4
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def get(self, key, load=None):
+        """
+        Returns a cached value, or loads and caches it if it's missing
+
+        Args:
+            key: The name the value is cached under
+
+            load: Makes the value when it isn't cached, if left as None
+                  a missing value returns None
+        """
+
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key][0]
+            self.misses += 1
+
+        if load is None:
+            return None
+        # Loaded without the lock so other threads aren't held up
+        value = load()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """
+        Caches a texture or list of textures, dropping old ones if
+        the cache goes over budget
+
+        Args:
+            key: The name to cache the value under
+
+            value: A texture or a list of textures
+        """
+
+        size = TextureCache.size_of(value)
+        with self.lock:
+            if key in self.entries:
+                self.used -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.used += size
+            self.trim()
+
+    def pin(self, owner, keys):
+        """
+        Keeps some keys from being dropped, replacing whatever
+        this owner had pinned before
+
+        Args:
+            owner: Who is pinning, like "room" or "enemy"
+
+            keys: The keys to keep
+        """
+
+        with self.lock:
+            self.pins[owner] = set(keys)
+            self.trim()
+
+    def unpin(self, owner):
+        """
+        Lets the keys an owner pinned be dropped again
+
+        Args:
+            owner: Who pinned the keys
+        """
+
+        with self.lock:
+            self.pins.pop(owner, None)
+            self.trim()
+
+    def is_pinned(self, key):
+        """
+        Returns whether anything has pinned a key
+
+        Args:
+            key: The key to check
+        """
+
+        with self.lock:
+            return any(key in keys for keys in self.pins.values())
+
+    def trim(self):
+        """Drops the least recently used unpinned values until under budget"""
+
+        with self.lock:
+            if self.used <= self.budget:
+                return
+            for key in list(self.entries):
+                if self.used <= self.budget:
+                    break
+                if not self.is_pinned(key):
+                    self.used -= self.entries.pop(key)[1]
+                    self.evictions += 1
+
+    def stats(self):
+        """Returns the cache's hit, miss and eviction counts and its memory use"""
+
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "used": self.used,
+                "budget": self.budget,
+            }
+
+
+# The cache shared by the whole game
+TEXTURE_CACHE = TextureCache()
@@ -0,0 +1,229 @@
+from collections.abc import MutableMapping
+
+# Bits kept for every room
+VISITED = 1
+LOOTED = 2
+
+class WorldState:
+    """
+    This class keeps track of how far the player has gotten through
+    the maze, which rooms are visited or looted and which paths are
+    revealed
+
+    Each room and each connection is one byte, found by its number
+    in the MazeGraph, so changing one is a single write and clearing
+    them all is one operation
+    The maze and connections properties still look like the dicts
+    create_maze_data makes for the code that reads them that way
+    Paths are only ever revealed through reveal(), so anything that
+    subscribes, like the RoutePlanner, hears about every one
+    """
+
+    def __init__(self, graph, maze=None, connections=None):
+        """
+        This is the class setup
+
+        Args:
+            graph: The MazeGraph the state belongs to
+
+            maze: A maze dict to copy the visited and looted flags from,
+                  if None every room starts unvisited
+
+            connections: A connections dict to copy the revealed flags from,
+                         if None every path starts hidden
+        """
+
+        self.graph = graph
+        self.rooms = bytearray(len(graph.names))
+        self.revealed = bytearray(len(graph.labels))
+        # Visited room numbers in the order they were first visited,
+        # so the visited rooms can be listed without going over every room
+        self.visited = []
+        # Called with a path's label when it's revealed, or with None
+        # when every path may have changed after a reset or a load
+        self.listeners = []
+
+        if maze is not None:
+            for room, (_, visited, looted) in maze.items():
+                room_id = graph.ids[room]
+                self.rooms[room_id] = (VISITED if visited else 0) | (LOOTED if looted else 0)
+        if connections is not None:
+            for label, (revealed, _) in connections.items():
+                self.revealed[graph.connection_ids[label]] = 1 if revealed else 0
+        self._find_visited()
+
+        # Dict shaped views of the flags
+        self.maze = RoomView(self)
+        self.connections = ConnectionView(self)
+
+    def subscribe(self, listener):
+        """
+        Calls a function whenever the revealed paths change
+
+        Args:
+            listener: Takes the label of the path that was revealed,
+                      or None after reset() or load()
+        """
+
+        self.listeners.append(listener)
+
+    def _changed(self, label):
+        """Tells every listener which path was revealed, None for all of them"""
+        for listener in self.listeners:
+            listener(label)
+
+    def visit(self, room):
+        """
+        Marks a room as visited
+
+        Args:
+            room: The name of the room
+        """
+
+        room_id = self.graph.ids[room]
+        if not self.rooms[room_id] & VISITED:
+            self.rooms[room_id] |= VISITED
+            self.visited.append(room_id)
+
+    def loot(self, room):
+        """
+        Marks a room as looted
+
+        Args:
+            room: The name of the room
+        """
+
+        self.rooms[self.graph.ids[room]] |= LOOTED
+
+    def reveal(self, label):
+        """
+        Marks a path as revealed, returning whether it was hidden before
+
+        Args:
+            label: The connection's label, like "A"
+        """
+
+        conn_id = self.graph.connection_ids[label]
+        if self.revealed[conn_id]:
+            return False
+        self.revealed[conn_id] = 1
+        self._changed(label)
+        return True
+
+    def is_visited(self, room):
+        """Returns whether the player has been in a room"""
+        return bool(self.rooms[self.graph.ids[room]] & VISITED)
+
+    def is_looted(self, room):
+        """Returns whether a room has been investigated"""
+        return bool(self.rooms[self.graph.ids[room]] & LOOTED)
+
+    def is_revealed(self, label):
+        """Returns whether the player has walked a path"""
+        return bool(self.revealed[self.graph.connection_ids[label]])
+
+    def visited_rooms(self):
+        """Returns the names of every visited room, in the order they were first visited"""
+        return [self.graph.names[room_id] for room_id in self.visited]
+
+    def _find_visited(self):
+        """Lists the visited rooms again after the flags were replaced"""
+        self.visited = [room_id for room_id, flags in enumerate(self.rooms) if flags & VISITED]
+
+    def reset(self, start="Start"):
+        """
+        Forgets all progress, leaving only the start room visited
+
+        Args:
+            start: The room the player starts in
+        """
+
+        self.rooms[:] = bytes(len(self.rooms))
+        self.revealed[:] = bytes(len(self.revealed))
+        self.visited.clear()
+        self.visit(start)
+        self._changed(None)
+
+    def to_bytes(self):
+        """Returns the whole state as bytes, rooms first and then paths"""
+
+        return bytes(self.rooms) + bytes(self.revealed)
+
+    def load(self, data):
+        """
+        Replaces the state with one saved by to_bytes
+
+        Args:
+            data: The bytes to load
+        """
+
+        if len(data) != len(self.rooms) + len(self.revealed):
+            raise ValueError("Saved state doesn't match this maze")
+        self.rooms[:] = data[:len(self.rooms)]
+        self.revealed[:] = data[len(self.rooms):]
+        self._find_visited()
+        self._changed(None)
+
+
+class RoomView(MutableMapping):
+    """
+    This class shows a WorldState as the maze dict, room name to
+    (neighbors, visited, looted), setting a room only changes its flags
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    def __getitem__(self, room):
+        room_id = self.state.graph.ids[room]
+        flags = self.state.rooms[room_id]
+        return (self.state.graph.paths[room_id], bool(flags & VISITED), bool(flags & LOOTED))
+
+    def __setitem__(self, room, value):
+        _, visited, looted = value
+        room_id = self.state.graph.ids[room]
+        was_visited = self.state.rooms[room_id] & VISITED
+        self.state.rooms[room_id] = (VISITED if visited else 0) | (LOOTED if looted else 0)
+        if visited and not was_visited:
+            self.state.visited.append(room_id)
+        elif was_visited and not visited:
+            self.state.visited.remove(room_id)
+
+    def __delitem__(self, room):
+        raise TypeError("Rooms can't be removed from the maze")
+
+    def __iter__(self):
+        return iter(self.state.graph.names)
+
+    def __len__(self):
+        return len(self.state.graph.names)
+
+
+class ConnectionView(MutableMapping):
+    """
+    This class shows a WorldState as the connections dict, label to
+    (revealed, (room, room)), setting a connection reveals it through
+    WorldState.reveal, a revealed path can't be hidden again
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    def __getitem__(self, label):
+        conn_id = self.state.graph.connection_ids[label]
+        return (bool(self.state.revealed[conn_id]), self.state.graph.joins[conn_id])
+
+    def __setitem__(self, label, value):
+        if value[0]:
+            self.state.reveal(label)
+        elif self.state.is_revealed(label):
+            raise TypeError("Revealed paths can't be hidden again, only reset")
+
+    def __delitem__(self, label):
+        raise TypeError("Connections can't be removed from the maze")
+
+    def __iter__(self):
+        return iter(self.state.graph.labels)
+
+    def __len__(self):
+        return len(self.state.graph.labels)